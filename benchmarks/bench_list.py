@@ -0,0 +1,127 @@
+# benchmarks/bench_list.py
+# -*- coding: utf-8 -*-
+"""对比主列表的构建耗时（填充 + 首次显示）：
+
+* inline：原先每行一个 MemoListItemWidget，每个标签控件各自 setStyleSheet
+* app-qss：同样的行控件，只设置 objectName，由一份应用级样式表匹配
+* delegate：当前的 QListView + MemoListModel + MemoItemDelegate
+
+用法: python -m benchmarks.bench_list [--sizes 200,1000] [--theme dark]
+无显示器时可设置 QT_QPA_PLATFORM=offscreen
+"""
+import argparse
+import time
+
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtWidgets import (QApplication, QHBoxLayout, QLabel, QListView,
+                             QListWidget, QListWidgetItem, QVBoxLayout, QWidget)
+
+from benchmarks.corpus import generate_memos
+from src.core.theme import AppTheme
+from src.model.memo_model import Memo
+from src.view.widgets.memo_delegate import MemoItemDelegate
+from src.view.widgets.memo_list_model import MemoListModel
+
+def inline_styles(c):
+    # 改为应用级样式表之前 AppTheme.get_stylesheet 返回的列表样式
+    return {
+        "ListTitle": f"color: {c['text_primary']}; font-size: 14px; font-weight: 600;",
+        "ListTime": f"color: {c['text_time']}; font-size: 12px;",
+        "ListPreview": f"color: {c['text_secondary']}; font-size: 12px;",
+        "Tag": f"color: {c['accent']}; font-size: 11px; background-color: {c['tag_bg']}; border-radius: 10px; padding: 2px 8px;"
+    }
+
+def app_styles(c):
+    # 同样的规则写成按 objectName 匹配的应用级样式
+    return "\n".join(f"QLabel#{name} {{ {rule} }}" for name, rule in inline_styles(c).items())
+
+
+class RowWidget(QWidget):
+    """原先的 MemoListItemWidget（去掉了省略号处理，只保留控件和样式）"""
+
+    def __init__(self, memo, styles=None):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(4)
+        header = QHBoxLayout()
+        title = self._label(memo.title or "无标题", "ListTitle", styles)
+        header.addWidget(title, 1)
+        header.addWidget(self._label(memo.time_str, "ListTime", styles))
+        layout.addLayout(header)
+        preview = self._label(memo.preview or "无内容", "ListPreview", styles)
+        preview.setFixedHeight(36)
+        preview.setWordWrap(True)
+        preview.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
+        layout.addWidget(preview)
+        if memo.tags:
+            t_layout = QHBoxLayout()
+            for tag in memo.tags:
+                t_layout.addWidget(self._label(f"#{tag}", "Tag", styles))
+            t_layout.addStretch()
+            layout.addLayout(t_layout)
+
+    @staticmethod
+    def _label(text, name, styles):
+        label = QLabel(text)
+        if styles is None:
+            label.setObjectName(name)
+        else:
+            label.setStyleSheet(styles[name])
+        return label
+
+
+def build_widget_list(memos, styles):
+    view = QListWidget()
+    view.resize(400, 600)
+    for memo in memos:
+        item = QListWidgetItem(view)
+        item.setSizeHint(QSize(0, 80))
+        view.setItemWidget(item, RowWidget(memo, styles))
+    return view
+
+def build_delegate_list(memos):
+    view = QListView()
+    view.resize(400, 600)
+    model = MemoListModel(view)
+    view.setModel(model)
+    view.setItemDelegate(MemoItemDelegate(view))
+    view.setUniformItemSizes(True)
+    model.set_memos(memos)
+    return view
+
+def measure(app, build):
+    """构建并显示列表，直到事件处理完（样式已应用、可见行已绘制）为止的毫秒数"""
+    start = time.perf_counter()
+    view = build()
+    view.show()
+    app.processEvents()
+    elapsed = (time.perf_counter() - start) * 1000
+    view.close()
+    view.deleteLater()
+    app.processEvents()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="200,1000")
+    parser.add_argument("--theme", default=AppTheme.DEFAULT_THEME)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    AppTheme.apply(app, args.theme)
+    base_qss = AppTheme.stylesheet()
+    styles = inline_styles(AppTheme.COLORS)
+    print(f"{'memos':>8}{'inline ms':>12}{'app-qss ms':>12}{'delegate ms':>13}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        memos = [Memo.from_dict(item) for item in generate_memos(size)]
+        app.setStyleSheet(base_qss)
+        inline = measure(app, lambda: build_widget_list(memos, styles))
+        app.setStyleSheet(base_qss + app_styles(AppTheme.COLORS))
+        app_qss = measure(app, lambda: build_widget_list(memos, None))
+        app.setStyleSheet(base_qss)
+        delegate = measure(app, lambda: build_delegate_list(memos))
+        print(f"{size:>8}{inline:>12.1f}{app_qss:>12.1f}{delegate:>13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_memory.py
+# -*- coding: utf-8 -*-
+"""对比原先的 dataclass Memo 与紧凑 Memo 的每条内存占用
+
+用法: python -m benchmarks.bench_memory [--sizes 100000,1000000]
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List
+
+from benchmarks.corpus import generate_memos
+from src.model.memo_model import Memo
+
+@dataclass
+class DataclassMemo:
+    # 紧凑化之前的 Memo 定义
+    id: int
+    title: str
+    content: str
+    tags: List[str] = field(default_factory=list)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    time_str: str = field(default_factory=lambda: datetime.now().strftime("%H:%M"))
+
+    @staticmethod
+    def from_dict(data: dict):
+        return DataclassMemo(
+            id=data.get("id", 0),
+            title=data.get("title", ""),
+            content=data.get("content", ""),
+            tags=data.get("tags", []),
+            created_at=data.get("created_at", ""),
+            time_str=data.get("time_str", "")
+        )
+
+def measure(memo_cls, size, chunk=50000):
+    """按 memos.json 的加载方式逐块解析并构造 Memo，返回构造结果常驻的字节数"""
+    gc.collect()
+    tracemalloc.start()
+    memos = []
+    for start in range(0, size, chunk):
+        # 经过一次 JSON 往返，使每条备忘的字符串都是独立对象，与真实加载一致
+        text = json.dumps(generate_memos(min(chunk, size - start), seed=start), ensure_ascii=False)
+        tracemalloc.reset_peak()
+        items = json.loads(text)
+        del text
+        memos.extend(memo_cls.from_dict(item) for item in items)
+        del items
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del memos
+    return current
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100000,1000000")
+    args = parser.parse_args()
+    print(f"{'memos':>10}{'before B/memo':>16}{'after B/memo':>16}{'saved':>10}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        before = measure(DataclassMemo, size) / size
+        after = measure(Memo, size) / size
+        print(f"{size:>10}{before:>16.1f}{after:>16.1f}{(1 - after / before) * 100:>9.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_search.py
+# -*- coding: utf-8 -*-
+"""模拟在搜索框中逐字输入，对比逐条扫描、n-gram 索引与相关度排序（前 50 条）的单次按键耗时
+
+用法: python -m benchmarks.bench_search [--size 100000] [--query "评审 design"]
+"""
+import argparse
+import time
+
+from benchmarks.corpus import generate_memos
+from src.model.memo_collection import MemoCollection
+from src.model.memo_model import Memo
+from src.model.ranking import rank_memos
+from src.model.search_index import NgramIndex
+
+def linear_filter(memos, text):
+    # 引入索引前 MainPresenter.on_search_changed 的实现
+    return [m for m in memos if text.lower() in (m.title + m.content).lower()]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--query", default="评审 design")
+    args = parser.parse_args()
+
+    memos = MemoCollection(Memo.from_dict(item) for item in generate_memos(args.size))
+    start = time.perf_counter()
+    index = NgramIndex()
+    for memo in memos:
+        index.add(memo)
+    print(f"{args.size} memos, index build {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"{len(index._postings)} grams")
+
+    print(f"{'query':<16}{'hits':>8}{'scan ms':>12}{'index ms':>12}{'ranked ms':>12}")
+    for i in range(1, len(args.query) + 1):
+        text = args.query[:i]
+        start = time.perf_counter()
+        expected = linear_filter(memos, text)
+        scan_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        result = memos.select(index.query(text))
+        index_ms = (time.perf_counter() - start) * 1000
+        assert [m.id for m in result] == [m.id for m in expected], text
+        start = time.perf_counter()
+        rank_memos(text, index, memos, 50)
+        ranked_ms = (time.perf_counter() - start) * 1000
+        print(f"{text!r:<16}{len(result):>8}{scan_ms:>12.2f}{index_ms:>12.2f}{ranked_ms:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_storage.py
+# -*- coding: utf-8 -*-
+"""对比 JSON、SQLite 与记录式存储的加载、增删改与搜索耗时
+
+用法: python -m benchmarks.bench_storage [--sizes 1000,100000,1000000]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import generate_memos
+from src.model.data_store import DataStore
+from src.model.record_store import RecordDataStore
+from src.model.sqlite_store import SqliteDataStore
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+def bench_backend(name, open_store, query):
+    store, load_ms = _timed(open_store)
+    memo, add_ms = _timed(lambda: store.add_memo("benchmark 新增 #工作"))
+    _, update_ms = _timed(lambda: store.update_memo(memo.id, "更新", "更新后的内容", ["工作"]))
+    # n-gram 索引的建立单独计时；SQLite 的长查询由 FTS 表回答，不建该索引
+    if store._uses_search_index(query):
+        _, index_ms = _timed(store._get_search_index)
+        index_col = f"{index_ms:8.1f} ms"
+    else:
+        index_col = f"{'-':>8}   "
+    _, search_ms = _timed(lambda: store.search(query))
+    _, delete_ms = _timed(lambda: store.delete_memo(memo.id))
+    # JSON 存储的写入在后台线程完成，flush 为等待落盘的时间
+    _, flush_ms = _timed(store.flush)
+    store.close()
+    print(f"  {name:<7} load {load_ms:9.1f} ms | add {add_ms:8.1f} ms | update {update_ms:8.1f} ms"
+          f" | delete {delete_ms:8.1f} ms | index {index_col} | search {search_ms:8.1f} ms"
+          f" | flush {flush_ms:8.1f} ms")
+
+def run(size, query):
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "memos.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(generate_memos(size), f, indent=2, ensure_ascii=False)
+
+        db_path = os.path.join(tmp, "memos.db")
+        # 一次性迁移单独计时，之后的加载才是日常启动开销
+        _, migrate_ms = _timed(lambda: SqliteDataStore(db_path, json_path).close())
+        _, record_migrate_ms = _timed(lambda: RecordDataStore(json_path).close())
+
+        print(f"{size} memos (sqlite migration {migrate_ms:.1f} ms, record migration {record_migrate_ms:.1f} ms)")
+        bench_backend("json", lambda: DataStore(json_path), query)
+        bench_backend("sqlite", lambda: SqliteDataStore(db_path, json_path), query)
+        bench_backend("record", lambda: RecordDataStore(json_path), query)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--query", default="评审 design")
+    args = parser.parse_args()
+    for size in (int(s) for s in args.sizes.split(",")):
+        run(size, args.query)
+
+if __name__ == "__main__":
+    main()
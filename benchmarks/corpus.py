@@ -0,0 +1,79 @@
+# benchmarks/corpus.py
+# -*- coding: utf-8 -*-
+"""生成用于性能测试的合成备忘录数据：中英文混排的正文、部分 Markdown 格式，
+标签按近似 Zipf 的偏斜分布抽取（少数标签很常见，多数很少出现）"""
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+WORDS = ["会议", "记录", "项目", "进度", "学习", "笔记", "周报", "需求", "设计", "评审",
+         "meeting", "notes", "release", "bugfix", "review", "design", "todo", "draft"]
+PHRASES = ["今天完成了", "需要跟进", "下周之前", "和团队讨论", "整理一下", "记得提醒",
+           "初步方案", "遗留问题", "参考资料", "明天继续"]
+TAGS = ["工作", "学习", "生活", "重要", "想法", "待办"]
+# 长尾标签，出现频率按排名递减
+RARE_TAGS = TAGS + ["阅读", "健身", "旅行", "财务", "家庭", "灵感", "python", "qt",
+                    "release", "bug", "周会", "面试", "读书笔记", "购物", "电影", "音乐",
+                    "菜谱", "年度计划", "随笔", "archive"]
+# 标签个数 0..4 的权重
+TAG_COUNT_WEIGHTS = [35, 35, 18, 8, 4]
+# 带 Markdown 格式的备忘所占比例
+MARKDOWN_RATIO = 0.3
+
+_TAG_CUM_WEIGHTS = list(accumulate(1 / (rank + 1) for rank in range(len(RARE_TAGS))))
+_COUNT_CUM_WEIGHTS = list(accumulate(TAG_COUNT_WEIGHTS))
+
+def _sentence(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(3, 12))]
+    if rng.random() < 0.5:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(PHRASES))
+    return " ".join(words)
+
+def _plain_content(rng):
+    return " ".join(_sentence(rng) for _ in range(rng.randint(1, 5)))
+
+def _markdown_content(rng):
+    lines = [f"## {_sentence(rng)}", ""]
+    for _ in range(rng.randint(1, 3)):
+        kind = rng.random()
+        if kind < 0.4:
+            lines.extend(f"- {_sentence(rng)}" for _ in range(rng.randint(2, 5)))
+        elif kind < 0.7:
+            lines.append(f"{_sentence(rng)} **{rng.choice(WORDS)}** `{rng.choice(WORDS)}`")
+        elif kind < 0.85:
+            lines.extend(f"{i}. {_sentence(rng)}" for i in range(1, rng.randint(3, 5)))
+        else:
+            lines.append(f"> {_sentence(rng)} [{rng.choice(WORDS)}](https://example.com/{rng.randint(1, 999)})")
+        lines.append("")
+    return "\n".join(lines).strip()
+
+def _tags(rng):
+    count = rng.choices(range(len(TAG_COUNT_WEIGHTS)), cum_weights=_COUNT_CUM_WEIGHTS)[0]
+    tags = []
+    while len(tags) < count:
+        tag = rng.choices(RARE_TAGS, cum_weights=_TAG_CUM_WEIGHTS)[0]
+        if tag not in tags:
+            tags.append(tag)
+    return tags
+
+def generate_memos(count, seed=0):
+    """返回 count 条 memos.json 格式的字典，按 created_at 从新到旧排列"""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    items = []
+    for i in range(count):
+        created = start - timedelta(minutes=i * 7)
+        if rng.random() < MARKDOWN_RATIO:
+            content = _markdown_content(rng)
+        else:
+            content = _plain_content(rng)
+        first_line = content.split("\n", 1)[0].lstrip("#>-*. ")
+        items.append({
+            "id": int(created.timestamp() * 1000),
+            "title": first_line[:20].strip(),
+            "content": content,
+            "tags": _tags(rng),
+            "created_at": created.isoformat(),
+            "time_str": created.strftime("%H:%M")
+        })
+    return items
@@ -0,0 +1,191 @@
+# benchmarks/run_suite.py
+# -*- coding: utf-8 -*-
+"""无界面运行的整体性能测试：数据存储的加载、保存与增删改，主窗口搜索、悬浮窗翻页
+和列表刷新，结果写入 JSON 以便比较不同版本
+
+用法: python -m benchmarks.run_suite [--sizes 1000,100000] [--backend json]
+                                    [--output results.json] [--baseline old.json]
+默认使用 Qt 的 offscreen 平台，不需要显示器
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# 必须在导入 Qt 和 src 之前设置：无显示器运行，配置和数据放在临时目录
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+DATA_DIR = tempfile.mkdtemp(prefix="memoflow-bench-")
+os.environ["MEMOFLOW_DATA_DIR"] = DATA_DIR
+
+from PyQt6.QtCore import QT_VERSION_STR, QEvent
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.corpus import generate_memos
+from src.core.utils import MEMOS_PATH, SETTINGS_PATH
+from src.model.data_store import create_data_store
+from src.model.settings_model import SettingsModel
+from src.presenter.main_presenter import MainPresenter
+
+QUERIES = ["评审", "design", "评审 design", "不存在的内容"]
+# 每种增删改操作重复的次数，结果取平均
+STORE_OPS = 20
+NAVIGATE_STEPS = 50
+LIST_REFRESHES = 5
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+def prepare_data(size, backend):
+    """清空数据目录，写入 size 条备忘的 memos.json 和选择 backend 的 settings.json"""
+    for name in os.listdir(DATA_DIR):
+        path = os.path.join(DATA_DIR, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    with open(MEMOS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(generate_memos(size), f, indent=2, ensure_ascii=False)
+    with open(SETTINGS_PATH, 'w', encoding='utf-8') as f:
+        json.dump({"storage_backend": backend, "show_floating_window": False}, f)
+
+def bench_store(results):
+    settings = SettingsModel()
+    store, results["store_load_ms"] = _timed(lambda: create_data_store(settings))
+    while store.has_pending_data():
+        store.load_more()
+
+    memos = []
+    start = time.perf_counter()
+    for i in range(STORE_OPS):
+        memos.append(store.add_memo(f"benchmark 新增 {i} #工作"))
+    results["store_add_ms"] = (time.perf_counter() - start) * 1000 / STORE_OPS
+    start = time.perf_counter()
+    for memo in memos:
+        store.update_memo(memo.id, "更新", "更新后的 **内容**", ["工作", "重要"])
+    results["store_update_ms"] = (time.perf_counter() - start) * 1000 / STORE_OPS
+    start = time.perf_counter()
+    for memo in memos:
+        store.delete_memo(memo.id)
+    results["store_delete_ms"] = (time.perf_counter() - start) * 1000 / STORE_OPS
+    # 增删改只标记待写，flush 等待后台线程把最终状态落盘
+    _, results["store_save_ms"] = _timed(store.flush)
+    store.close()
+
+def _wait_until(app, done, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while not done() and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+def bench_presenter(app, results):
+    presenter, results["presenter_init_ms"] = _timed(MainPresenter)
+    presenter.start()
+    # 等待首屏之后的分步构建全部完成
+    _wait_until(app, lambda: presenter._startup_started and not presenter._startup_stages)
+    _wait_until(app, lambda: not presenter.data_store.has_pending_data())
+    app.processEvents()
+
+    # 搜索在后台线程分页完成，计时到最后一页送达界面为止
+    for query in QUERIES:
+        def search():
+            presenter.on_search_changed(query)
+            presenter.search_pool.waitForDone()
+            app.processEvents()
+        _, ms = _timed(search)
+        # 第一次搜索包含建立索引的时间
+        results[f"search_ms[{query}]"] = ms
+    presenter.on_search_changed("")
+    app.processEvents()
+
+    presenter._ensure_floating_window()
+    elapsed = 0.0
+    for _ in range(NAVIGATE_STEPS):
+        _, ms = _timed(lambda: presenter.navigate_memo(1))
+        elapsed += ms
+        # 空闲时的预取不计入翻页耗时
+        app.processEvents()
+    results["navigate_ms"] = elapsed / NAVIGATE_STEPS
+
+    memos = presenter.data_store.get_memos()
+    elapsed = 0.0
+    for _ in range(LIST_REFRESHES):
+        def refresh():
+            presenter.main_window.update_memo_list(memos)
+            app.processEvents()
+        _, ms = _timed(refresh)
+        elapsed += ms
+    results["update_memo_list_ms"] = elapsed / LIST_REFRESHES
+
+    presenter.quit_app()
+    for window in (presenter.main_window, presenter.floating_window, presenter.editor_dialog_window):
+        if window is not None:
+            window.hide()
+            window.deleteLater()
+    if presenter.main_window.tray is not None:
+        presenter.main_window.tray.hide()
+    # processEvents 不处理 deleteLater，这里立即删除，下一轮不会与旧窗口共存
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    app.processEvents()
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)["results"]
+    print(f"\n{'size':>8}  {'metric':<28}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for size, metrics in results.items():
+        for name, value in metrics.items():
+            old = baseline.get(size, {}).get(name)
+            if old:
+                print(f"{size:>8}  {name:<28}{old:>12.2f}{value:>12.2f}{value / old:>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,100000")
+    parser.add_argument("--backend", default="json")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    app.setQuitOnLastWindowClosed(False)
+    results = {}
+    try:
+        for size in (int(s) for s in args.sizes.split(",")):
+            prepare_data(size, args.backend)
+            metrics = results[str(size)] = {}
+            bench_store(metrics)
+            bench_presenter(app, metrics)
+            print(f"{size} memos")
+            for name, value in metrics.items():
+                print(f"  {name:<28}{value:>10.2f} ms")
+    finally:
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"suite-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "backend": args.backend,
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM")
+        },
+        "results": results
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nresults written to {output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+if __name__ == "__main__":
+    main()
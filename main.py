@@ -1,7 +1,14 @@
 # main.py
+import os
 import sys
+# 最先导入，作为启动时间线的零点
+from src.core import profiling
+if "--profile" in sys.argv:
+    os.environ[profiling.PROFILE_ENV] = "1"
+
 from PyQt6.QtWidgets import QApplication
 from src.presenter.main_presenter import MainPresenter
+profiling.mark("imports")
 
 def main():
     app = QApplication(sys.argv)
@@ -0,0 +1,49 @@
+# src/core/profiling.py
+# -*- coding: utf-8 -*-
+"""轻量的耗时记录：设置环境变量 MEMOFLOW_PROFILE=1（或 python main.py --profile）后
+把测量结果输出到 stderr，未开启时只在内存中保留最近的样本，开销可以忽略"""
+import os
+import sys
+import time
+from collections import defaultdict, deque
+
+PROFILE_ENV = "MEMOFLOW_PROFILE"
+# 每种测量保留的最近样本数
+MAX_SAMPLES = 100
+
+# 启动时间线以本模块被导入的时刻为零点，main.py 最先导入它
+_START = time.perf_counter()
+_samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_timeline = []
+
+def enabled():
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+def record(name, ms):
+    """记录一次名为 name 的耗时（毫秒）"""
+    _samples[name].append(ms)
+    if enabled():
+        print(f"[profile] {name}: {ms:.1f} ms", file=sys.stderr)
+
+def samples(name):
+    return list(_samples.get(name, ()))
+
+def mark(name):
+    """在启动时间线上记录一个阶段完成的时刻（距进程启动的毫秒数）"""
+    ms = (time.perf_counter() - _START) * 1000
+    _timeline.append((name, ms))
+    return ms
+
+def timeline():
+    return list(_timeline)
+
+def report_startup():
+    """输出启动时间线：每个阶段的完成时刻和距上一阶段的间隔"""
+    if not enabled():
+        return
+    lines = ["[startup] timeline:"]
+    previous = 0.0
+    for name, ms in _timeline:
+        lines.append(f"  {name:<20}{ms:>9.1f} ms  (+{ms - previous:.1f})")
+        previous = ms
+    print("\n".join(lines), file=sys.stderr)
@@ -1,30 +1,134 @@
 # src/core/theme.py
 # -*- coding: utf-8 -*-
+from string import Template
+
+# 整个应用只有这一份样式表：控件通过 objectName（#Name）或动态属性 variant 匹配规则，
+# 不再各自调用 setStyleSheet。$name 在编译时替换为当前主题的颜色
+_QSS = Template("""
+QMainWindow, QDialog { background-color: $bg_primary; color: $text_primary; }
+QLabel, QCheckBox { color: $text_primary; }
+QToolTip { background-color: $bg_secondary; color: $text_primary; border: 1px solid $border; }
+
+QMenu { background-color: $bg_secondary; color: $text_primary; border: 1px solid $border; }
+QMenu::item:selected { background-color: $accent; color: $on_accent; }
+
+QSpinBox { background-color: $bg_secondary; border: 1px solid $border; border-radius: 4px; padding: 4px; color: $text_primary; }
+QComboBox { background-color: $bg_secondary; border: 1px solid $border; border-radius: 4px; padding: 4px 8px; color: $text_primary; }
+QComboBox QAbstractItemView { background-color: $bg_secondary; color: $text_primary; selection-background-color: $accent; }
+QLineEdit#TagInput { background-color: $bg_secondary; border: 1px solid $border; border-radius: 4px; padding: 5px; color: $text_primary; }
+QListWidget { background-color: $bg_secondary; border: 1px solid $border; border-radius: 4px; color: $text_primary; }
+
+QGroupBox { border: 1px solid $border; border-radius: 6px; margin-top: 12px; padding-top: 10px; color: $text_primary; font-weight: bold; }
+QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 3px; }
+QCheckBox { spacing: 8px; }
+QCheckBox::indicator { width: 18px; height: 18px; border: 1px solid $border; border-radius: 4px; background-color: $bg_secondary; }
+QCheckBox::indicator:checked { background-color: $accent; border: 1px solid $accent; }
+
+/* 按钮：variant = primary / secondary / danger / dangerOutline / chip / tag / tagOption */
+QPushButton[variant="primary"] { background-color: $accent; color: $on_accent; border: none; border-radius: 4px; padding: 6px 12px; }
+QPushButton[variant="primary"]:hover { background-color: $accent_hover; }
+QPushButton[variant="secondary"] { background-color: $bg_secondary; color: $text_primary; border: 1px solid $border; border-radius: 4px; padding: 8px 20px; }
+QPushButton[variant="secondary"]:hover { background-color: $hover; }
+QPushButton[variant="danger"] { background-color: $danger; color: $on_accent; border: none; border-radius: 4px; padding: 6px 12px; }
+QPushButton[variant="dangerOutline"] { color: $danger; background: transparent; border: 1px solid $danger; border-radius: 4px; padding: 4px 12px; }
+QPushButton[variant="dangerOutline"]:hover { background-color: $danger_bg; }
+QPushButton[variant="chip"] { background: transparent; color: $text_secondary; border: 1px solid $border; border-radius: 10px; padding: 1px 8px; font-size: 11px; }
+QPushButton[variant="chip"]:checked { color: $on_accent; background-color: $accent; border: 1px solid $accent; }
+QPushButton[variant="tag"] { background-color: $tag_bg; color: $accent; border: 1px solid $accent; border-radius: 12px; padding: 2px 8px; font-size: 11px; margin-right: 4px; }
+QPushButton[variant="tag"]:hover { background-color: $accent; color: $on_accent; }
+QPushButton[variant="tag"][filterState="include"] { background-color: $accent; color: $on_accent; }
+QPushButton[variant="tag"][filterState="exclude"] { background-color: transparent; color: $danger; border: 1px solid $danger; text-decoration: line-through; }
+QPushButton[variant="tagOption"] { background-color: $bg_secondary; color: $text_secondary; border: 1px solid $border; border-radius: 12px; padding: 4px 12px; font-size: 12px; }
+QPushButton[variant="tagOption"]:checked { background-color: $tag_bg; color: $accent; border: 1px solid $accent; }
+
+/* 主窗口 */
+#SearchBar { background-color: $bg_primary; border-bottom: 1px solid $border; }
+QLineEdit#SearchInput { background-color: $bg_secondary; border: none; border-radius: 15px; padding: 4px 12px; color: $text_primary; }
+QListView#MemoList { border: none; background-color: $bg_list; }
+#InputArea { background-color: $bg_primary; border-top: 1px solid $bg_secondary; }
+QLineEdit#QuickInput { background-color: $bg_input; color: $text_primary; border: 1px solid $border; border-radius: 6px; padding: 4px 8px; }
+QLineEdit#QuickInput:focus { border: 1px solid $accent; }
+QPushButton#SendButton { font-weight: bold; border-radius: 6px; height: 28px; padding: 0px; }
+
+/* 编辑器 */
+#EditorView { background-color: $bg_primary; }
+QLabel#EditorHeading { color: $text_secondary; font-size: 14px; }
+QLabel#EditorHint { color: $text_secondary; font-size: 12px; }
+QLineEdit#EditorTitle { background: transparent; border: none; border-bottom: 1px solid $border; border-radius: 0px; color: $text_primary; font-size: 18px; font-weight: bold; padding: 4px 0px; }
+QLineEdit#EditorTitle:focus { border-bottom: 1px solid $accent; }
+QTextEdit#EditorText { background-color: $bg_secondary; border: 1px solid $border; border-radius: 6px; padding: 10px; font-size: 14px; color: $text_primary; }
+QScrollArea#EditorTagScroll, #EditorTagContainer { background: transparent; border: none; }
+QPushButton#SaveButton { padding: 8px 20px; font-weight: bold; }
+
+/* 悬浮窗 */
+#FloatingContainer { background-color: $bg_primary; border: 1px solid $border; border-radius: 12px; }
+QLabel#FloatingTitle { color: $text_primary; font-size: 16px; font-weight: bold; }
+QTextEdit#FloatingContent { border: none; background: transparent; color: $text_primary; font-size: 13px; }
+""")
+
 
 class AppTheme:
-    """集中管理应用的颜色和样式"""
-    COLORS = {
-        "bg_primary": "#2d2d30",
-        "bg_secondary": "#3e3e42",
-        "border": "#565869",
-        "text_primary": "#ECECF1",
-        "text_secondary": "#9CA3AF",
-        "text_time": "#6B7280",
-        "accent": "#10A37F",
-        "tag_bg": "rgba(16, 163, 127, 0.12)",
-        "shadow": "rgba(0, 0, 0, 120)"
+    """集中管理应用的颜色和样式：每个主题编译一次为应用级样式表，切换主题时整体替换"""
+    THEMES = {
+        "dark": {
+            "bg_primary": "#2d2d30",
+            "bg_secondary": "#3e3e42",
+            "bg_list": "#1e1e1e",
+            "bg_input": "#1e1e1e",
+            "border": "#565869",
+            "hover": "#4a4a4f",
+            "text_primary": "#ECECF1",
+            "text_secondary": "#9CA3AF",
+            "text_time": "#6B7280",
+            "accent": "#10A37F",
+            "accent_hover": "#0e8c6d",
+            "on_accent": "white",
+            "danger": "#e74c3c",
+            "danger_bg": "rgba(231, 76, 60, 0.1)",
+            "tag_bg": "rgba(16, 163, 127, 0.12)",
+            "shadow": "rgba(0, 0, 0, 120)"
+        },
+        "light": {
+            "bg_primary": "#F7F7F8",
+            "bg_secondary": "#ECECF1",
+            "bg_list": "#FFFFFF",
+            "bg_input": "#FFFFFF",
+            "border": "#D1D5DB",
+            "hover": "#E5E7EB",
+            "text_primary": "#1F2937",
+            "text_secondary": "#6B7280",
+            "text_time": "#9CA3AF",
+            "accent": "#10A37F",
+            "accent_hover": "#0e8c6d",
+            "on_accent": "white",
+            "danger": "#e74c3c",
+            "danger_bg": "rgba(231, 76, 60, 0.1)",
+            "tag_bg": "rgba(16, 163, 127, 0.12)",
+            "shadow": "rgba(0, 0, 0, 60)"
+        }
     }
+    DEFAULT_THEME = "dark"
 
-    @staticmethod
-    def get_stylesheet(widget_name):
-        c = AppTheme.COLORS
-        styles = {
-            "FloatingWindow": f"background-color: {c['bg_primary']}; border: 1px solid {c['border']}; border-radius: 12px;",
-            "TitleLabel": f"color: {c['text_primary']}; font-size: 16px; font-weight: bold;",
-            "ContentText": f"color: {c['text_primary']}; font-size: 13px; border: none; background: transparent;",
-            "ListTitle": f"color: {c['text_primary']}; font-size: 14px; font-weight: 600;",
-            "ListTime": f"color: {c['text_time']}; font-size: 12px;",
-            "ListPreview": f"color: {c['text_secondary']}; font-size: 12px;",
-            "Tag": f"color: {c['accent']}; font-size: 11px; background-color: {c['tag_bg']}; border-radius: 10px; padding: 2px 8px;"
-        }
-        return styles.get(widget_name, "")
+    # 当前主题的颜色；apply 时原地更新，已持有这个 dict 的代码也能读到新值
+    COLORS = dict(THEMES[DEFAULT_THEME])
+    current = DEFAULT_THEME
+    _compiled = {}
+
+    @classmethod
+    def stylesheet(cls, name=None):
+        """返回主题编译后的样式表，每个主题只编译一次"""
+        name = name if name in cls.THEMES else cls.current
+        qss = cls._compiled.get(name)
+        if qss is None:
+            qss = cls._compiled[name] = _QSS.substitute(cls.THEMES[name])
+        return qss
+
+    @classmethod
+    def apply(cls, app, name):
+        """把主题设置到整个应用：一次 setStyleSheet，由 Qt 统一重新应用到所有控件"""
+        if name not in cls.THEMES:
+            name = cls.DEFAULT_THEME
+        cls.current = name
+        cls.COLORS.clear()
+        cls.COLORS.update(cls.THEMES[name])
+        app.setStyleSheet(cls.stylesheet(name))
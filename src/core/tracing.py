@@ -0,0 +1,154 @@
+# src/core/tracing.py
+# -*- coding: utf-8 -*-
+"""热点路径的跟踪：用 span() / @traced 标出一段代码，开启后把每段的起止时刻记入环形缓冲区，
+可导出为 Chrome trace-event JSON（在 chrome://tracing 或 https://ui.perfetto.dev 中打开）。
+
+设置环境变量 MEMOFLOW_TRACE=1 启动时即开启，退出时导出到数据目录；
+值以 .json 结尾时导出到该路径。也可以在托盘菜单中随时开启和导出。
+未开启时 span() 返回共用的空对象，@traced 只多一次布尔判断，开销可以忽略。
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import wraps
+
+TRACE_ENV = "MEMOFLOW_TRACE"
+# 环形缓冲区保留的最近事件数，写满后最早的事件被丢弃
+RING_SIZE = 50000
+
+_START = time.perf_counter()
+_PID = os.getpid()
+_env_value = os.environ.get(TRACE_ENV, "")
+_enabled = _env_value not in ("", "0")
+# 事件以元组保存：(ph, name, cat, ts_us, dur_us, tid, args)，导出时再转成字典
+_events = deque(maxlen=RING_SIZE)
+_thread_names = {}
+_async_ids = iter(range(1, 1 << 62))
+
+
+def enabled():
+    return _enabled
+
+def set_enabled(value):
+    global _enabled
+    _enabled = bool(value)
+
+def clear():
+    _events.clear()
+
+def _now_us():
+    return (time.perf_counter() - _START) * 1e6
+
+def _tid():
+    tid = threading.get_ident()
+    if tid not in _thread_names:
+        _thread_names[tid] = threading.current_thread().name
+    return tid
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _now_us()
+        _events.append(("X", self.name, self.cat, self.start, end - self.start, _tid(), self.args))
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, cat="app", **args):
+    """with span("名称"): ... 记录这段代码的耗时；未开启时什么也不做"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args or None)
+
+def traced(name=None, cat="app"):
+    """函数装饰器，每次调用记为一个 span，名称默认取函数的限定名"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, cat, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def begin(name, cat="app", **args):
+    """开始一段跨越多次事件循环的异步区间（如动画），返回交给 end() 的标记；未开启时返回 None"""
+    if not _enabled:
+        return None
+    token = (name, cat, next(_async_ids))
+    _events.append(("b", name, cat, _now_us(), token[2], _tid(), args or None))
+    return token
+
+def end(token, **args):
+    if token is None:
+        return
+    name, cat, async_id = token
+    _events.append(("e", name, cat, _now_us(), async_id, _tid(), args or None))
+
+def _to_trace_event(event):
+    ph, name, cat, ts, value, tid, args = event
+    item = {"ph": ph, "name": name, "cat": cat, "ts": round(ts, 3), "pid": _PID, "tid": tid}
+    if ph == "X":
+        item["dur"] = round(value, 3)
+    else:
+        item["id"] = value
+    if args:
+        item["args"] = args
+    return item
+
+def export_chrome_trace(path):
+    """把缓冲区中的事件写成 Chrome trace-event JSON，返回导出的事件数"""
+    events = list(_events)
+    trace = [{"ph": "M", "name": "process_name", "pid": _PID, "tid": 0, "args": {"name": "MemoFlow"}}]
+    for tid, thread_name in list(_thread_names.items()):
+        trace.append({"ph": "M", "name": "thread_name", "pid": _PID, "tid": tid, "args": {"name": thread_name}})
+    trace.extend(_to_trace_event(event) for event in events)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f, ensure_ascii=False, default=str)
+    return len(events)
+
+def default_export_path():
+    from src.core.utils import DATA_DIR
+    return os.path.join(DATA_DIR, f"trace-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+
+def export_from_env():
+    """按 MEMOFLOW_TRACE 的设置在退出时导出，返回写入的路径；未设置时返回 None"""
+    if _env_value in ("", "0"):
+        return None
+    path = _env_value if _env_value.lower().endswith(".json") else default_export_path()
+    try:
+        export_chrome_trace(path)
+        return path
+    except:
+        return None
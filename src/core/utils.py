@@ -2,12 +2,20 @@
 # -*- coding: utf-8 -*-
 import os
 import sys
-import winreg
 
-# 定义全局路径
+# 开机自启只在 Windows 上可用；其他平台（如在 Linux 上无界面运行性能测试）照常导入
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+# 定义全局路径；环境变量 MEMOFLOW_DATA_DIR 可把配置和数据放到其他目录
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-SETTINGS_PATH = os.path.join(BASE_DIR, 'settings.json')
-MEMOS_PATH = os.path.join(BASE_DIR, 'memos.json')
+DATA_DIR = os.environ.get("MEMOFLOW_DATA_DIR") or BASE_DIR
+SETTINGS_PATH = os.path.join(DATA_DIR, 'settings.json')
+MEMOS_PATH = os.path.join(DATA_DIR, 'memos.json')
+MEMOS_DB_PATH = os.path.join(DATA_DIR, 'memos.db')
+STALL_LOG_PATH = os.path.join(DATA_DIR, 'stalls.log')
 
 class AutoStart:
     def __init__(self, app_name="MemoFlow"):
@@ -19,6 +27,7 @@ class AutoStart:
         self.key_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
 
     def is_enabled(self):
+        if winreg is None: return False
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.key_path, 0, winreg.KEY_READ)
             value, _ = winreg.QueryValueEx(key, self.app_name)
@@ -28,6 +37,7 @@ class AutoStart:
             return False
 
     def set_state(self, enable=True):
+        if winreg is None: return False
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.key_path, 0, winreg.KEY_WRITE)
             if enable:
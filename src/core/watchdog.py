@@ -0,0 +1,153 @@
+# src/core/watchdog.py
+# -*- coding: utf-8 -*-
+"""GUI 线程卡顿检测：GUI 线程上的 QTimer 定期打心跳，后台线程发现心跳停了超过阈值时
+用 sys._current_frames 抓下 GUI 线程此刻的 Python 调用栈，写入数据目录下按大小轮换的日志。
+
+开销只有每 HEARTBEAT_MS 一次的计时器回调和后台线程的定期唤醒，可以一直开着。
+"""
+import logging
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+from PyQt6.QtCore import QObject, QTimer
+from src.core.utils import STALL_LOG_PATH
+
+# settings.json 中 stall_threshold_ms 的默认值，0 表示关闭检测
+STALL_THRESHOLD_MS = 500
+HEARTBEAT_MS = 100
+# 日志文件上限和保留的旧文件个数
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+# 系统挂起期间 CLOCK_BOOTTIME 照常走而 monotonic 不走（Linux），两者走过的时间之差就是挂起时长；
+# 没有该时钟的平台无法区分挂起和检测线程自己被阻塞，只在日志中注明
+_BOOTTIME = getattr(time, "CLOCK_BOOTTIME", None)
+
+
+def _boottime():
+    return time.clock_gettime(_BOOTTIME) if _BOOTTIME is not None else None
+
+
+class StallWatchdog(QObject):
+    def __init__(self, threshold_ms=STALL_THRESHOLD_MS, log_path=STALL_LOG_PATH, parent=None):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path
+        self.stall_count = 0
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._logger = None
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self._beat)
+
+    def start(self):
+        if self._thread is not None or self.threshold_ms <= 0:
+            return
+        self._last_beat = time.monotonic()
+        self._stop_event.clear()
+        self.heartbeat.start()
+        self._thread = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self.heartbeat.stop()
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._close_logger()
+
+    def set_threshold(self, threshold_ms):
+        """阈值变化时重启检测线程，设为 0 则停止"""
+        self.stop()
+        self.threshold_ms = threshold_ms
+        self.start()
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+
+    def _watch(self):
+        # 一次卡顿只抓一次栈：发现时记录调用栈，心跳恢复后补记总时长
+        poll = max(self.threshold_ms / 4000, 0.02)
+        stall_beat = None
+        stall_started = 0.0
+        woke, woke_boot = time.monotonic(), _boottime()
+        while not self._stop_event.wait(poll):
+            now, now_boot = time.monotonic(), _boottime()
+            overslept = (now - woke - poll) * 1000
+            suspended = 0.0 if now_boot is None else max(0.0, (now_boot - woke_boot) - (now - woke)) * 1000
+            woke, woke_boot = now, now_boot
+            last_beat = self._last_beat
+            note = ""
+            if overslept > self.threshold_ms:
+                if overslept - suspended <= self.threshold_ms:
+                    # 迟到的时间都花在系统挂起上，不算卡顿
+                    stall_beat = None
+                    self._last_beat = now
+                    continue
+                # 本线程也没能按时醒来：GUI 线程在持有 GIL 的长调用（如 C 实现的正则匹配）里，
+                # 或者是无法区分的系统挂起。照样记录，调用栈只能在恢复之后抓取
+                note = (f"检测线程也迟到了 {overslept:.0f} ms，"
+                        + ("可能是持有 GIL 的长调用或系统休眠" if now_boot is None else "多半是持有 GIL 的长调用")
+                        + "，调用栈取自恢复之后")
+            if stall_beat is not None:
+                if last_beat != stall_beat:
+                    self._log_recovered((last_beat - stall_started) * 1000)
+                    stall_beat = None
+                continue
+            # 心跳本应每 HEARTBEAT_MS 到来一次，超出的部分即事件循环没有响应的时间
+            lag_ms = (now - last_beat) * 1000 - HEARTBEAT_MS
+            if note and lag_ms <= self.threshold_ms:
+                # GIL 释放后心跳抢在本线程之前恢复了，卡顿已经结束，以本线程迟到的时长记一次
+                self._log_stall(overslept, note)
+                self._log_recovered(overslept)
+            elif lag_ms > self.threshold_ms:
+                stall_beat = last_beat
+                stall_started = last_beat + HEARTBEAT_MS / 1000
+                self._log_stall(lag_ms, note)
+        if stall_beat is not None:
+            self._log_recovered((time.monotonic() - stall_started) * 1000)
+
+    def _gui_stack(self):
+        frame = sys._current_frames().get(self._gui_thread_id)
+        if frame is None:
+            return "  <GUI 线程的调用栈不可用>\n"
+        return "".join(traceback.format_stack(frame))
+
+    def _log_stall(self, lag_ms, note=""):
+        self.stall_count += 1
+        self._get_logger().warning("stall #%d: GUI 线程已 %.0f ms 未响应（阈值 %d ms）%s\n%s",
+                                   self.stall_count, lag_ms, self.threshold_ms,
+                                   f"；{note}" if note else "", self._gui_stack())
+
+    def _log_recovered(self, duration_ms):
+        self._get_logger().warning("stall #%d: 结束，共 %.0f ms", self.stall_count, duration_ms)
+
+    def _get_logger(self):
+        # 第一次卡顿时才创建日志文件。每个实例用自己的 Logger（不注册到 logging 的全局表），
+        # 各自写入自己的 log_path，stop() 时关闭文件
+        if self._logger is None:
+            logger = logging.Logger("memoflow.stall", logging.WARNING)
+            try:
+                handler = RotatingFileHandler(self.log_path, maxBytes=LOG_MAX_BYTES,
+                                              backupCount=LOG_BACKUPS, encoding='utf-8')
+            except:
+                handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def _close_logger(self):
+        if self._logger is None:
+            return
+        for handler in self._logger.handlers[:]:
+            self._logger.removeHandler(handler)
+            handler.close()
+        self._logger = None
@@ -3,22 +3,71 @@
 import json
 import os
 import re
+import threading
 from datetime import datetime
+from src.core import tracing
 from src.core.utils import MEMOS_PATH
+from src.model.memo_collection import MemoCollection, sort_key
 from src.model.memo_model import Memo
+from src.model.persistence import WriteBehindWriter, atomic_write, file_lock
+from src.model.ranking import rank_memos
+from src.model.search_index import NgramIndex
+from src.model.tag_index import TagIndex
+
+# iter_search 每次持锁检查的条数
+SEARCH_BLOCK_SIZE = 2000
+
+def record_hash(item):
+    """memos.json 中一条记录的内容哈希，用于找出外部修改过的记录（只在本进程内比较）"""
+    return hash((item.get("title"), item.get("content"), tuple(item.get("tags") or ()),
+                 item.get("created_at"), item.get("time_str")))
+
 
 class DataStore:
-    def __init__(self):
-        self.file_path = MEMOS_PATH
-        self.memos = self._load_data()
+    # 数据文件是否可能被其他程序修改并需要重新读入；其他存储格式各自管理多个文件，不参与
+    WATCHES_FILE = True
+    # 短于该长度的查询没有可用的 n-gram，逐条比对索引中保存的规范化文本
+    MIN_INDEXED_QUERY = 2
+
+    def __init__(self, file_path=MEMOS_PATH, save_window_ms=500):
+        self.file_path = file_path
+        self.save_window_ms = save_window_ms
+        # 保护 memos，后台线程读取快照时与 GUI 线程上的修改互斥
+        self._lock = threading.RLock()
+        self._writer = None
+        self._search_index = None
+        self._tag_index = None
+        # 搜索索引在锁外建立，期间被增删改的 id 记在这里，装入索引前补上；不在建立时为 None
+        self._index_changes = None
+        self._index_build_lock = threading.Lock()
+        # 上次读入或写出时文件的 (mtime, 大小) 和各记录的内容哈希，据此区分外部修改
+        self._disk_signature = None
+        self._disk_hashes = {}
+        self._written_hashes = {}
+        # 写线程在写入前合并进来的外部修改 (added, updated, removed)，等 GUI 线程的 reload_external 取走
+        self._merged_external = None
+        with tracing.span(f"{type(self).__name__}.load", "store"):
+            self.memos = MemoCollection(self._load_data())
 
     def _load_data(self):
+        self._disk_signature = self._file_signature()
+        items = self._read_snapshot()
+        self._disk_hashes = {item.get("id", 0): record_hash(item) for item in items}
+        memos = [Memo.from_dict(item) for item in items]
+        return sorted(memos, key=lambda x: x.created_ts, reverse=True)
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read_snapshot(self):
         if not os.path.exists(self.file_path): return []
         try:
             with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                memos = [Memo.from_dict(item) for item in data]
-                return sorted(memos, key=lambda x: x.created_at, reverse=True)
+                return json.load(f)
         except:
             return []
 
@@ -26,11 +75,148 @@ class DataStore:
         return self.memos
 
     def get_memo_by_id(self, memo_id):
-        for memo in self.memos:
-            if memo.id == memo_id:
-                return memo
-        return None
+        return self.memos.get(memo_id)
+
+    def index_of(self, memo_id):
+        """备忘在 get_memos() 顺序中的位置，不存在时返回 -1"""
+        return self.memos.index_of(memo_id)
+
+    def search(self, text, tag_filter=None):
+        """大小写不敏感的子串搜索（标题与正文拼接后匹配），可再按标签筛选，保持存储顺序"""
+        if not text and not tag_filter: return self.memos
+        if self._uses_search_index(text):
+            self._get_search_index()
+        with self._lock:
+            ids, excluded = self._filter_ids(text, tag_filter)
+            if ids is None:
+                return [m for m in self.memos if m.id not in excluded]
+            return self.memos.select(ids)
+
+    def iter_search(self, text, tag_filter=None, block_size=SEARCH_BLOCK_SIZE):
+        """与 search 结果相同，但从新到旧每检查 block_size 条就产出这一段的命中（可能为空）。
+
+        供后台搜索线程边算边显示，每段之间释放锁，调用方可在两段之间放弃。
+        分页以上一段最后一条的排序键为游标，两段之间的增删不会造成漏行或重复。
+        """
+        index = self._get_search_index() if self._uses_search_index(text) else None
+        # 短查询本来就要逐条扫描，直接在遍历中判断，第一屏不必等全部扫完
+        needle = text.lower() if text and len(text) < self.MIN_INDEXED_QUERY else None
+        ids, excluded, selected = None, (), None
+        with self._lock:
+            if needle is None:
+                ids, excluded = self._filter_ids(text, tag_filter)
+                if ids is not None and len(ids) <= block_size:
+                    selected = self.memos.select(ids)
+            elif tag_filter:
+                ids, excluded = self._get_tag_index().match(tag_filter)
+        if selected is not None:
+            yield selected
+            return
+
+        if ids is None and not excluded and needle is None:
+            matches = None
+        else:
+            def matches(memo):
+                if ids is not None:
+                    if memo.id not in ids: return False
+                elif memo.id in excluded:
+                    return False
+                return needle is None or needle in (index.text_of(memo.id) or "")
+
+        cursor = None
+        while True:
+            with self._lock:
+                block = self.memos.page_after(cursor, block_size)
+                hits = block if matches is None else [m for m in block if matches(m)]
+            if not block:
+                return
+            cursor = sort_key(block[-1])
+            yield hits
 
+    def _filter_ids(self, text, tag_filter):
+        """返回 (ids, excluded)。ids 为 None 时表示除 excluded 外的全部备忘，否则 excluded 已从 ids 中去掉。
+        调用时已持有锁"""
+        ids, excluded = None, set()
+        if tag_filter:
+            ids, excluded = self._get_tag_index().match(tag_filter)
+        if text:
+            found = self._match_ids(text)
+            if ids is None:
+                ids = found - excluded if excluded else found
+            else:
+                ids = found & ids
+        return ids, excluded
+
+    def _uses_search_index(self, text):
+        """_match_ids 查询 text 时是否要用到内存中的 n-gram 索引；需要时在取锁之前先建好"""
+        return bool(text)
+
+    def _match_ids(self, text):
+        """返回匹配 text 的备忘 id 集合，调用时已持有锁，搜索索引已经建好"""
+        return self._search_index.query(text)
+
+    def search_ranked(self, text, limit=50, tag_filter=None):
+        """按相关度排序的模糊搜索，只返回得分最高的 limit 条"""
+        # 没有查询词时只有标签筛选，没有相关度可言，返回全部符合的备忘而不是前 limit 条
+        if not text: return list(self.search(text, tag_filter))
+        index = self._get_search_index()
+        with self._lock:
+            accept = None
+            if tag_filter:
+                ids, excluded = self._get_tag_index().match(tag_filter)
+                accept = ids.__contains__ if ids is not None else (lambda memo_id: memo_id not in excluded)
+            return rank_memos(text, index, self.memos, limit, accept)
+
+    def get_tag_counts(self):
+        """各标签当前被多少条备忘使用"""
+        with self._lock:
+            return self._get_tag_index().counts()
+
+    def _get_tag_index(self):
+        with self._lock:
+            if self._tag_index is None:
+                index = TagIndex()
+                for memo in self.memos:
+                    index.add(memo)
+                self._tag_index = index
+            return self._tag_index
+
+    def _get_search_index(self):
+        """首次搜索时才建立，之后随增删改增量维护，不拖慢启动。
+
+        建立索引要读全部正文，只在取快照和装入时持锁，期间 GUI 线程的增删改照常进行，
+        改动过的 id 记入 _index_changes，装入前按当前内容补上。不能在持有 _lock 时首次调用。
+        """
+        index = self._search_index
+        if index is not None:
+            return index
+        with self._index_build_lock:
+            with self._lock:
+                if self._search_index is not None:
+                    return self._search_index
+                memos = list(self.memos)
+                self._index_changes = set()
+            with tracing.span("DataStore.build_search_index", "store", memos=len(memos)):
+                index = NgramIndex()
+                for memo in memos:
+                    index.add(memo)
+            with self._lock:
+                for memo_id in self._index_changes:
+                    memo = self.memos.get(memo_id)
+                    if memo is None:
+                        index.remove(memo_id)
+                    else:
+                        index.update(memo)
+                self._index_changes = None
+                self._search_index = index
+            return index
+
+    def _index_changed(self, memo_id):
+        """记下正在建立的搜索索引需要补上的改动，调用时已持有锁"""
+        if self._index_changes is not None:
+            self._index_changes.add(memo_id)
+
+    @tracing.traced(cat="store")
     def add_memo(self, raw_text):
         tags = re.findall(r"#(\S+)", raw_text)
         clean_content = re.sub(r"#\S+", "", raw_text).strip()
@@ -39,38 +225,258 @@ class DataStore:
         lines = clean_content.split('\n', 1)
         title = lines[0][:20]
 
+        memo_id = int(datetime.now().timestamp() * 1000)
+        while memo_id in self.memos:
+            memo_id += 1
         new_memo = Memo(
-            id=int(datetime.now().timestamp() * 1000),
+            id=memo_id,
             title=title,
             content=clean_content,
             tags=tags
         )
-        self.memos.insert(0, new_memo)
-        self._save_data()
+        with self._lock:
+            self.memos.add(new_memo)
+            if self._search_index is not None:
+                self._search_index.add(new_memo)
+            self._index_changed(new_memo.id)
+            if self._tag_index is not None:
+                self._tag_index.add(new_memo)
+            self._persist_add(new_memo)
         return new_memo
 
+    @tracing.traced(cat="store")
     def update_memo(self, memo_id, title, content, tags):
-        for memo in self.memos:
-            if memo.id == memo_id:
-                memo.title = title
-                memo.content = content
-                memo.tags = tags
-                self._save_data()
-                return True
-        return False
+        with self._lock:
+            memo = self.memos.get(memo_id)
+            if memo is None:
+                return False
+            if self._tag_index is not None:
+                self._tag_index.remove(memo)
+            memo.title = title
+            memo.content = content
+            memo.tags = tags
+            if self._search_index is not None:
+                self._search_index.update(memo)
+            self._index_changed(memo_id)
+            if self._tag_index is not None:
+                self._tag_index.add(memo)
+            self._persist_update(memo)
+        return True
 
+    @tracing.traced(cat="store")
     def delete_memo(self, memo_id):
-        initial_len = len(self.memos)
-        self.memos = [m for m in self.memos if m.id != memo_id]
-        if len(self.memos) < initial_len:
-            self._save_data()
-            return True
+        with self._lock:
+            memo = self.memos.remove(memo_id)
+            if memo is None:
+                return False
+            if self._search_index is not None:
+                self._search_index.remove(memo_id)
+            self._index_changed(memo_id)
+            if self._tag_index is not None:
+                self._tag_index.remove(memo)
+            self._persist_delete(memo_id)
+        return True
+
+    def has_pending_data(self):
+        """分批加载的存储在启动后是否还有未读入的数据"""
+        return False
+
+    def load_more(self):
+        """再加载一批数据，返回之后是否仍有未加载的数据"""
         return False
 
+    def flush(self):
+        """等待后台写线程把待写修改落盘"""
+        if self._writer:
+            self._writer.flush()
+
+    def close(self):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+    def persistence_stats(self):
+        if self._writer:
+            return self._writer.stats()
+        return {"writes_issued": 0, "writes_coalesced": 0, "bytes_written": 0, "write_ms_total": 0.0,
+                "writes_failed": 0}
+
+    # --- Persistence hooks (子类可按单条记录持久化) ---
+    def _persist_add(self, memo):
+        self._save_data()
+
+    def _persist_update(self, memo):
+        self._save_data()
+
+    def _persist_delete(self, memo_id):
+        self._save_data()
+
     def _save_data(self):
-        try:
+        # 只标记为脏，由写线程在合并窗口结束后统一写入
+        if self._writer is None:
+            self._writer = WriteBehindWriter(self._traced_write_snapshot, self.save_window_ms)
+        self._writer.mark_dirty()
+
+    def _traced_write_snapshot(self):
+        with tracing.span(f"{type(self).__name__}.save", "store"):
+            return self._write_snapshot()
+
+    def _write_snapshot(self):
+        """在写线程中调用，返回写入的字节数"""
+        data = self._serialize_snapshot()
+        with file_lock(self.file_path):
+            # 上次读写之后其他实例改过文件时，先在锁内合并对方的修改再重新取快照，否则会把它们覆盖掉
+            loaded = self._read_external() if self.WATCHES_FILE else None
+            if loaded is not None:
+                changes = self._apply_external(*loaded)
+                with self._lock:
+                    pending = self._merged_external or ([], [], [])
+                    for merged, new in zip(pending, changes):
+                        merged.extend(new)
+                    self._merged_external = pending
+                data = self._serialize_snapshot()
+            atomic_write(self.file_path, data)
+            with self._lock:
+                # 自己写出的版本不算外部修改
+                self._disk_signature = self._file_signature()
+                self._disk_hashes = self._written_hashes
+        return len(data)
+
+    def _serialize_snapshot(self):
+        with self._lock:
             data = [memo.to_dict() for memo in self.memos]
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+        if self.WATCHES_FILE:
+            # 与快照同时取得，写入完成后成为磁盘上各记录的哈希
+            self._written_hashes = {item["id"]: record_hash(item) for item in data}
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+    # --- External changes ---
+    def has_external_change(self):
+        """数据文件的 mtime 或大小与上次读写时不同，或写线程合并了外部修改还没有通知界面"""
+        if not self.WATCHES_FILE:
+            return False
+        return self._merged_external is not None or self._file_signature() not in (None, self._disk_signature)
+
+    @tracing.traced(cat="store")
+    def reload_external(self):
+        """读入其他程序对数据文件的修改，只把变化的记录应用到内存。
+
+        与上次读写时各记录的哈希比较：磁盘上没变的记录保持内存中的状态（包括尚未写出的本地修改），
+        磁盘上新增、修改、删除的记录以磁盘为准。返回 (added, updated, removed_ids)，
+        其中包括写线程写入前已经合并的部分；没有外部修改或文件暂时无法解析时返回 None。
+        """
+        if not self.WATCHES_FILE:
+            return None
+        with file_lock(self.file_path):
+            loaded = self._read_external()
+        changes = self._apply_external(*loaded) if loaded is not None else None
+        if changes is not None and self._writer is not None and self._writer.pending() and any(changes):
+            # 正在写出的快照取自合并之前，写完后再写一次，免得覆盖掉刚读入的外部修改
+            self._writer.mark_dirty()
+        with self._lock:
+            merged, self._merged_external = self._merged_external, None
+            if merged is None:
+                return changes
+            if changes is not None:
+                for pending, new in zip(merged, changes):
+                    pending.extend(new)
+            # 两批修改可能涉及同一条备忘，按当前内存中的状态整理
+            added, updated, removed = merged
+            added = list({m.id: m for m in added if self.memos.get(m.id) is m}.values())
+            added_ids = {m.id for m in added}
+            updated = list({m.id: m for m in updated
+                            if self.memos.get(m.id) is m and m.id not in added_ids}.values())
+            removed = list(dict.fromkeys(removed))
+            return added, updated, removed
+
+    def _read_external(self):
+        """文件自上次读写后变了时返回 (signature, items)，否则或无法解析时返回 None；调用时已持有 file_lock"""
+        signature = self._file_signature()
+        if signature is None or signature == self._disk_signature:
+            return None
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                items = json.load(f)
         except:
-            pass
+            # 可能是不加锁的程序写到一半，等下一次变化再读
+            return None
+        if not isinstance(items, list):
+            return None
+        return signature, items
+
+    def _apply_external(self, signature, items):
+        """把磁盘上变化的记录应用到内存，返回 (added, updated, removed_ids)"""
+        with self._lock:
+            old_hashes = self._disk_hashes
+            new_hashes = {}
+            changed = []
+            for item in items:
+                memo_id = item.get("id", 0)
+                digest = new_hashes[memo_id] = record_hash(item)
+                if old_hashes.get(memo_id) != digest:
+                    changed.append(item)
+            removed_ids = [memo_id for memo_id in old_hashes if memo_id not in new_hashes]
+
+            added, updated = [], []
+            for item in changed:
+                memo = self.memos.get(item.get("id", 0))
+                if memo is None:
+                    added.append(Memo.from_dict(item))
+                    continue
+                if self._tag_index is not None:
+                    self._tag_index.remove(memo)
+                memo.title = item.get("title", "")
+                memo.content = item.get("content", "")
+                memo.tags = item.get("tags", [])
+                if self._search_index is not None:
+                    self._search_index.update(memo)
+                self._index_changed(memo.id)
+                if self._tag_index is not None:
+                    self._tag_index.add(memo)
+                updated.append(memo)
+            if len(added) > 1:
+                self.memos.extend(added)
+            elif added:
+                self.memos.add(added[0])
+            for memo in added:
+                if self._search_index is not None:
+                    self._search_index.add(memo)
+                self._index_changed(memo.id)
+                if self._tag_index is not None:
+                    self._tag_index.add(memo)
+            removed = []
+            for memo_id in removed_ids:
+                memo = self.memos.remove(memo_id)
+                if memo is None:
+                    continue
+                if self._search_index is not None:
+                    self._search_index.remove(memo_id)
+                self._index_changed(memo_id)
+                if self._tag_index is not None:
+                    self._tag_index.remove(memo)
+                removed.append(memo_id)
+
+            self._disk_signature = signature
+            self._disk_hashes = new_hashes
+        return added, updated, removed
+
+
+def create_data_store(settings_model):
+    """根据 settings.json 中的 storage_backend 创建数据存储"""
+    backend = settings_model.get("storage_backend", "json")
+    if backend == "journal":
+        from src.model.journal_store import JournalDataStore
+        return JournalDataStore(
+            max_records=settings_model.get("journal_max_records", 500),
+            max_bytes=settings_model.get("journal_max_bytes", 1024 * 1024)
+        )
+    if backend == "sqlite":
+        from src.model.sqlite_store import SqliteDataStore
+        return SqliteDataStore()
+    if backend == "record":
+        from src.model.record_store import RecordDataStore
+        return RecordDataStore(save_window_ms=settings_model.get("save_window_ms", 500))
+    if backend == "sharded":
+        from src.model.sharded_store import ShardedDataStore
+        return ShardedDataStore(save_window_ms=settings_model.get("save_window_ms", 500))
+    return DataStore(save_window_ms=settings_model.get("save_window_ms", 500))
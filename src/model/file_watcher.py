@@ -0,0 +1,37 @@
+# src/model/file_watcher.py
+# -*- coding: utf-8 -*-
+import os
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+class FileChangeWatcher(QObject):
+    """监视一个文件被其他程序修改。
+
+    原子替换（写临时文件再改名）后原路径会从 QFileSystemWatcher 中消失，所以同时监视所在目录，
+    并在每次变化后重新加入文件。短时间内的多次通知合并为一次 changed，
+    是否真的变了由接收方比较 mtime 和大小决定（自己写文件也会触发通知）。
+    """
+    changed = pyqtSignal()
+
+    DEBOUNCE_MS = 300
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = os.path.abspath(path)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.addPath(os.path.dirname(self.path))
+        self._watch_file()
+        self.watcher.fileChanged.connect(self._on_changed)
+        self.watcher.directoryChanged.connect(self._on_changed)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.changed.emit)
+
+    def _watch_file(self):
+        if self.path not in self.watcher.files() and os.path.exists(self.path):
+            self.watcher.addPath(self.path)
+
+    def _on_changed(self, path):
+        self._watch_file()
+        self.debounce_timer.start()
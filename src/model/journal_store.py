@@ -0,0 +1,159 @@
+# src/model/journal_store.py
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from src.core.utils import MEMOS_PATH
+from src.model.data_store import DataStore
+from src.model.memo_model import Memo
+from src.model.persistence import atomic_write
+
+class JournalDataStore(DataStore):
+    """日志模式存储：每次修改只向日志追加一行，超过阈值后在后台线程合并进 memos.json 快照。
+
+    日志记录都是针对单个 id 的完整状态（add 带完整备忘，update 带完整字段，delete 只带 id），
+    因此按顺序重放是幂等的，快照比日志新时重放也不会出错。
+    """
+
+    WATCHES_FILE = False
+    # 合并失败后的重试间隔（秒），连续失败时翻倍，直到上限
+    COMPACT_RETRY_MIN = 5.0
+    COMPACT_RETRY_MAX = 300.0
+
+    def __init__(self, file_path=MEMOS_PATH, max_records=500, max_bytes=1024 * 1024):
+        self.journal_path = os.path.splitext(file_path)[0] + '.journal'
+        self.rotated_path = self.journal_path + '.compacting'
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._journal_file = None
+        self._compact_thread = None
+        self._compact_failures = 0
+        self._compact_retry_at = 0.0
+        super().__init__(file_path)
+        self._maybe_compact()
+
+    def _load_data(self):
+        items = {}
+        for item in self._read_snapshot():
+            items[item.get("id", 0)] = item
+        # 上次合并中断时残留的旧日志比当前日志更早，需要先重放
+        self._replay(self.rotated_path, items, count=False)
+        self._replay(self.journal_path, items, count=True)
+        memos = [Memo.from_dict(item) for item in items.values()]
+        return sorted(memos, key=lambda x: x.created_ts, reverse=True)
+
+    def _replay(self, path, items, count):
+        if not os.path.exists(path): return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # 崩溃时写了一半的最后一行
+                    self._apply_record(record, items)
+                    if count:
+                        self._journal_records += 1
+            if count:
+                self._journal_bytes = os.path.getsize(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _apply_record(record, items):
+        op = record.get("op")
+        if op == "add":
+            memo = record.get("memo", {})
+            items[memo.get("id", 0)] = memo
+        elif op == "update":
+            item = items.get(record.get("id"))
+            if item is not None:
+                item["title"] = record.get("title", "")
+                item["content"] = record.get("content", "")
+                item["tags"] = record.get("tags", [])
+        elif op == "delete":
+            items.pop(record.get("id"), None)
+
+    # --- Persistence hooks ---
+    def _persist_add(self, memo):
+        self._append({"op": "add", "memo": memo.to_dict()})
+
+    def _persist_update(self, memo):
+        self._append({"op": "update", "id": memo.id, "title": memo.title,
+                      "content": memo.content, "tags": memo.tags})
+
+    def _persist_delete(self, memo_id):
+        self._append({"op": "delete", "id": memo_id})
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        try:
+            if self._journal_file is None:
+                self._journal_file = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal_file.write(line)
+            self._journal_file.flush()
+        except OSError:
+            return
+        self._journal_records += 1
+        self._journal_bytes += len(line.encode('utf-8'))
+        self._maybe_compact()
+
+    # --- Compaction ---
+    def _maybe_compact(self):
+        if self._journal_records < self.max_records and self._journal_bytes < self.max_bytes:
+            return
+        if self._compact_thread and self._compact_thread.is_alive():
+            return
+        # 上次合并失败后先等一段时间，不在每次追加时反复重试
+        if time.monotonic() < self._compact_retry_at:
+            return
+        # 残留的待合并文件（上次合并失败）先合并，不再轮转
+        if not os.path.exists(self.rotated_path) and not self._rotate_journal():
+            return
+        self._compact_thread = threading.Thread(target=self._compact, name="MemoJournalCompact", daemon=True)
+        self._compact_thread.start()
+
+    def _rotate_journal(self):
+        """把当前日志改名为待合并文件，之后的修改写入新日志"""
+        self._close_journal()
+        try:
+            if os.path.exists(self.journal_path):
+                os.replace(self.journal_path, self.rotated_path)
+        except OSError:
+            return False
+        self._journal_records = 0
+        self._journal_bytes = 0
+        return True
+
+    def _compact(self):
+        # 快照在 self._lock 内取得（见 _serialize_snapshot）；
+        # 若已包含新日志里的修改，下次重放时会被幂等地覆盖
+        try:
+            atomic_write(self.file_path, self._serialize_snapshot())
+            if os.path.exists(self.rotated_path):
+                os.remove(self.rotated_path)
+        except:
+            # 待合并文件保留，下次启动或退避结束后再合并
+            self._compact_failures += 1
+            delay = min(self.COMPACT_RETRY_MIN * 2 ** (self._compact_failures - 1), self.COMPACT_RETRY_MAX)
+            self._compact_retry_at = time.monotonic() + delay
+            return
+        self._compact_failures = 0
+        self._compact_retry_at = 0.0
+
+    def _close_journal(self):
+        if self._journal_file is not None:
+            try:
+                self._journal_file.close()
+            except OSError:
+                pass
+            self._journal_file = None
+
+    def close(self):
+        if self._compact_thread:
+            self._compact_thread.join()
+        self._close_journal()
+        super().close()
@@ -0,0 +1,185 @@
+# src/model/memo_collection.py
+# -*- coding: utf-8 -*-
+import heapq
+from itertools import islice
+
+def sort_key(memo):
+    """排列依据：created_ts 相同时再比较 id，顺序是确定的全序，可用作分页游标"""
+    return (memo.created_ts, memo.id)
+
+
+class MemoCollection:
+    """按 created_at 从新到旧排列的备忘录集合，按 id 查找为 O(1)，按位置查找/定位为 O(log n)。
+
+    内部按从旧到新顺序存放在数组里（新备忘直接追加到末尾），删除只留墓碑，
+    用树状数组统计存活条目，从而在不整体移动的情况下换算出从新到旧的位置。
+    """
+
+    # 墓碑超过该数量且多于存活条目时整理一次数组
+    COMPACT_THRESHOLD = 1024
+
+    def __init__(self, memos=()):
+        self._rebuild(sorted(memos, key=sort_key, reverse=True)[::-1])
+
+    def _rebuild(self, ascending):
+        self._slots = list(ascending)
+        self._by_id = {m.id: m for m in self._slots}
+        self._slot_of = {m.id: i for i, m in enumerate(self._slots)}
+        self._tombstones = 0
+        # 重建后没有墓碑，每个节点覆盖的 lowbit(i) 个条目都存活
+        self._tree = [0] + [i & -i for i in range(1, len(self._slots) + 1)]
+
+    # --- 树状数组 ---
+    def _prefix(self, i):
+        """slots[0:i] 中存活的条目数"""
+        total = 0
+        tree = self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _add(self, slot, delta):
+        i = slot + 1
+        n = len(self._slots)
+        tree = self._tree
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def _find(self, rank):
+        """第 rank 个（从 0 开始）存活条目所在的下标"""
+        pos = 0
+        remaining = rank + 1
+        n = len(self._slots)
+        bit = 1 << n.bit_length()
+        tree = self._tree
+        while bit:
+            nxt = pos + bit
+            if nxt <= n and tree[nxt] < remaining:
+                pos = nxt
+                remaining -= tree[nxt]
+            bit >>= 1
+        return pos
+
+    # --- 查询 ---
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, memo_id):
+        return memo_id in self._by_id
+
+    def __iter__(self):
+        for memo in reversed(self._slots):
+            if memo is not None:
+                yield memo
+
+    def _bisect(self, key):
+        """第一个排序键不小于 key 的下标，比它小的存活条目都在前面；二分时跳过墓碑"""
+        slots = self._slots
+        lo, hi = 0, len(slots)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            j = mid
+            while j >= lo and slots[j] is None:
+                j -= 1
+            if j < lo or sort_key(slots[j]) < key:
+                lo = mid + 1
+            else:
+                hi = j
+        return lo
+
+    def _iter_from(self, slot):
+        slots = self._slots
+        for i in range(slot, -1, -1):
+            memo = slots[i]
+            if memo is not None:
+                yield memo
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            count = len(self._by_id)
+            start, stop, step = index.indices(count)
+            if step > 0:
+                if start >= stop:
+                    return []
+                # 从起点所在的下标向旧的方向走，分页读取时不必每次从头数起
+                slot = self._find(count - 1 - start)
+                return list(islice(self._iter_from(slot), 0, stop - start, step))
+            return list(self)[index]
+        count = len(self._by_id)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("memo index out of range")
+        return self._slots[self._find(count - 1 - index)]
+
+    def page_after(self, key, count):
+        """从新到旧顺序中排在 key 之后的至多 count 条，key 为 None 时从最新一条开始。
+
+        key 取上一页最后一条的 sort_key()，它在两次调用之间被删除也能定位，
+        期间的增删不会让后面的页跳过或重复条目（只是看不到比游标更新的新增）。
+        """
+        slot = len(self._slots) - 1 if key is None else self._bisect(key) - 1
+        return list(islice(self._iter_from(slot), count))
+
+    def get(self, memo_id):
+        return self._by_id.get(memo_id)
+
+    def index_of(self, memo_id):
+        """备忘在从新到旧顺序中的位置，不存在时返回 -1"""
+        slot = self._slot_of.get(memo_id)
+        if slot is None:
+            return -1
+        return len(self._by_id) - self._prefix(slot + 1)
+
+    def select(self, memo_ids):
+        """按从新到旧顺序返回给定 id 对应的备忘"""
+        count = len(self._by_id)
+        if len(memo_ids) * max(1, count.bit_length()) > count:
+            # 命中较多时顺序扫描一遍比逐个定位更快
+            return [m for m in self if m.id in memo_ids]
+        memos = [self._by_id[i] for i in memo_ids if i in self._by_id]
+        memos.sort(key=lambda m: self._slot_of[m.id], reverse=True)
+        return memos
+
+    # --- 修改 ---
+    def add(self, memo):
+        if memo.id in self._by_id:
+            self.remove(memo.id)
+        if not self._by_id or sort_key(memo) >= sort_key(self[0]):
+            self._append(memo)
+        else:
+            # 比最新一条还旧（导入、同步等），重建一次
+            self._rebuild(sorted([*self, memo], key=sort_key, reverse=True)[::-1])
+
+    def extend(self, memos):
+        """批量加入，无论新旧都只重建一次。
+
+        只对新加入的一批排序，再与已有的有序数组线性归并，整体为 O(n + m log m)；
+        分片存储逐个读入已按时间排好的分片时，每次只是 O(n) 的归并。
+        """
+        incoming = sorted(memos, key=sort_key, reverse=True)[::-1]
+        replaced = {m.id for m in incoming if m.id in self._by_id}
+        current = [m for m in self._slots if m is not None and m.id not in replaced]
+        self._rebuild(list(heapq.merge(current, incoming, key=sort_key)))
+
+    def _append(self, memo):
+        self._slots.append(memo)
+        i = len(self._slots)
+        # 新节点覆盖 (i - lowbit(i), i] 区间
+        self._tree.append(1 + self._prefix(i - 1) - self._prefix(i - (i & -i)))
+        self._by_id[memo.id] = memo
+        self._slot_of[memo.id] = i - 1
+
+    def remove(self, memo_id):
+        memo = self._by_id.pop(memo_id, None)
+        if memo is None:
+            return None
+        slot = self._slot_of.pop(memo_id)
+        self._slots[slot] = None
+        self._add(slot, -1)
+        self._tombstones += 1
+        if self._tombstones > self.COMPACT_THRESHOLD and self._tombstones > len(self._by_id):
+            self._rebuild([m for m in self._slots if m is not None])
+        return memo
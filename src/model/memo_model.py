@@ -1,24 +1,88 @@
 # src/model/memo_model.py
 # -*- coding: utf-8 -*-
-from dataclasses import dataclass, field
+import sys
 from datetime import datetime
-from typing import List
 
-@dataclass
+# 列表预览只需要正文开头的一小段
+PREVIEW_CHARS = 120
+
+# 相同的标签组合在所有备忘之间共用同一个元组；组合数有上限，
+# 超出后的新组合不再登记（仍由驻留字符串组成），表不会随编辑历史无限增长
+MAX_TAG_TUPLES = 4096
+_TAG_TUPLES = {}
+
+
+def intern_tags(tags):
+    """把标签转换为共享的、由驻留字符串组成的元组"""
+    key = tuple(sys.intern(str(tag)) for tag in tags or ())
+    shared = _TAG_TUPLES.get(key)
+    if shared is not None:
+        return shared
+    if len(_TAG_TUPLES) < MAX_TAG_TUPLES:
+        _TAG_TUPLES[key] = key
+    return key
+
+
+def parse_timestamp(created_at):
+    try:
+        return datetime.fromisoformat(created_at).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
 class Memo:
-    id: int
-    title: str
-    content: str
-    tags: List[str] = field(default_factory=list)
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    time_str: str = field(default_factory=lambda: datetime.now().strftime("%H:%M"))
+    """备忘录数据。
+
+    使用 __slots__ 省去每个实例的 __dict__；tags 为共享的元组；
+    created_ts 是与 created_at 对应的数值时间戳，用于排序和计算新旧程度。
+    """
+    __slots__ = ('id', 'title', 'content', '_tags', 'created_at', 'created_ts', 'time_str')
+
+    def __init__(self, id, title, content, tags=(), created_at=None, time_str=None):
+        self.id = id
+        self.title = title
+        self.content = content
+        self.tags = tags
+        if created_at is None or time_str is None:
+            now = datetime.now()
+            created_at = now.isoformat() if created_at is None else created_at
+            time_str = now.strftime("%H:%M") if time_str is None else time_str
+        self.created_at = created_at
+        self.created_ts = parse_timestamp(created_at)
+        self.time_str = time_str
+
+    @property
+    def tags(self):
+        return self._tags
+
+    @tags.setter
+    def tags(self, value):
+        self._tags = intern_tags(value)
+
+    @property
+    def preview(self):
+        return self.content[:PREVIEW_CHARS]
+
+    def _fields(self):
+        return (self.id, self.title, self.content, self.tags, self.created_at, self.time_str)
+
+    def __eq__(self, other):
+        if not isinstance(other, Memo):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (f"Memo(id={self.id!r}, title={self.title!r}, content={self.content!r}, tags={self.tags!r}, "
+                f"created_at={self.created_at!r}, time_str={self.time_str!r})")
 
     def to_dict(self):
         return {
             "id": self.id,
             "title": self.title,
             "content": self.content,
-            "tags": self.tags,
+            "tags": list(self.tags),
             "created_at": self.created_at,
             "time_str": self.time_str
         }
@@ -33,3 +97,44 @@ class Memo:
             created_at=data.get("created_at", ""),
             time_str=data.get("time_str", "")
         )
+
+
+class LazyMemo(Memo):
+    """正文按需加载的 Memo：列表只用标题和预览，悬浮窗或编辑器访问 content 时才读取正文。
+
+    读出的正文不挂在实例上，建立搜索索引等遍历全部备忘的操作之后内存中也不会留下所有正文；
+    反复访问的正文由 load_content 背后的存储按字节上限缓存（见 RecordDataStore）。
+    只有修改时赋值的正文暂存到写入正文文件为止（见 release_content）。
+    """
+    __slots__ = ('_load_content', '_preview', '_content')
+
+    def __init__(self, load_content, preview, **fields):
+        self._load_content = load_content
+        self._preview = preview
+        super().__init__(content=None, **fields)
+
+    @property
+    def content(self):
+        if self._content is None:
+            return self._load_content()
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+
+    def release_content(self):
+        """正文已写入文件后丢弃内存中的副本，之后按需重新读取"""
+        if self._content is not None:
+            self._preview = self._content[:PREVIEW_CHARS]
+            self._content = None
+
+    @property
+    def is_loaded(self):
+        return self._content is not None
+
+    @property
+    def preview(self):
+        if self._content is None:
+            return self._preview
+        return self._content[:PREVIEW_CHARS]
@@ -0,0 +1,171 @@
+# src/model/persistence.py
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+from contextlib import contextmanager
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+def atomic_write(path, data):
+    """先写临时文件再 os.replace，避免写到一半崩溃时留下损坏的文件"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def file_lock(path):
+    """对 path + '.lock' 加建议锁（Windows 用 msvcrt，其他平台用 fcntl），
+    多个实例或遵守约定的同步工具读写同一数据文件时互斥；加锁失败时不阻止读写"""
+    try:
+        f = open(path + '.lock', 'a+b')
+    except OSError:
+        yield
+        return
+    locked = False
+    try:
+        try:
+            if msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                locked = True
+            elif fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                locked = True
+        except OSError:
+            pass
+        yield
+    finally:
+        if locked:
+            try:
+                if msvcrt is not None:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            except OSError:
+                pass
+        f.close()
+
+
+class WriteBehindWriter:
+    """后台写线程：mark_dirty 只做标记，窗口期内的多次修改合并为一次写入。
+
+    write 在写线程中调用，负责取得一致的快照并原子写入，返回写入的字节数。
+    写入抛出异常时修改仍视为待写，退避后重试，失败次数单独统计。
+    """
+
+    # 连续失败时重试间隔从合并窗口开始翻倍，最长这么多秒
+    RETRY_MAX_SECONDS = 30.0
+
+    def __init__(self, write, window_ms=500):
+        self.write = write
+        self.window = window_ms / 1000.0
+        self.writes_issued = 0
+        self.writes_coalesced = 0
+        self.bytes_written = 0
+        self.write_ms_total = 0.0
+        self.writes_failed = 0
+        self._consecutive_failures = 0
+        self._cond = threading.Condition()
+        self._dirty = False
+        self._writing = False
+        self._flush_requested = False
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="MemoWriteBehind", daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self):
+        with self._cond:
+            if self._dirty:
+                self.writes_coalesced += 1
+                return
+            self._dirty = True
+            self._cond.notify_all()
+
+    def flush(self):
+        """阻塞直到所有待写修改落盘；期间有一次写入失败时也返回（修改仍保留待重试）"""
+        with self._cond:
+            failed = self.writes_failed
+            self._flush_requested = True
+            self._cond.notify_all()
+            while ((self._dirty or self._writing) and self._thread.is_alive()
+                   and self.writes_failed == failed):
+                self._cond.wait()
+            self._flush_requested = False
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def pending(self):
+        """是否有尚未写完的修改（已标记或正在写）"""
+        with self._cond:
+            return self._dirty or self._writing
+
+    def stats(self):
+        with self._cond:
+            return {
+                "writes_issued": self.writes_issued,
+                "writes_coalesced": self.writes_coalesced,
+                "bytes_written": self.bytes_written,
+                "write_ms_total": round(self.write_ms_total, 2),
+                "writes_failed": self.writes_failed
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closing:
+                    self._cond.wait()
+                # 关闭时最后一次写入仍失败就放弃，不让退出卡住
+                if self._closing and (not self._dirty or self._consecutive_failures):
+                    return
+                # 合并窗口：期间的 mark_dirty 都并入这一次写入；失败后按退避间隔等待
+                delay = self.window
+                if self._consecutive_failures:
+                    delay = min(max(self.window, 0.1) * 2 ** min(self._consecutive_failures, 16), self.RETRY_MAX_SECONDS)
+                deadline = time.monotonic() + delay
+                while not self._flush_requested and not self._closing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0: break
+                    self._cond.wait(remaining)
+                self._dirty = False
+                self._writing = True
+
+            start = time.perf_counter()
+            size = 0
+            failed = False
+            try:
+                size = self.write()
+            except:
+                failed = True
+            elapsed = (time.perf_counter() - start) * 1000
+
+            with self._cond:
+                self._writing = False
+                self.write_ms_total += elapsed
+                if failed:
+                    # 没有落盘的修改留待重试；等待中的 flush 已因失败返回，重试不再跳过退避
+                    self._dirty = True
+                    self._flush_requested = False
+                    self.writes_failed += 1
+                    self._consecutive_failures += 1
+                else:
+                    self._consecutive_failures = 0
+                    self.writes_issued += 1
+                    self.bytes_written += size
+                self._cond.notify_all()
@@ -0,0 +1,109 @@
+# src/model/ranking.py
+# -*- coding: utf-8 -*-
+import heapq
+import math
+import time
+
+# 各项得分权重
+TITLE_HIT = 3.0
+CONTENT_HIT = 1.0
+PREFIX_BONUS = 0.5
+ALL_TERMS_BONUS = 2.0
+PROXIMITY_WEIGHT = 1.0
+RECENCY_WEIGHT = 1.0
+RECENCY_HALF_LIFE_DAYS = 30
+FUZZY_WEIGHT = 0.6
+# 少于该长度的词不做容错匹配，避免短词误命中
+FUZZY_MIN_TERM = 4
+# 容错匹配最多校验的候选数（按 gram 重合度取前若干条）
+FUZZY_MAX_CANDIDATES = 200
+
+
+def _within_one_edit(a, b):
+    """a 与 b 的编辑距离（含相邻字符交换）是否不超过 1"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:] or (a[i:i + 2] == b[i:i + 2][::-1] and a[i + 2:] == b[i + 2:])
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    return a[i + 1:] == b[i:]
+
+
+def _fuzzy_find(term, text):
+    """返回 text 中与 term 相差一次编辑的子串位置，找不到返回 -1"""
+    m = len(term)
+    heads = term[:2]
+    for i in range(len(text) - m + 2):
+        # 一次编辑后子串的前两个字符里必然有 term 的前两个字符之一
+        if text[i] not in heads and text[i + 1:i + 2] not in heads:
+            continue
+        for length in (m, m - 1, m + 1):
+            if _within_one_edit(term, text[i:i + length]):
+                return i
+    return -1
+
+
+def rank_memos(query, index, memos, limit=50, accept=None):
+    """按相关度返回前 limit 条备忘。
+
+    query 以空白分词；每个词按标题/正文命中、是否位于开头计分，多个词位置越接近得分越高，
+    较新的备忘略微加分。没有精确命中的长词按 n-gram 重合度做拼写容错。
+    文本取自 index 中预先归一化的内容，只对候选计分，并用堆选出前 limit 条。
+    accept(memo_id) 为 False 的候选不参与排名（用于叠加标签筛选）。
+    """
+    terms = query.lower().split()
+    if not terms:
+        return []
+
+    exact = [index.query(term) for term in terms]
+    fuzzy = []
+    for term, hits in zip(terms, exact):
+        # 精确结果已足够时不再做代价较高的容错查找
+        near = {}
+        if len(term) >= FUZZY_MIN_TERM and len(hits) < limit:
+            # 多取精确命中的条数，去掉它们后仍有 FUZZY_MAX_CANDIDATES 条可校验
+            similar = index.similar(term, limit=FUZZY_MAX_CANDIDATES + len(hits))
+            for memo_id in hits:
+                similar.pop(memo_id, None)
+            for memo_id in heapq.nlargest(FUZZY_MAX_CANDIDATES, similar, key=similar.get):
+                pos = _fuzzy_find(term, index.text_of(memo_id))
+                if pos >= 0:
+                    near[memo_id] = pos
+        fuzzy.append(near)
+
+    candidates = set().union(*exact, *fuzzy)
+    now = time.time()
+    half_life = RECENCY_HALF_LIFE_DAYS * 86400
+
+    def score(memo_id):
+        memo = memos.get(memo_id)
+        text = index.text_of(memo_id)
+        title_len = len(memo.title)
+        total = 0.0
+        positions = []
+        matched = 0
+        for term, hits, near in zip(terms, exact, fuzzy):
+            if memo_id in hits:
+                pos = text.find(term)
+                total += TITLE_HIT if pos < title_len else CONTENT_HIT
+                if pos == 0:
+                    total += PREFIX_BONUS
+                positions.append(pos)
+                matched += 1
+            elif memo_id in near:
+                total += FUZZY_WEIGHT * (TITLE_HIT if near[memo_id] < title_len else CONTENT_HIT)
+        if matched == len(terms) > 1:
+            total += ALL_TERMS_BONUS
+        if len(positions) > 1:
+            span = max(positions) - min(positions)
+            total += PROXIMITY_WEIGHT / (1 + span / 20)
+        age = max(0.0, now - memo.created_ts)
+        total += RECENCY_WEIGHT * math.pow(0.5, age / half_life)
+        return total
+
+    ids = [memo_id for memo_id in candidates if memo_id in memos and (accept is None or accept(memo_id))]
+    return [memos.get(memo_id) for memo_id in heapq.nlargest(limit, ids, key=score)]
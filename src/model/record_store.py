@@ -0,0 +1,202 @@
+# src/model/record_store.py
+# -*- coding: utf-8 -*-
+import json
+import mmap
+import os
+from collections import OrderedDict
+from functools import partial
+from src.core.utils import MEMOS_PATH
+from src.model.data_store import DataStore
+from src.model.memo_model import LazyMemo, Memo
+from src.model.persistence import atomic_write
+
+class RecordDataStore(DataStore):
+    """记录式存储：memos.idx 是小的头部索引，memos.dat 顺序存放正文。
+
+    索引每条为 [id, created_at, time_str, title, tags, preview, offset, length]，
+    启动时只解析索引，正文在真正需要时通过 mmap 按偏移读取。
+    正文只追加写入，修改和删除留下的旧正文在关闭时超过阈值才整理。
+    """
+
+    WATCHES_FILE = False
+
+    MAGIC = "memoflow-records"
+    VERSION = 1
+    # 垃圾字节超过该值且占一半以上时，关闭前整理正文文件
+    COMPACT_MIN_GARBAGE = 1024 * 1024
+    # 最近读出的正文按 UTF-8 字节数缓存的上限：悬浮窗翻看、编辑器反复打开时不必每次解码，
+    # 遍历全部备忘（建立索引、整理文件）时最早的被淘汰，内存中不会留下所有正文
+    CONTENT_CACHE_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, json_path=MEMOS_PATH, save_window_ms=500):
+        base = os.path.splitext(json_path)[0]
+        self.json_path = json_path
+        self.data_path = base + '.dat'
+        self._locations = {}
+        self._data_file = None
+        self._mmap = None
+        self._garbage = 0
+        # memo_id -> (正文, 字节数)，在 self._lock 内访问
+        self._content_cache = OrderedDict()
+        self._content_cache_bytes = 0
+        super().__init__(base + '.idx', save_window_ms)
+
+    # --- Load ---
+    def _load_data(self):
+        if not os.path.exists(self.file_path):
+            self._migrate_from_json()
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                header = json.load(f)
+        except:
+            return []
+        if header.get("magic") != self.MAGIC:
+            return []
+
+        memos = []
+        live_bytes = 0
+        for memo_id, created_at, time_str, title, tags, preview, offset, length in header.get("records", []):
+            self._locations[memo_id] = (offset, length)
+            live_bytes += length
+            memos.append(LazyMemo(partial(self._read_content, memo_id), preview, id=memo_id, title=title,
+                                  tags=tags, created_at=created_at, time_str=time_str))
+        if os.path.exists(self.data_path):
+            self._garbage = max(0, os.path.getsize(self.data_path) - live_bytes)
+        return sorted(memos, key=lambda x: x.created_ts, reverse=True)
+
+    def _migrate_from_json(self):
+        """首次使用时从 memos.json 生成索引和正文文件，原文件保留"""
+        if not os.path.exists(self.json_path):
+            return
+        try:
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                memos = [Memo.from_dict(item) for item in json.load(f)]
+        except:
+            return
+        self._write_compacted(memos)
+
+    def _read_content(self, memo_id):
+        location = self._locations.get(memo_id)
+        if location is None:
+            return ""
+        offset, length = location
+        if length == 0:
+            return ""
+        # 后台搜索线程也会读取，重新映射和关闭映射都在锁内进行
+        with self._lock:
+            cached = self._content_cache.get(memo_id)
+            if cached is not None:
+                self._content_cache.move_to_end(memo_id)
+                return cached[0]
+            if self._mmap is None or offset + length > len(self._mmap):
+                self._remap()
+            if self._mmap is None:
+                return ""
+            content = self._mmap[offset:offset + length].decode('utf-8')
+            self._cache_content(memo_id, content, length)
+            return content
+
+    def _cache_content(self, memo_id, content, length):
+        """调用时已持有锁"""
+        if length > self.CONTENT_CACHE_BYTES:
+            return
+        self._content_cache[memo_id] = (content, length)
+        self._content_cache_bytes += length
+        while self._content_cache_bytes > self.CONTENT_CACHE_BYTES:
+            _, (_, size) = self._content_cache.popitem(last=False)
+            self._content_cache_bytes -= size
+
+    def _forget_content(self, memo_id):
+        """正文改写或删除后丢掉缓存的旧版本，调用时已持有锁"""
+        cached = self._content_cache.pop(memo_id, None)
+        if cached is not None:
+            self._content_cache_bytes -= cached[1]
+
+    def _remap(self):
+        """调用时已持有锁"""
+        self._close_mmap()
+        if not os.path.exists(self.data_path) or os.path.getsize(self.data_path) == 0:
+            return
+        with open(self.data_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # --- Persistence hooks ---
+    def _persist_add(self, memo):
+        self._append_content(memo)
+        self._save_data()
+
+    def _persist_update(self, memo):
+        self._garbage += self._locations.get(memo.id, (0, 0))[1]
+        self._append_content(memo)
+        self._save_data()
+
+    def _persist_delete(self, memo_id):
+        self._forget_content(memo_id)
+        self._garbage += self._locations.pop(memo_id, (0, 0))[1]
+        self._save_data()
+
+    def _append_content(self, memo):
+        data = memo.content.encode('utf-8')
+        if self._data_file is None:
+            self._data_file = open(self.data_path, 'ab')
+        offset = self._data_file.seek(0, os.SEEK_END)
+        self._data_file.write(data)
+        self._data_file.flush()
+        self._locations[memo.id] = (offset, len(data))
+        self._forget_content(memo.id)
+        if isinstance(memo, LazyMemo):
+            memo.release_content()
+
+    def _serialize_snapshot(self):
+        with self._lock:
+            records = [self._index_entry(memo) for memo in self.memos]
+        return self._encode_header(records)
+
+    def _index_entry(self, memo):
+        offset, length = self._locations.get(memo.id, (0, 0))
+        return [memo.id, memo.created_at, memo.time_str, memo.title, memo.tags, memo.preview, offset, length]
+
+    def _encode_header(self, records):
+        header = {"magic": self.MAGIC, "version": self.VERSION, "records": records}
+        return json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    # --- Compaction ---
+    def _write_compacted(self, memos, contents=None):
+        """重写正文文件只保留存活内容，并同步写出索引；contents 为预先读出的正文"""
+        blob = bytearray()
+        locations = {}
+        for i, memo in enumerate(memos):
+            data = (memo.content if contents is None else contents[i]).encode('utf-8')
+            locations[memo.id] = (len(blob), len(data))
+            blob += data
+        atomic_write(self.data_path, bytes(blob))
+        self._locations = locations
+        self._garbage = 0
+        atomic_write(self.file_path, self._encode_header([self._index_entry(m) for m in memos]))
+
+    def _needs_compaction(self):
+        live_bytes = sum(length for _, length in self._locations.values())
+        return self._garbage > self.COMPACT_MIN_GARBAGE and self._garbage > live_bytes
+
+    def close(self):
+        super().close()
+        if self._data_file is not None:
+            self._data_file.close()
+            self._data_file = None
+        with self._lock:
+            if self._needs_compaction():
+                memos = list(self.memos)
+                # 先读出全部正文，之后即可关闭映射再替换文件
+                contents = [memo.content for memo in memos]
+                self._close_mmap()
+                try:
+                    self._write_compacted(memos, contents)
+                except:
+                    pass
+            self._close_mmap()
+
+    def _close_mmap(self):
+        """调用时已持有锁"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
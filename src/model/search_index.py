@@ -0,0 +1,133 @@
+# src/model/search_index.py
+# -*- coding: utf-8 -*-
+import heapq
+import math
+from array import array
+
+def normalize(memo):
+    """与原搜索规则一致：标题与正文直接拼接后转小写"""
+    return (memo.title + memo.content).lower()
+
+
+class NgramIndex:
+    """字符 n-gram 倒排索引，用于大小写不敏感的子串搜索。
+
+    中文没有词边界，按字符切 2/3-gram 即可覆盖任意子串：查询时对查询串所有 gram 的倒排表求交集，
+    再对候选逐条做子串校验，因此结果与逐条扫描完全一致。
+    倒排表用 int64 数组存放以节省内存；删除和修改只从 _texts 中移除旧文本，
+    残留的过期条目在校验时被过滤，积累过多时整体重建。
+    """
+
+    # 过期文档数超过该值且超过存活文档一半时重建倒排表
+    REBUILD_THRESHOLD = 1024
+
+    def __init__(self, sizes=(2, 3)):
+        self.sizes = tuple(sorted(sizes))
+        self._texts = {}
+        self._postings = {}
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._texts)
+
+    def _grams(self, text):
+        grams = set()
+        for n in self.sizes:
+            grams.update([text[i:i + n] for i in range(len(text) - n + 1)])
+        return grams
+
+    def _index_text(self, memo_id, text):
+        postings = self._postings
+        for gram in self._grams(text):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = array('q', (memo_id,))
+            else:
+                ids.append(memo_id)
+
+    def add(self, memo):
+        if memo.id in self._texts:
+            self.remove(memo.id)
+        text = normalize(memo)
+        self._texts[memo.id] = text
+        self._index_text(memo.id, text)
+
+    def update(self, memo):
+        self.add(memo)
+
+    def remove(self, memo_id):
+        if self._texts.pop(memo_id, None) is None:
+            return
+        self._stale += 1
+        if self._stale > self.REBUILD_THRESHOLD and self._stale > len(self._texts) // 2:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._postings = {}
+        self._stale = 0
+        for memo_id, text in self._texts.items():
+            self._index_text(memo_id, text)
+
+    def text_of(self, memo_id):
+        return self._texts.get(memo_id)
+
+    def similar(self, term, min_ratio=0.4, limit=None, max_scan=5000):
+        """按 gram 重合比例查找可能的近似匹配（拼写容错的候选），返回重合比例最高的
+        至多 limit 条 {id: 重合比例}。
+
+        重合比例达到 min_ratio 的文档必然出现在最稀有的 total - need + 1 个 gram 的倒排表之一中，
+        只从这些较短的表收集候选，再逐条检查其余 gram。常见词的候选可能多达全部文档，
+        这时只收集 max_scan 条（倒排表中靠前的，即加载时较新的备忘），代价与文档总数无关。
+        """
+        n = self.sizes[0]
+        grams = list({term[i:i + n] for i in range(len(term) - n + 1)})
+        if not grams:
+            return {}
+        total = len(grams)
+        need = max(1, math.ceil(min_ratio * total))
+        grams.sort(key=lambda g: len(self._postings.get(g, ())))
+        texts = self._texts
+        seeds = set()
+        for gram in grams[:total - need + 1]:
+            for memo_id in self._postings.get(gram, ()):
+                if memo_id in texts:
+                    seeds.add(memo_id)
+                    if len(seeds) >= max_scan:
+                        break
+            if len(seeds) >= max_scan:
+                break
+        result = {}
+        for memo_id in seeds:
+            text = texts[memo_id]
+            ratio = sum(1 for gram in grams if gram in text) / total
+            if ratio >= min_ratio:
+                result[memo_id] = ratio
+        if limit is not None and len(result) > limit:
+            result = {memo_id: result[memo_id] for memo_id in heapq.nlargest(limit, result, key=result.get)}
+        return result
+
+    def query(self, text):
+        """返回包含 text（大小写不敏感）的备忘 id 集合"""
+        needle = text.lower()
+        texts = self._texts
+        n = min(len(needle), self.sizes[-1])
+        if n < self.sizes[0]:
+            # 查询太短无法使用倒排表，直接扫描预先归一化的文本
+            return {memo_id for memo_id, t in texts.items() if needle in t}
+
+        lists = []
+        for gram in {needle[i:i + n] for i in range(len(needle) - n + 1)}:
+            ids = self._postings.get(gram)
+            if not ids:
+                return set()
+            lists.append(ids)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return candidates
+        if len(needle) == n and not self._stale:
+            # 查询串本身就是一个 gram，且没有过期条目，无需校验
+            return candidates
+        return {memo_id for memo_id in candidates if needle in texts.get(memo_id, "")}
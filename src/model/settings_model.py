@@ -2,12 +2,26 @@
 # -*- coding: utf-8 -*-
 import json
 import os
+import threading
+from contextlib import contextmanager
+from PyQt6.QtCore import QObject, pyqtSignal
 from src.core.utils import SETTINGS_PATH
+from src.model.persistence import WriteBehindWriter, atomic_write
 
-class SettingsModel:
-    def __init__(self):
+class SettingsModel(QObject):
+    """配置读写。set 只更新内存并通知变化，写盘由后台线程在合并窗口结束后完成"""
+    # key, value
+    setting_changed = pyqtSignal(str, object)
+
+    def __init__(self, save_window_ms=300):
+        super().__init__()
         self.file_path = SETTINGS_PATH
         self.config = self._load()
+        self.save_window_ms = save_window_ms
+        self._lock = threading.Lock()
+        self._writer = None
+        self._batch_depth = 0
+        self._batch_keys = []
 
     def _load(self):
         if not os.path.exists(self.file_path):
@@ -29,12 +43,46 @@ class SettingsModel:
         return self.config.get(key, default)
 
     def set(self, key, value):
-        self.config[key] = value
+        if key in self.config and self.config[key] == value:
+            return
+        with self._lock:
+            self.config[key] = value
+        if self._batch_depth:
+            if key not in self._batch_keys:
+                self._batch_keys.append(key)
+            return
         self._save()
+        self.setting_changed.emit(key, value)
 
-    def _save(self):
+    @contextmanager
+    def batch(self):
+        """with settings.batch(): ... 期间的修改只在结束时保存一次，并对每个变化的 key 通知一次"""
+        self._batch_depth += 1
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
-        except:
-            pass
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_keys:
+                keys, self._batch_keys = self._batch_keys, []
+                self._save()
+                for key in keys:
+                    self.setting_changed.emit(key, self.config.get(key))
+
+    def watch(self, key, slot):
+        """只在指定 key 变化时以新值调用 slot"""
+        self.setting_changed.connect(lambda k, v: slot(v) if k == key else None)
+
+    def flush(self):
+        if self._writer:
+            self._writer.flush()
+
+    def _save(self):
+        if self._writer is None:
+            self._writer = WriteBehindWriter(self._write, self.save_window_ms)
+        self._writer.mark_dirty()
+
+    def _write(self):
+        with self._lock:
+            data = json.dumps(self.config, indent=2, ensure_ascii=False).encode('utf-8')
+        atomic_write(self.file_path, data)
+        return len(data)
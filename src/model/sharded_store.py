@@ -0,0 +1,197 @@
+# src/model/sharded_store.py
+# -*- coding: utf-8 -*-
+import json
+import os
+import sys
+from src.core import tracing
+from src.core.utils import MEMOS_PATH
+from src.model.data_store import DataStore
+from src.model.memo_model import Memo
+from src.model.persistence import atomic_write
+
+MANIFEST_NAME = 'manifest.json'
+UNDATED_SHARD = 'undated'
+
+
+def shard_key(memo):
+    """按 created_at 的年月分片，例如 2026-01"""
+    month = memo.created_at[:7]
+    return month if len(month) == 7 and month[4] == '-' else UNDATED_SHARD
+
+
+def default_shard_dir(json_path=MEMOS_PATH):
+    return os.path.splitext(json_path)[0] + '_shards'
+
+
+def _encode(items):
+    return json.dumps(items, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def migrate_to_shards(json_path=MEMOS_PATH, shard_dir=None):
+    """把单文件 memos.json 拆分为按月分片，原文件保留"""
+    shard_dir = shard_dir or default_shard_dir(json_path)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        memos = [Memo.from_dict(item) for item in json.load(f)]
+    shards = {}
+    for memo in sorted(memos, key=lambda x: x.created_ts, reverse=True):
+        shards.setdefault(shard_key(memo), []).append(memo.to_dict())
+    os.makedirs(shard_dir, exist_ok=True)
+    for key, items in shards.items():
+        atomic_write(os.path.join(shard_dir, key + '.json'), _encode(items))
+    manifest = {"version": 1, "shards": {key: len(items) for key, items in shards.items()}}
+    atomic_write(os.path.join(shard_dir, MANIFEST_NAME), _encode(manifest))
+
+
+def migrate_to_single_file(shard_dir=None, json_path=MEMOS_PATH):
+    """把分片合并回单文件 memos.json"""
+    shard_dir = shard_dir or default_shard_dir(json_path)
+    with open(os.path.join(shard_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    items = []
+    for key in manifest.get("shards", {}):
+        with open(os.path.join(shard_dir, key + '.json'), 'r', encoding='utf-8') as f:
+            items.extend(json.load(f))
+    items.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+    atomic_write(json_path, _encode(items))
+
+
+class ShardedDataStore(DataStore):
+    """按月分片的存储：每个月一个 JSON 文件，外加记录各分片条数的 manifest.json。
+
+    启动时只解析最新的几个分片（够首屏显示即可），其余分片通过 load_more 从新到旧逐个加载；
+    保存时只重写发生变化的分片。
+    """
+
+    WATCHES_FILE = False
+
+    # 启动时至少加载这么多条备忘再返回
+    INITIAL_MEMOS = 100
+
+    def __init__(self, json_path=MEMOS_PATH, shard_dir=None, save_window_ms=500):
+        self.json_path = json_path
+        self.shard_dir = shard_dir or default_shard_dir(json_path)
+        self._shard_ids = {}
+        self._pending = []
+        self._dirty_shards = set()
+        self._manifest_counts = {}
+        super().__init__(os.path.join(self.shard_dir, MANIFEST_NAME), save_window_ms)
+
+    # --- Load ---
+    def _load_data(self):
+        if not os.path.exists(self.file_path) and os.path.exists(self.json_path):
+            try:
+                migrate_to_shards(self.json_path, self.shard_dir)
+            except:
+                pass
+        manifest = self._read_snapshot()
+        shards = manifest.get("shards", {}) if isinstance(manifest, dict) else {}
+        self._manifest_counts = dict(shards)
+        # 从新到旧，"undated" 排在最后
+        self._pending = sorted(shards, key=lambda k: (k != UNDATED_SHARD, k))
+
+        memos = []
+        while self._pending and len(memos) < self.INITIAL_MEMOS:
+            memos.extend(self._read_shard(self._pending.pop()))
+        return memos
+
+    def _read_shard(self, key):
+        path = os.path.join(self.shard_dir, key + '.json')
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                memos = [Memo.from_dict(item) for item in json.load(f)]
+        except:
+            memos = []
+        self._shard_ids[key] = {m.id for m in memos}
+        return memos
+
+    def has_pending_data(self):
+        return bool(self._pending)
+
+    def load_more(self):
+        with self._lock:
+            if self._pending:
+                self._load_shard(self._pending[-1])
+            return bool(self._pending)
+
+    @tracing.traced(cat="store")
+    def _load_shard(self, key):
+        if key in self._pending:
+            self._pending.remove(key)
+        if key in self._shard_ids:
+            return
+        memos = self._read_shard(key)
+        self.memos.extend(memos)
+        for index in (self._search_index, self._tag_index):
+            if index is not None:
+                for memo in memos:
+                    index.add(memo)
+        for memo in memos:
+            self._index_changed(memo.id)
+
+    def _ensure_shard_loaded(self, key):
+        # 写入前分片必须完整加载，否则会覆盖掉还没读入的备忘
+        if key not in self._shard_ids:
+            if key in self._pending:
+                self._load_shard(key)
+            else:
+                self._shard_ids[key] = set()
+
+    # --- Persistence hooks ---
+    def _persist_add(self, memo):
+        key = shard_key(memo)
+        self._ensure_shard_loaded(key)
+        self._shard_ids[key].add(memo.id)
+        self._dirty_shards.add(key)
+        self._save_data()
+
+    def _persist_update(self, memo):
+        self._dirty_shards.add(shard_key(memo))
+        self._save_data()
+
+    def _persist_delete(self, memo_id):
+        for key, ids in self._shard_ids.items():
+            if memo_id in ids:
+                ids.discard(memo_id)
+                self._dirty_shards.add(key)
+                break
+        self._save_data()
+
+    def _write_snapshot(self):
+        with self._lock:
+            dirty, self._dirty_shards = self._dirty_shards, set()
+            shards = {}
+            for key in dirty:
+                memos = [m for m in map(self.memos.get, self._shard_ids.get(key, ())) if m is not None]
+                memos.sort(key=lambda x: x.created_ts, reverse=True)
+                shards[key] = [m.to_dict() for m in memos]
+            counts = {key: len(ids) for key, ids in self._shard_ids.items() if ids}
+            # 尚未加载的分片沿用 manifest 中的条数
+            counts.update((key, self._manifest_counts.get(key, 0)) for key in self._pending)
+
+        written = 0
+        try:
+            os.makedirs(self.shard_dir, exist_ok=True)
+            for key, items in shards.items():
+                path = os.path.join(self.shard_dir, key + '.json')
+                if items:
+                    data = _encode(items)
+                    atomic_write(path, data)
+                    written += len(data)
+                elif os.path.exists(path):
+                    os.remove(path)
+        except:
+            # 写入失败的分片留到下次保存
+            with self._lock:
+                self._dirty_shards |= dirty
+            raise
+        data = _encode({"version": 1, "shards": counts})
+        atomic_write(self.file_path, data)
+        return written + len(data)
+
+
+if __name__ == "__main__":
+    # python -m src.model.sharded_store --to-shards | --to-single
+    if "--to-single" in sys.argv:
+        migrate_to_single_file()
+    else:
+        migrate_to_shards()
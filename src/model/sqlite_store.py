@@ -0,0 +1,119 @@
+# src/model/sqlite_store.py
+# -*- coding: utf-8 -*-
+import json
+import os
+import sqlite3
+from src.core.utils import MEMOS_DB_PATH, MEMOS_PATH
+from src.model.data_store import DataStore
+from src.model.memo_model import Memo
+from src.model.search_index import normalize
+
+class SqliteDataStore(DataStore):
+    """基于 sqlite3 的存储：单条修改只写一行，搜索走 FTS5 trigram 索引"""
+
+    WATCHES_FILE = False
+
+    # trigram 分词器无法匹配少于 3 个字符的查询
+    FTS_MIN_QUERY = 3
+
+    def __init__(self, db_path=MEMOS_DB_PATH, json_path=MEMOS_PATH):
+        # 后台搜索线程也会查询，所有访问都在 self._lock 内串行进行
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_schema()
+        self._migrate_from_json(json_path)
+        super().__init__(db_path)
+
+    def _init_schema(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS memos (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                time_str TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_memos_created_at ON memos(created_at);
+            CREATE VIRTUAL TABLE IF NOT EXISTS memos_fts USING fts5(body, tokenize='trigram');
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+
+    def _migrate_from_json(self, json_path):
+        """首次使用时把 memos.json 一次性导入数据库，原文件保留作为备份"""
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone():
+            return
+        items = []
+        if os.path.exists(json_path):
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    items = json.load(f)
+            except:
+                items = []
+        # memos.json 中重复的 id 以后出现的为准，否则 FTS 表的 rowid 冲突会中断导入
+        memos = {}
+        for item in items:
+            memo = Memo.from_dict(item)
+            memos[memo.id] = memo
+        with self.conn:
+            self._insert_rows(list(memos.values()), replace=False)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', '1')")
+
+    def _load_data(self):
+        rows = self.conn.execute(
+            "SELECT id, title, content, tags, created_at, time_str FROM memos ORDER BY created_at DESC")
+        return [self._row_to_memo(row) for row in rows]
+
+    @staticmethod
+    def _row_to_memo(row):
+        return Memo(id=row[0], title=row[1], content=row[2], tags=json.loads(row[3]),
+                    created_at=row[4], time_str=row[5])
+
+    def _uses_search_index(self, text):
+        # 3 个字符以上的查询由 FTS 回答，不必在内存中再建一份 n-gram 索引
+        return 0 < len(text) < self.FTS_MIN_QUERY
+
+    def _match_ids(self, text):
+        if len(text) < self.FTS_MIN_QUERY:
+            return super()._match_ids(text)
+        phrase = '"' + text.replace('"', '""') + '"'
+        ids = {row[0] for row in self.conn.execute(
+            "SELECT rowid FROM memos_fts WHERE memos_fts MATCH ?", (phrase,))}
+        # FTS 只负责筛出候选，最终仍按与 JSON 存储一致的规则校验
+        needle = text.lower()
+        candidates = (self.memos.get(memo_id) for memo_id in ids)
+        return {m.id for m in candidates if m and needle in normalize(m)}
+
+    # --- Persistence hooks ---
+    def _persist_add(self, memo):
+        with self.conn:
+            self._insert_rows([memo])
+
+    def _persist_update(self, memo):
+        with self.conn:
+            self.conn.execute("UPDATE memos SET title = ?, content = ?, tags = ? WHERE id = ?",
+                              (memo.title, memo.content, json.dumps(memo.tags, ensure_ascii=False), memo.id))
+            self.conn.execute("UPDATE memos_fts SET body = ? WHERE rowid = ?",
+                              (memo.title + memo.content, memo.id))
+
+    def _persist_delete(self, memo_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM memos WHERE id = ?", (memo_id,))
+            self.conn.execute("DELETE FROM memos_fts WHERE rowid = ?", (memo_id,))
+
+    def _save_data(self):
+        with self.conn:
+            self._insert_rows(self.memos)
+
+    def _insert_rows(self, memos, replace=True):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO memos (id, title, content, tags, created_at, time_str) VALUES (?, ?, ?, ?, ?, ?)",
+            [(m.id, m.title, m.content, json.dumps(m.tags, ensure_ascii=False), m.created_at, m.time_str)
+             for m in memos])
+        if replace:
+            self.conn.executemany("DELETE FROM memos_fts WHERE rowid = ?", [(m.id,) for m in memos])
+        self.conn.executemany("INSERT INTO memos_fts (rowid, body) VALUES (?, ?)",
+                              [(m.id, m.title + m.content) for m in memos])
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,62 @@
+# src/model/tag_index.py
+# -*- coding: utf-8 -*-
+
+class TagFilter:
+    """标签筛选条件：include 中的标签按 mode（"and" 全部包含 / "or" 任一包含）组合，
+    exclude 中的标签一律排除；include 为空时表示从全部备忘中排除"""
+    __slots__ = ('include', 'exclude', 'mode')
+
+    def __init__(self, include=(), exclude=(), mode="and"):
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.mode = mode
+
+    def __bool__(self):
+        return bool(self.include or self.exclude)
+
+
+class TagIndex:
+    """标签 -> 备忘 id 集合的倒排表，随增删改增量维护"""
+
+    def __init__(self):
+        self._ids = {}
+
+    def add(self, memo):
+        for tag in memo.tags:
+            self._ids.setdefault(tag, set()).add(memo.id)
+
+    def remove(self, memo):
+        """按 memo 当前的 tags 移除，修改标签前调用"""
+        for tag in memo.tags:
+            ids = self._ids.get(tag)
+            if ids is not None:
+                ids.discard(memo.id)
+                if not ids:
+                    del self._ids[tag]
+
+    def counts(self):
+        return {tag: len(ids) for tag, ids in self._ids.items()}
+
+    def ids(self, tag):
+        return self._ids.get(tag, frozenset())
+
+    def match(self, tag_filter):
+        """返回 (ids, excluded)：ids 为满足 include 的 id 集合（include 为空时为 None，表示全部），
+        excluded 为需要排除的 id 集合"""
+        sets = [self.ids(tag) for tag in tag_filter.include]
+        if not sets:
+            ids = None
+        elif tag_filter.mode == "or":
+            ids = set().union(*sets)
+        else:
+            # 从最小的集合开始求交，结果只会越来越小
+            sets.sort(key=len)
+            ids = set(sets[0])
+            for other in sets[1:]:
+                ids &= other
+                if not ids:
+                    break
+        excluded = set().union(*(self.ids(tag) for tag in tag_filter.exclude))
+        if ids is not None and excluded:
+            ids -= excluded
+        return ids, excluded
@@ -1,48 +1,113 @@
 # src/presenter/main_presenter.py
 # -*- coding: utf-8 -*-
-from PyQt6.QtWidgets import QApplication, QDialog
-from PyQt6.QtCore import QObject
+import time
+from PyQt6.QtWidgets import QApplication, QDialog, QVBoxLayout
+from PyQt6.QtCore import QEvent, QObject, QThreadPool, QTimer
+from src.core import profiling, tracing
+from src.core.theme import AppTheme
 from src.core.utils import AutoStart
+from src.core.watchdog import STALL_THRESHOLD_MS, StallWatchdog
 
 from src.view.main_window import MainWindow
-from src.view.floating_view import FloatingView
-from src.view.editor_view import EditorView
-from src.view.settings_view import SettingsView
 
-from src.model.data_store import DataStore
+from src.model.data_store import create_data_store
 from src.model.settings_model import SettingsModel
+from src.model.tag_index import TagFilter
+from src.presenter.search_worker import SearchSignals, SearchTask
 
 class MainPresenter(QObject):
+    # 主窗口迟迟没有绘制（例如以最小化启动）时，最多等这么久再开始后续构建
+    STARTUP_FALLBACK_MS = 1000
+    # 外部修改涉及的增删超过这么多条时整表刷新，比逐行插入删除更快
+    EXTERNAL_INCREMENTAL_LIMIT = 200
+    # 标签栏除预设标签外，再按使用次数列出的常用标签个数
+    TAG_BAR_USED_TAGS = 8
+
     def __init__(self):
         super().__init__()
         # Models
         self.settings_model = SettingsModel()
-        self.data_store = DataStore()
+        self.data_store = create_data_store(self.settings_model)
         self.auto_start = AutoStart()
+        profiling.mark("models_loaded")
+
+        # 先装好应用级样式表，之后创建的控件直接按主题绘制
+        self._applied_theme = self.settings_model.get("theme", AppTheme.DEFAULT_THEME)
+        AppTheme.apply(QApplication.instance(), self._applied_theme)
 
-        # Views
+        # Views：启动时只构建主窗口，悬浮窗、托盘和编辑器在首屏绘制之后依次构建
         self.main_window = MainWindow()
-        self.floating_window = FloatingView(self.settings_model)
-        self.editor_dialog = None # Created on demand or reused
+        self.floating_window = None
+        self.file_watcher = None
+        # 编辑器只创建一次，启动后空闲时预先构建，每次打开只重新绑定内容
+        self.editor_dialog_window = None
+        self.editor_view = None
+        self._editor_open_started = None
 
         # State
         self.current_floating_index = 0
         self.current_edit_id = None
+        self.current_search = ""
+        self.tag_filter = None
+        self._tag_bar_tags = None
 
-        # Sync AutoStart
-        self._sync_autostart()
+        # Search：单线程池，新查询使旧查询在下一段之前放弃
+        self._search_generation = 0
+        self.search_pool = QThreadPool(self)
+        self.search_pool.setMaxThreadCount(1)
+        self.search_signals = SearchSignals(self)
+        self.search_signals.page_ready.connect(self._on_search_page)
+        self.search_signals.search_failed.connect(self._on_search_failed)
 
         # Connections
         self._connect_main_window()
-        self._connect_floating_window()
 
         # Initial Data Load
         self.refresh_data()
+        self.main_window.update_tag_bar(self.settings_model.get("preset_tags", []))
+        self.settings_model.watch("preset_tags", lambda tags: self._refresh_tag_bar())
+        self.settings_model.watch("theme", self.on_theme_changed)
+
+        # 事件循环卡住超过阈值时记录 GUI 线程的调用栈
+        self.watchdog = StallWatchdog(self.settings_model.get("stall_threshold_ms", STALL_THRESHOLD_MS), parent=self)
+        self.settings_model.watch("stall_threshold_ms", self.watchdog.set_threshold)
+
+        # 首屏之后的构建步骤，每步之间回到事件循环，不阻塞用户操作
+        self._startup_stages = [
+            ("floating_window", self._ensure_floating_window),
+            ("tray", self.main_window.init_tray),
+            ("autostart_sync", self._sync_autostart),
+            ("editor", self._ensure_editor),
+            ("tag_bar", self._refresh_tag_bar),
+            ("remaining_data", self._start_loading_remaining_data),
+            ("file_watcher", self._start_watching_data_file)
+        ]
+        self._startup_started = False
+        self._quitting = False
+        self.main_window.list_view.viewport().installEventFilter(self)
 
     def start(self):
         self.main_window.show()
+        self.watchdog.start()
+        QTimer.singleShot(self.STARTUP_FALLBACK_MS, self._start_deferred_startup)
         # Floating window visibility is handled by its own internal check_enabled_status
 
+    def _start_deferred_startup(self):
+        if self._startup_started:
+            return
+        self._startup_started = True
+        QTimer.singleShot(0, self._run_next_startup_stage)
+
+    def _run_next_startup_stage(self):
+        if not self._startup_stages:
+            profiling.mark("ready")
+            profiling.report_startup()
+            return
+        name, stage = self._startup_stages.pop(0)
+        stage()
+        profiling.mark(name)
+        QTimer.singleShot(0, self._run_next_startup_stage)
+
     def _sync_autostart(self):
         try:
             config_enabled = self.settings_model.get("auto_start", False)
@@ -56,18 +121,25 @@ class MainPresenter(QObject):
     def _connect_main_window(self):
         view = self.main_window
         view.search_changed.connect(self.on_search_changed)
+        view.tag_filter_changed.connect(self.on_tag_filter_changed)
         view.memo_added.connect(self.on_memo_added)
         view.memo_clicked.connect(self.on_memo_clicked)
         view.memo_double_clicked.connect(self.on_memo_double_clicked)
         view.settings_requested.connect(self.open_settings)
         view.quit_requested.connect(self.quit_app)
-        view.toggle_floating_requested.connect(self.floating_window.toggle_visibility)
+        view.toggle_floating_requested.connect(lambda: self._ensure_floating_window().toggle_visibility())
         view.show_requested.connect(self.show_main_window)
+        view.trace_toggled.connect(tracing.set_enabled)
+        view.trace_export_requested.connect(self.export_trace)
         
         # Patch closeEvent
         view.closeEvent = self.on_main_window_close
 
     def on_main_window_close(self, event):
+        # 退出时 QApplication.quit 会先关闭所有可见窗口，这时不能再拦下改为最小化
+        if self._quitting:
+            event.accept()
+            return
         if self.settings_model.get("close_to_tray", True):
             event.ignore()
             self.main_window.hide()
@@ -78,89 +150,242 @@ class MainPresenter(QObject):
         self.main_window.show()
         self.main_window.activateWindow()
 
+    @tracing.traced(cat="presenter")
     def on_search_changed(self, text):
-        memos = self.data_store.get_memos()
-        if not text:
-            self.main_window.update_memo_list(memos)
+        self.current_search = text
+        self._search_generation += 1
+        tag_filter = self.tag_filter
+        if not text and not tag_filter:
+            # 清空搜索只需列出全部备忘，不涉及扫描；同步完成也保证之后的增量通知基于完整列表
+            self.search_pool.clear()
+            self.main_window.update_memo_list(self.data_store.get_memos())
             return
-        
-        filtered = []
-        for m in memos:
-            if text.lower() in (m.title + m.content).lower():
-                filtered.append(m)
-        self.main_window.update_memo_list(filtered)
+        if self.settings_model.get("search_mode", "filter") == "ranked":
+            limit = self.settings_model.get("search_top_k", 50)
+            blocks = lambda: iter([self.data_store.search_ranked(text, limit, tag_filter)])
+        else:
+            blocks = lambda: self.data_store.iter_search(text, tag_filter)
+        self.search_pool.clear()
+        self.search_pool.start(SearchTask(self._search_generation, blocks,
+                                          self._is_current_search, self.search_signals))
+
+    def on_tag_filter_changed(self, include, exclude, mode):
+        self.tag_filter = TagFilter(include, exclude, mode) or None
+        self.on_search_changed(self.current_search)
+
+    def _refresh_tag_bar(self):
+        """标签栏：预设标签、正在筛选的标签，再加上使用最多的几个标签，按钮提示中显示使用次数。
+
+        首屏只显示预设标签，统计标签要遍历全部备忘，放在启动后的构建步骤中；之后随增删改刷新。
+        """
+        counts = self.data_store.get_tag_counts()
+        tags = list(self.settings_model.get("preset_tags", []))
+        if self.tag_filter:
+            tags.extend(t for t in self.tag_filter.include + self.tag_filter.exclude if t not in tags)
+        used = sorted((t for t in counts if t not in tags), key=lambda t: (-counts[t], t))
+        tags.extend(used[:self.TAG_BAR_USED_TAGS])
+        shown = [(tag, counts.get(tag, 0)) for tag in tags]
+        if shown == self._tag_bar_tags:
+            return
+        self._tag_bar_tags = shown
+        self.main_window.update_tag_bar(tags, counts)
 
+    def _is_filtered(self):
+        return bool(self.current_search or self.tag_filter)
+
+    def _is_current_search(self, generation):
+        return generation == self._search_generation
+
+    def _on_search_page(self, generation, memos, is_first):
+        if generation != self._search_generation: return
+        if is_first:
+            self.main_window.update_memo_list(memos)
+        else:
+            self.main_window.append_memos(memos)
+
+    def _on_search_failed(self, generation, message):
+        if generation != self._search_generation: return
+        self.main_window.show_tray_message(f"搜索失败：{message}")
+
+    @tracing.traced(cat="presenter")
     def on_memo_added(self, text):
-        self.data_store.add_memo(text)
-        self.refresh_data()
+        memo = self.data_store.add_memo(text)
+        if memo.tags:
+            self._refresh_tag_bar()
+        if self._is_filtered():
+            self.on_search_changed(self.current_search)
+        else:
+            self.main_window.insert_memo(self.data_store.index_of(memo.id), memo)
         self.main_window.clear_input()
         self.main_window.scroll_to_top()
 
+    @tracing.traced(cat="presenter")
     def on_memo_clicked(self, memo_id):
         memo = self.data_store.get_memo_by_id(memo_id)
         if memo:
             # Sync floating window index
-            memos = self.data_store.get_memos()
-            try:
-                self.current_floating_index = memos.index(memo)
-            except ValueError:
-                self.current_floating_index = 0
-            
-            self.floating_window.update_content(memo.title, memo.content)
-            self.floating_window.show()
-            self.floating_window.expand_window()
+            self.current_floating_index = max(0, self.data_store.index_of(memo_id))
+
+            floating = self._ensure_floating_window()
+            floating.update_content(memo.title, memo.content, memo.id)
+            floating.show()
+            floating.expand_window()
+            self._prefetch_neighbors(self.current_floating_index)
 
     def on_memo_double_clicked(self, memo_id):
         memo = self.data_store.get_memo_by_id(memo_id)
         if memo:
             self.open_editor(memo)
 
+    def _start_loading_remaining_data(self):
+        if self.data_store.has_pending_data():
+            QTimer.singleShot(0, self._load_remaining_data)
+
+    def _load_remaining_data(self):
+        # 分片存储先显示最新的数据，其余分片在事件循环空闲时逐个读入，全部读完后刷新一次列表
+        if self.data_store.load_more():
+            QTimer.singleShot(0, self._load_remaining_data)
+        else:
+            self.refresh_data()
+            self._refresh_tag_bar()
+
+    @tracing.traced(cat="presenter")
     def refresh_data(self):
+        # 整表重建只用于首次加载和搜索，单条增删改走下面的增量通知
+        self.on_search_changed(self.current_search)
+
+    # --- External Changes ---
+    def _start_watching_data_file(self):
+        if not self.data_store.WATCHES_FILE:
+            return
+        from src.model.file_watcher import FileChangeWatcher
+        self.file_watcher = FileChangeWatcher(self.data_store.file_path, self)
+        self.file_watcher.changed.connect(self.on_data_file_changed)
+
+    @tracing.traced(cat="presenter")
+    def on_data_file_changed(self):
+        # 自己写文件、目录里其他文件变化也会触发，先只比较 mtime 和大小
+        if not self.data_store.has_external_change():
+            return
+        changes = self.data_store.reload_external()
+        if changes is None:
+            return
+        added, updated, removed = changes
+        if self._is_filtered() or len(added) + len(removed) > self.EXTERNAL_INCREMENTAL_LIMIT:
+            self.refresh_data()
+        else:
+            self.main_window.remove_memos(removed)
+            # 按最终位置从前往后插入，每条插入时前面的行都已就位
+            positions = sorted((self.data_store.index_of(memo.id), i) for i, memo in enumerate(added))
+            for row, i in positions:
+                self.main_window.insert_memo(row, added[i])
+            for memo in updated:
+                self.main_window.update_memo(memo, self.data_store.index_of(memo.id))
+        self._refresh_tag_bar()
+        self._refresh_floating_after_external_change({memo.id for memo in updated})
+
+    def _refresh_floating_after_external_change(self, updated_ids):
         memos = self.data_store.get_memos()
-        self.main_window.update_memo_list(memos)
-        self.main_window.update_tag_bar(self.settings_model.get("preset_tags", []))
+        if self.floating_window is None or not memos:
+            return
+        self.current_floating_index = min(self.current_floating_index, len(memos) - 1)
+        memo = memos[self.current_floating_index]
+        if memo.id in updated_ids:
+            self.floating_window.update_content(memo.title, memo.content, memo.id)
+
+    def _notify_memo_updated(self, memo_id):
+        memo = self.data_store.get_memo_by_id(memo_id)
+        if memo is None: return
+        self._refresh_tag_bar()
+        if self._is_filtered():
+            # 修改后是否仍然匹配只能重新搜索
+            self.on_search_changed(self.current_search)
+        else:
+            self.main_window.update_memo(memo, self.data_store.index_of(memo_id))
+
+    def _notify_memo_removed(self, memo_id, row=None):
+        self.main_window.remove_memo(memo_id, row)
+        self._refresh_tag_bar()
 
     # --- Editor Logic ---
-    def open_editor(self, memo):
-        self.current_edit_id = memo.id
-        
-        # Create dialog wrapper
-        self.editor_dialog_window = QDialog(self.main_window)
-        self.editor_dialog_window.setWindowTitle(f"编辑 - {memo.title}")
-        self.editor_dialog_window.resize(500, 400)
-        
-        # Embed EditorView
-        self.editor_view = EditorView(self.editor_dialog_window)
-        layout = QVBoxLayout(self.editor_dialog_window)
-        layout.setContentsMargins(0,0,0,0)
+    def _ensure_editor(self):
+        """构建编辑器对话框（只执行一次）；信号只连接一次，处理函数按 current_edit_id 操作"""
+        if self.editor_dialog_window is not None:
+            return
+        from src.view.editor_view import EditorView
+        dialog = QDialog(self.main_window)
+        dialog.resize(500, 400)
+        self.editor_view = EditorView(dialog)
+        layout = QVBoxLayout(dialog)
+        layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.editor_view)
-        
-        # Setup Data
-        preset_tags = self.settings_model.get("preset_tags", [])
-        self.editor_view.set_content(memo.title, memo.content, memo.tags, preset_tags)
-        
-        # Connect Signals
+
         self.editor_view.save_requested.connect(self.on_editor_save)
-        self.editor_view.cancel_requested.connect(self.editor_dialog_window.reject)
+        self.editor_view.cancel_requested.connect(dialog.reject)
         self.editor_view.delete_requested.connect(self.on_editor_delete)
-        
+
+        # 提前应用样式、计算布局、创建原生窗口并离屏绘制一次（预热字体和样式缓存），
+        # 第一次打开时不再做这些工作
+        dialog.ensurePolished()
+        layout.activate()
+        dialog.create()
+        dialog.grab()
+        dialog.installEventFilter(self)
+        self.editor_dialog_window = dialog
+
+    def open_editor(self, memo):
+        self._editor_open_started = time.perf_counter()
+        # exec 之后是对话框自己的事件循环，只记录打开前的准备工作
+        with tracing.span("MainPresenter.open_editor", "presenter"):
+            self._ensure_editor()
+            self.current_edit_id = memo.id
+            self.editor_dialog_window.setWindowTitle(f"编辑 - {memo.title}")
+            preset_tags = self.settings_model.get("preset_tags", [])
+            self.editor_view.set_content(memo.title, memo.content, memo.tags, preset_tags)
+            self.editor_view.editor_text.setFocus()
         self.editor_dialog_window.exec()
         self.current_edit_id = None
 
+    def eventFilter(self, obj, event):
+        # 列表第一次绘制即首屏出现，此后才开始构建其余部分
+        if (not self._startup_started and event.type() == QEvent.Type.Paint
+                and obj is self.main_window.list_view.viewport()):
+            profiling.mark("first_paint")
+            obj.removeEventFilter(self)
+            self._start_deferred_startup()
+        # 从 open_editor 被调用到对话框第一次绘制完成，即用户看到编辑器的延迟
+        if (obj is self.editor_dialog_window and event.type() == QEvent.Type.Paint
+                and self._editor_open_started is not None):
+            started, self._editor_open_started = self._editor_open_started, None
+            QTimer.singleShot(0, lambda: profiling.record("editor_open", (time.perf_counter() - started) * 1000))
+        return super().eventFilter(obj, event)
+
+    @tracing.traced(cat="presenter")
     def on_editor_save(self, title, content, tags):
         if self.current_edit_id:
             if self.data_store.update_memo(self.current_edit_id, title, content, tags):
-                self.refresh_data()
-                self.floating_window.update_content(title, content)
+                self._notify_memo_updated(self.current_edit_id)
+                self._ensure_floating_window().update_content(title, content, self.current_edit_id)
         self.editor_dialog_window.accept()
 
+    @tracing.traced(cat="presenter")
     def on_editor_delete(self):
         if self.current_edit_id:
-            self.data_store.delete_memo(self.current_edit_id)
-            self.refresh_data()
+            # 删除前的位置作为列表行号的提示，过滤状态下对不上时列表自己再查
+            row = self.data_store.index_of(self.current_edit_id)
+            if self.data_store.delete_memo(self.current_edit_id):
+                self._notify_memo_removed(self.current_edit_id, row)
         self.editor_dialog_window.accept()
 
     # --- Floating Window Logic ---
+    def _ensure_floating_window(self):
+        """悬浮窗在首屏之后构建；在那之前就需要它时（例如点击了备忘）立即构建"""
+        if self.floating_window is None:
+            from src.view.floating_view import FloatingView
+            self.floating_window = FloatingView(self.settings_model)
+            self._connect_floating_window()
+        return self.floating_window
+
     def _connect_floating_window(self):
         view = self.floating_window
         view.request_main_window.connect(self.show_main_window)
@@ -168,6 +393,7 @@ class MainPresenter(QObject):
         view.request_next_memo.connect(lambda: self.navigate_memo(1))
         view.ontop_toggled.connect(self.on_floating_ontop_toggled)
 
+    @tracing.traced(cat="presenter")
     def navigate_memo(self, offset):
         memos = self.data_store.get_memos()
         if not memos: return
@@ -175,14 +401,28 @@ class MainPresenter(QObject):
         new_index = (self.current_floating_index + offset) % len(memos)
         self.current_floating_index = new_index
         memo = memos[new_index]
-        self.floating_window.update_content(memo.title, memo.content)
+        self.floating_window.update_content(memo.title, memo.content, memo.id)
+        self._prefetch_neighbors(new_index)
+
+    def _prefetch_neighbors(self, index):
+        # 前后各 prefetch_neighbors 条，由近到远，翻页时直接换上已排版好的文档
+        memos = self.data_store.get_memos()
+        count = len(memos)
+        radius = min(self.settings_model.get("prefetch_neighbors", 2), count // 2)
+        positions = []
+        for distance in range(1, radius + 1):
+            for i in ((index + distance) % count, (index - distance) % count):
+                if i != index and i not in positions:
+                    positions.append(i)
+        self.floating_window.prefetch([memos[i] for i in positions])
 
     def on_floating_ontop_toggled(self, checked):
+        # 悬浮窗监听 always_on_top 的变化并自行切换
         self.settings_model.set("always_on_top", checked)
-        self.floating_window.set_always_on_top(checked)
 
     # --- Settings Logic ---
     def open_settings(self):
+        from src.view.settings_view import SettingsView
         is_autostart = self.auto_start.is_enabled()
         dialog = SettingsView(self.settings_model, is_autostart, self.main_window)
         
@@ -192,10 +432,15 @@ class MainPresenter(QObject):
         dialog.ontop_toggled.connect(lambda c: self.on_floating_ontop_toggled(c))
         dialog.autohide_changed.connect(lambda v: self.settings_model.set("auto_hide_seconds", v))
         dialog.preset_tags_changed.connect(lambda t: self.settings_model.set("preset_tags", t))
-        
-        if dialog.exec():
-            self.main_window.update_tag_bar(self.settings_model.get("preset_tags", []))
-            self.floating_window.check_enabled_status()
+        dialog.theme_changed.connect(lambda name: self.settings_model.set("theme", name))
+        # 主题在对话框打开期间就要能预览，不等批量修改结束
+        dialog.theme_changed.connect(self.on_theme_changed)
+
+        # 对话框中的修改（如数值框的每一步）合并为一次保存，关闭时每个变化的 key 只通知一次
+        with self.settings_model.batch():
+            accepted = dialog.exec()
+        if accepted:
+            self._ensure_floating_window().check_enabled_status()
 
     def on_setting_autostart(self, checked):
         success = self.auto_start.set_state(checked)
@@ -207,7 +452,40 @@ class MainPresenter(QObject):
 
     def on_setting_floating_toggled(self, checked):
         self.settings_model.set("show_floating_window", checked)
-        self.floating_window.check_enabled_status()
+
+    def on_theme_changed(self, name):
+        # 样式表整体替换一次；自绘部分（列表委托、收起的悬浮条）重新取色
+        if name == self._applied_theme:
+            return
+        self._applied_theme = name
+        AppTheme.apply(QApplication.instance(), name)
+        self.main_window.refresh_theme()
+        if self.floating_window is not None:
+            self.floating_window.update()
+
+    def export_trace(self, path):
+        try:
+            count = tracing.export_chrome_trace(path)
+            self.main_window.show_tray_message(f"已导出 {count} 条跟踪事件")
+        except:
+            self.main_window.show_tray_message("导出性能跟踪失败")
 
     def quit_app(self):
+        if self._quitting:
+            return
+        self._quitting = True
+        self.watchdog.stop()
+        # 退出前放弃进行中的搜索，并等待后台写线程把待写修改落盘
+        self._search_generation += 1
+        self.search_pool.clear()
+        self.search_pool.waitForDone()
+        self.data_store.flush()
+        self.data_store.close()
+        self.settings_model.flush()
+        # 通过 MEMOFLOW_TRACE 开启的跟踪在退出时导出
+        tracing.export_from_env()
+        # 之后各对象可能按任意顺序析构，不能再把事件转给 presenter
+        self.main_window.list_view.viewport().removeEventFilter(self)
+        if self.editor_dialog_window is not None:
+            self.editor_dialog_window.removeEventFilter(self)
         QApplication.quit()
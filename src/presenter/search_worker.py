@@ -0,0 +1,51 @@
+# src/presenter/search_worker.py
+# -*- coding: utf-8 -*-
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from src.core import tracing
+
+class SearchSignals(QObject):
+    # generation, memos, is_first_page
+    page_ready = pyqtSignal(int, list, bool)
+    # generation, 错误说明
+    search_failed = pyqtSignal(int, str)
+
+
+class SearchTask(QRunnable):
+    """在线程池中执行一次搜索，把结果按页发回 GUI 线程。
+
+    blocks() 返回逐段产出命中结果的迭代器（如 DataStore.iter_search），is_current(generation)
+    为 False 时说明已有更新的查询，本任务在下一段之前放弃。出错时发出 search_failed，不再发送后续页。
+    """
+
+    def __init__(self, generation, blocks, is_current, signals, first_page=100):
+        super().__init__()
+        self.generation = generation
+        self.blocks = blocks
+        self.is_current = is_current
+        self.signals = signals
+        self.first_page = first_page
+
+    def run(self):
+        with tracing.span("SearchTask.run", "search", generation=self.generation):
+            self._run()
+
+    def _run(self):
+        first = True
+        page = []
+        limit = self.first_page
+        try:
+            for hits in self.blocks():
+                if not self.is_current(self.generation):
+                    return
+                page.extend(hits)
+                if len(page) >= limit:
+                    self.signals.page_ready.emit(self.generation, page, first)
+                    first = False
+                    page = []
+                    # 第一页够填满首屏即可，之后页长翻倍，追加次数只有 log(n) 级
+                    limit *= 2
+            if self.is_current(self.generation) and (page or first):
+                self.signals.page_ready.emit(self.generation, page, first)
+        except Exception as e:
+            if self.is_current(self.generation):
+                self.signals.search_failed.emit(self.generation, f"{type(e).__name__}: {e}")
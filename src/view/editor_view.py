@@ -3,7 +3,7 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit, 
                              QLineEdit, QPushButton, QScrollArea, QGridLayout, QMessageBox)
 from PyQt6.QtCore import Qt, pyqtSignal
-from src.core.theme import AppTheme
+from src.view.widgets.widget_pool import WidgetPool
 
 class EditorView(QWidget):
     # Signals to Presenter
@@ -13,7 +13,9 @@ class EditorView(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet(f"background-color: {AppTheme.COLORS['bg_primary']};")
+        self.setObjectName("EditorView")
+        # QWidget 子类要设置这个属性才会绘制样式表中的背景
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         self._init_ui()
         self.current_tags = []
 
@@ -25,16 +27,13 @@ class EditorView(QWidget):
         # Header
         header = QHBoxLayout()
         title_lbl = QLabel("编辑")
-        title_lbl.setStyleSheet(f"color: {AppTheme.COLORS['text_secondary']}; font-size: 14px;")
+        title_lbl.setObjectName("EditorHeading")
         header.addWidget(title_lbl)
         header.addStretch()
 
         btn_delete = QPushButton("删除")
         btn_delete.setCursor(Qt.CursorShape.PointingHandCursor)
-        btn_delete.setStyleSheet(f"""
-            QPushButton {{ color: #e74c3c; background: transparent; border: 1px solid #e74c3c; border-radius: 4px; padding: 4px 12px; }} 
-            QPushButton:hover {{ background-color: rgba(231, 76, 60, 0.1); }}
-        """)
+        btn_delete.setProperty("variant", "dangerOutline")
         btn_delete.clicked.connect(self.delete_requested.emit)
         header.addWidget(btn_delete)
         layout.addLayout(header)
@@ -42,50 +41,34 @@ class EditorView(QWidget):
         # Title Input
         self.edit_title_input = QLineEdit()
         self.edit_title_input.setPlaceholderText("标题")
-        self.edit_title_input.setStyleSheet(f"""
-            QLineEdit {{
-                background: transparent;
-                border: none;
-                border-bottom: 1px solid {AppTheme.COLORS['border']};
-                color: {AppTheme.COLORS['text_primary']};
-                font-size: 18px;
-                font-weight: bold;
-                padding: 4px 0px;
-            }}
-            QLineEdit:focus {{ border-bottom: 1px solid {AppTheme.COLORS['accent']}; }}
-        """)
+        self.edit_title_input.setObjectName("EditorTitle")
         layout.addWidget(self.edit_title_input)
 
         # Content Input
         self.editor_text = QTextEdit()
         self.editor_text.setPlaceholderText("Markdown 内容...")
-        self.editor_text.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: {AppTheme.COLORS['bg_secondary']};
-                border: 1px solid {AppTheme.COLORS['border']};
-                border-radius: 6px;
-                padding: 10px;
-                font-size: 14px;
-                color: {AppTheme.COLORS['text_primary']};
-            }}
-        """)
+        self.editor_text.setObjectName("EditorText")
         layout.addWidget(self.editor_text)
 
         # Tags Selection
         tags_label = QLabel("选择标签:")
-        tags_label.setStyleSheet(f"color: {AppTheme.COLORS['text_secondary']}; font-size: 12px;")
+        tags_label.setObjectName("EditorHint")
         layout.addWidget(tags_label)
 
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFixedHeight(80)
-        scroll.setStyleSheet("background: transparent; border: none;")
+        scroll.setObjectName("EditorTagScroll")
 
         self.tag_select_container = QWidget()
+        self.tag_select_container.setObjectName("EditorTagContainer")
         self.tag_select_layout = QGridLayout(self.tag_select_container)
         self.tag_select_layout.setContentsMargins(0, 0, 0, 0)
         self.tag_select_layout.setSpacing(8)
         self.tag_select_layout.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        self.tag_option_pool = WidgetPool(self._create_tag_option,
+                                          lambda btn, i: self.tag_select_layout.addWidget(btn, i // 4, i % 4),
+                                          reset=lambda btn: btn.setChecked(False))
 
         scroll.setWidget(self.tag_select_container)
         layout.addWidget(scroll)
@@ -94,17 +77,12 @@ class EditorView(QWidget):
         btn_layout = QHBoxLayout()
         btn_cancel = QPushButton("取消")
         btn_cancel.clicked.connect(self.cancel_requested.emit)
-        btn_cancel.setStyleSheet(f"""
-            QPushButton {{ background-color: {AppTheme.COLORS['bg_secondary']}; color: {AppTheme.COLORS['text_primary']}; border: 1px solid {AppTheme.COLORS['border']}; border-radius: 4px; padding: 8px 20px; }} 
-            QPushButton:hover {{ background-color: #4a4a4f; }}
-        """)
+        btn_cancel.setProperty("variant", "secondary")
 
         btn_save = QPushButton("保存")
         btn_save.clicked.connect(self._on_save_clicked)
-        btn_save.setStyleSheet(f"""
-            QPushButton {{ background-color: {AppTheme.COLORS['accent']}; color: white; border: none; border-radius: 4px; padding: 8px 20px; font-weight: bold; }} 
-            QPushButton:hover {{ background-color: #0e8c6d; }}
-        """)
+        btn_save.setObjectName("SaveButton")
+        btn_save.setProperty("variant", "primary")
 
         btn_layout.addStretch()
         btn_layout.addWidget(btn_cancel)
@@ -117,43 +95,24 @@ class EditorView(QWidget):
         self.current_tags = tags
         self._populate_tag_selector(preset_tags, tags)
 
+    def _create_tag_option(self):
+        btn = QPushButton()
+        btn.setCheckable(True)
+        btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn.setProperty("variant", "tagOption")
+        return btn
+
     def _populate_tag_selector(self, preset_tags, existing_tags):
-        # Clear existing
-        while self.tag_select_layout.count():
-            child = self.tag_select_layout.takeAt(0)
-            if child.widget(): child.widget().deleteLater()
-
-        for i, tag in enumerate(preset_tags):
-            btn = QPushButton(tag)
-            btn.setCheckable(True)
-            btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            if tag in existing_tags: btn.setChecked(True)
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {AppTheme.COLORS['bg_secondary']};
-                    color: {AppTheme.COLORS['text_secondary']};
-                    border: 1px solid {AppTheme.COLORS['border']};
-                    border-radius: 12px;
-                    padding: 4px 12px;
-                    font-size: 12px;
-                }}
-                QPushButton:checked {{
-                    background-color: {AppTheme.COLORS['tag_bg']};
-                    color: {AppTheme.COLORS['accent']};
-                    border: 1px solid {AppTheme.COLORS['accent']};
-                }}
-            """)
-            self.tag_select_layout.addWidget(btn, i // 4, i % 4)
+        # 复用上次打开时的按钮，只重设文字和选中状态
+        for btn, tag in zip(self.tag_option_pool.acquire(len(preset_tags)), preset_tags):
+            btn.setText(tag)
+            btn.setChecked(tag in existing_tags)
 
     def _on_save_clicked(self):
         new_title = self.edit_title_input.text().strip()
         if not new_title: new_title = "无标题"
         new_content = self.editor_text.toPlainText().strip()
         
-        selected_tags = []
-        for i in range(self.tag_select_layout.count()):
-            widget = self.tag_select_layout.itemAt(i).widget()
-            if isinstance(widget, QPushButton) and widget.isChecked():
-                selected_tags.append(widget.text())
+        selected_tags = [btn.text() for btn in self.tag_option_pool if btn.isChecked()]
         
         self.save_requested.emit(new_title, new_content, selected_tags)
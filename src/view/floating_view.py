@@ -3,8 +3,13 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTextEdit,
                              QGraphicsDropShadowEffect, QMenu, QApplication)
 from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QRect, QParallelAnimationGroup, pyqtSignal
-from PyQt6.QtGui import QAction, QColor, QPainter, QBrush
+from PyQt6.QtGui import QAction, QColor, QPainter, QBrush, QTextDocument
+from src.core import tracing
 from src.core.theme import AppTheme
+from src.view.render_cache import RenderCache
+
+# 渲染缓存默认上限（MB），settings.json 中的 floating_cache_mb 可覆盖
+RENDER_CACHE_MB = 16
 
 class FloatingView(QWidget):
     # Signals
@@ -19,11 +24,19 @@ class FloatingView(QWidget):
         
         # Initial State
         self.is_on_top = self.settings.get("always_on_top", True)
+        self.show_enabled = self.settings.get("show_floating_window", True)
+        self.auto_hide_seconds = self.settings.get("auto_hide_seconds", 3)
         self.current_content_height = 200
         self.collapsed_height = 6
         self.is_expanded = True
         self._drag_pos = None
 
+        # 解析好的 Markdown 文档和排版高度，按 (id, 宽度) 缓存，内容变化后替换
+        self.render_cache = RenderCache(int(self.settings.get("floating_cache_mb", RENDER_CACHE_MB) * 1024 * 1024))
+        self._shown_document = None
+        self._prefetch_queue = []
+        self._prefetch_budget = 0
+
         # Setup UI
         self._init_window_flags()
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
@@ -36,6 +49,17 @@ class FloatingView(QWidget):
         self.auto_hide_timer.timeout.connect(self.collapse_window)
         self.sync_timer_settings()
 
+        # 事件队列空闲时每次预取一条，不阻塞用户操作
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setInterval(0)
+        self.prefetch_timer.timeout.connect(self._prefetch_next)
+
+        # 配置变化时由 SettingsModel 通知，不在鼠标事件里反复读取
+        self.settings.watch("show_floating_window", self._on_show_enabled_changed)
+        self.settings.watch("auto_hide_seconds", self._on_auto_hide_changed)
+        self.settings.watch("always_on_top", self.set_always_on_top)
+        self.settings.watch("floating_cache_mb", lambda mb: self.render_cache.set_max_bytes(int(mb * 1024 * 1024)))
+
         # Initial check
         QTimer.singleShot(100, self.check_enabled_status)
 
@@ -51,8 +75,7 @@ class FloatingView(QWidget):
         self.main_layout.setContentsMargins(10, 10, 10, 10)
 
         self.container = QWidget()
-        self.container.setObjectName("Container")
-        self.container.setStyleSheet(AppTheme.get_stylesheet("FloatingWindow"))
+        self.container.setObjectName("FloatingContainer")
 
         self.shadow = QGraphicsDropShadowEffect(self)
         self.shadow.setBlurRadius(20)
@@ -66,7 +89,7 @@ class FloatingView(QWidget):
         self.container_layout.setSpacing(8)
 
         self.title_label = QLabel("暂无备忘录")
-        self.title_label.setStyleSheet(AppTheme.get_stylesheet("TitleLabel"))
+        self.title_label.setObjectName("FloatingTitle")
         self.title_label.setWordWrap(True)
         self.title_label.setContextMenuPolicy(Qt.ContextMenuPolicy.NoContextMenu)
         self.container_layout.addWidget(self.title_label)
@@ -76,14 +99,7 @@ class FloatingView(QWidget):
         self.content_edit.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.content_edit.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.content_edit.setContextMenuPolicy(Qt.ContextMenuPolicy.NoContextMenu)
-        self.content_edit.setStyleSheet(f"""
-            QTextEdit {{
-                border: none; 
-                background: transparent; 
-                color: {AppTheme.COLORS['text_primary']};
-                line-height: 1.5;
-            }}
-        """)
+        self.content_edit.setObjectName("FloatingContent")
         self.container_layout.addWidget(self.content_edit)
 
     def _init_animations(self):
@@ -97,26 +113,84 @@ class FloatingView(QWidget):
 
         self.anim_group.addAnimation(self.anim_geo)
         self.anim_group.addAnimation(self.anim_opacity)
+        # 跟踪开启时，每段动画从开始到结束（或被打断）记为一个异步区间
+        self._anim_trace = None
+        self.anim_group.finished.connect(self._end_anim_trace)
 
-    def update_content(self, title, content):
+    def _begin_anim_trace(self, name):
+        self._anim_trace = tracing.begin(name, "animation")
+
+    def _end_anim_trace(self, interrupted=False):
+        token, self._anim_trace = self._anim_trace, None
+        tracing.end(token, interrupted=interrupted)
+
+    @tracing.traced(cat="view")
+    def update_content(self, title, content, memo_id=None):
         self.title_label.setText(title)
-        self.content_edit.setMarkdown(content)
-        self.current_content_height = self._calculate_ideal_height()
+        document, doc_height = self.render_document(memo_id, content)
+        # 被缓存淘汰的文档仍在显示时，靠这个引用保持存活
+        self._shown_document = document
+        self.content_edit.setDocument(document)
+        self.current_content_height = self._calculate_ideal_height(doc_height)
         if self.is_expanded:
             self.force_stop_animation()
             self.expand_window()
 
-    def _calculate_ideal_height(self):
-        base_width = self.width() - 62
-        self.content_edit.document().setTextWidth(base_width)
-        doc_height = self.content_edit.document().size().height()
+    def _cache_key(self, memo_id):
+        return (memo_id, self.width() - 62)
+
+    @tracing.traced(cat="view")
+    def render_document(self, memo_id, content):
+        """返回 (文档, 文档高度)；同一备忘在内容和宽度不变时只解析、排版一次"""
+        width = self.width() - 62
+        key = self._cache_key(memo_id)
+        entry = self.render_cache.get(key, content)
+        if entry is not None:
+            return entry
+        document = QTextDocument()
+        document.setDefaultFont(self.content_edit.font())
+        document.setDocumentMargin(self.content_edit.document().documentMargin())
+        document.setMarkdown(content)
+        document.setTextWidth(width)
+        doc_height = document.size().height()
+        self.render_cache.put(key, (document, doc_height), self._document_cost(document), content)
+        return document, doc_height
+
+    @staticmethod
+    def _document_cost(document):
+        # 粗略估算：每个字符连同格式约 16 字节，另加文档对象本身的开销
+        return document.characterCount() * 16 + 4096
+
+    def prefetch(self, memos):
+        """在空闲时按顺序（由近到远）预先解析这些备忘，替换尚未处理完的队列。
+
+        每轮预取最多占用缓存上限的一半，避免把刚显示的内容挤出缓存。
+        """
+        self._prefetch_queue = list(memos)[::-1]
+        self._prefetch_budget = self.render_cache.max_bytes // 2
+        if self._prefetch_queue:
+            self.prefetch_timer.start()
+        else:
+            self.prefetch_timer.stop()
+
+    def _prefetch_next(self):
+        if not self._prefetch_queue or self._prefetch_budget <= 0:
+            self._prefetch_queue = []
+            self.prefetch_timer.stop()
+            return
+        memo = self._prefetch_queue.pop()
+        content = memo.content
+        if not self.render_cache.has(self._cache_key(memo.id), content):
+            document, _ = self.render_document(memo.id, content)
+            self._prefetch_budget -= self._document_cost(document)
+
+    def _calculate_ideal_height(self, doc_height):
         title_height = self.title_label.sizeHint().height()
         total = int(doc_height + title_height + 60)
         return max(100, min(total, 800))
 
     def check_enabled_status(self):
-        enabled = self.settings.get("show_floating_window", True)
-        if not enabled:
+        if not self.show_enabled:
             self.hide()
             self.auto_hide_timer.stop()
         else:
@@ -126,15 +200,25 @@ class FloatingView(QWidget):
             self.auto_hide_timer.start()
 
     def sync_timer_settings(self):
-        seconds = self.settings.get("auto_hide_seconds", 3)
+        seconds = self.auto_hide_seconds
         if seconds < 1: seconds = 1
         self.auto_hide_timer.setInterval(seconds * 1000)
 
+    def _on_show_enabled_changed(self, enabled):
+        self.show_enabled = enabled
+        self.check_enabled_status()
+
+    def _on_auto_hide_changed(self, seconds):
+        self.auto_hide_seconds = seconds
+        self.sync_timer_settings()
+
     def force_stop_animation(self):
         self.auto_hide_timer.stop()
         if self.anim_group.state() == QParallelAnimationGroup.State.Running:
             self.anim_group.stop()
+            self._end_anim_trace(interrupted=True)
 
+    @tracing.traced(cat="view")
     def expand_window(self):
         self.force_stop_animation()
         current_geo = self.geometry()
@@ -145,9 +229,11 @@ class FloatingView(QWidget):
         self.anim_geo.setEndValue(target_geo)
         self.anim_opacity.setStartValue(self.windowOpacity())
         self.anim_opacity.setEndValue(1.0)
+        self._begin_anim_trace("FloatingView.expand_animation")
         self.anim_group.start()
         self.is_expanded = True
 
+    @tracing.traced(cat="view")
     def collapse_window(self):
         if self.underMouse():
             self.auto_hide_timer.start()
@@ -161,6 +247,7 @@ class FloatingView(QWidget):
         self.anim_geo.setEndValue(target_geo)
         self.anim_opacity.setStartValue(self.windowOpacity())
         self.anim_opacity.setEndValue(0.5)
+        self._begin_anim_trace("FloatingView.collapse_animation")
         self.anim_group.start()
         self.is_expanded = False
         self.auto_hide_timer.stop()
@@ -176,6 +263,7 @@ class FloatingView(QWidget):
             self.expand_window()
 
     def set_always_on_top(self, enabled):
+        if enabled == self.is_on_top: return
         self.is_on_top = enabled
         pos = self.pos()
         self.hide()
@@ -201,6 +289,7 @@ class FloatingView(QWidget):
             self.move(x, 0)
 
     def _save_position(self):
+        # set 只更新内存，写盘由 SettingsModel 在后台合并完成
         try:
             self.settings.set("win_x", self.x())
         except:
@@ -208,13 +297,12 @@ class FloatingView(QWidget):
 
     # Events
     def enterEvent(self, event):
-        if self.settings.get("show_floating_window", True):
+        if self.show_enabled:
             self.auto_hide_timer.stop()
             self.expand_window()
         super().enterEvent(event)
 
     def leaveEvent(self, event):
-        self.sync_timer_settings()
         self.auto_hide_timer.start()
         super().leaveEvent(event)
 
@@ -237,7 +325,6 @@ class FloatingView(QWidget):
         if event.button() == Qt.MouseButton.LeftButton:
             self._drag_pos = None
             if not self.underMouse():
-                self.sync_timer_settings()
                 self.auto_hide_timer.start()
             self._save_position()
         super().mouseReleaseEvent(event)
@@ -260,10 +347,6 @@ class FloatingView(QWidget):
     def contextMenuEvent(self, event):
         self.auto_hide_timer.stop()
         menu = QMenu(self)
-        menu.setStyleSheet(f"""
-            QMenu {{ background-color: {AppTheme.COLORS['bg_secondary']}; color: {AppTheme.COLORS['text_primary']}; border: 1px solid {AppTheme.COLORS['border']}; }}
-            QMenu::item:selected {{ background-color: {AppTheme.COLORS['accent']}; }}
-        """)
 
         action_main = QAction("显示主窗口", self)
         action_main.triggered.connect(self.request_main_window.emit)
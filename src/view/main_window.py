@@ -1,32 +1,43 @@
 # src/view/main_window.py
 # -*- coding: utf-8 -*-
+from contextlib import contextmanager
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QListWidget, QSystemTrayIcon, QMenu, QLineEdit, 
-                             QPushButton, QListWidgetItem)
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
+                             QListView, QSystemTrayIcon, QMenu, QLineEdit, 
+                             QPushButton, QFileDialog)
+from PyQt6.QtCore import Qt, pyqtSignal, QModelIndex, QPersistentModelIndex, QPoint, QTimer
 from PyQt6.QtGui import QAction, QColor, QIcon, QPixmap, QPainter, QBrush
 
+from src.core import tracing
 from src.core.theme import AppTheme
-from src.view.widgets.memo_item import MemoListItemWidget
+from src.view.widgets.memo_delegate import MemoItemDelegate
+from src.view.widgets.memo_list_model import MemoListModel
 from src.view.widgets.tag_button import TagButton
+from src.view.widgets.widget_pool import WidgetPool
 
 class MainWindow(QMainWindow):
+    # 输入停顿这么久才发出 search_changed
+    SEARCH_DEBOUNCE_MS = 150
+
     # Signals
     search_changed = pyqtSignal(str)
     memo_added = pyqtSignal(str)
-    memo_clicked = pyqtSignal(int)
-    memo_double_clicked = pyqtSignal(int)
+    memo_clicked = pyqtSignal(object)
+    memo_double_clicked = pyqtSignal(object)
+    tag_filter_changed = pyqtSignal(list, list, str) # include, exclude, mode ("and" / "or")
     settings_requested = pyqtSignal()
     quit_requested = pyqtSignal()
     toggle_floating_requested = pyqtSignal()
     show_requested = pyqtSignal()
+    trace_toggled = pyqtSignal(bool)
+    trace_export_requested = pyqtSignal(str) # 导出路径
 
     def __init__(self):
         super().__init__()
         self.setWindowTitle("MemoFlow")
         self.resize(400, 600)
         self._init_ui()
-        self._init_tray()
+        # 托盘图标由 MainPresenter 在首屏之后调用 init_tray 创建
+        self.tray = None
 
     def _init_ui(self):
         self.home_widget = QWidget()
@@ -38,31 +49,41 @@ class MainWindow(QMainWindow):
 
         # Search
         search_container = QWidget()
-        search_container.setStyleSheet(f"background-color: {AppTheme.COLORS['bg_primary']}; border-bottom: 1px solid {AppTheme.COLORS['border']};")
+        search_container.setObjectName("SearchBar")
         search_layout = QHBoxLayout(search_container)
         search_layout.setContentsMargins(10, 8, 10, 8)
 
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("🔍 搜索备忘录...")
-        self.search_input.setStyleSheet(f"QLineEdit {{ background-color: {AppTheme.COLORS['bg_secondary']}; border: none; border-radius: 15px; padding: 4px 12px; color: {AppTheme.COLORS['text_primary']}; }}")
-        self.search_input.textChanged.connect(self.search_changed.emit)
+        self.search_input.setObjectName("SearchInput")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(lambda: self.search_changed.emit(self.search_input.text()))
+        self.search_input.textChanged.connect(self.search_timer.start)
         search_layout.addWidget(self.search_input)
         layout.addWidget(search_container)
 
-        # List
-        self.list_widget = QListWidget()
-        self.list_widget.setStyleSheet("QListWidget { border: none; background-color: #1e1e1e; }")
-        self.list_widget.setAlternatingRowColors(False)
-        self.list_widget.itemClicked.connect(self._on_item_clicked)
-        self.list_widget.itemDoubleClicked.connect(self._on_item_double_clicked)
-        layout.addWidget(self.list_widget)
+        # List：模型只保存引用，委托只绘制可见行
+        self.memo_model = MemoListModel(self)
+        self.list_view = QListView()
+        self.list_view.setObjectName("MemoList")
+        self.list_view.setModel(self.memo_model)
+        self.list_view.setItemDelegate(MemoItemDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setMouseTracking(True)
+        self.list_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.list_view.setAlternatingRowColors(False)
+        self.list_view.clicked.connect(self._on_item_clicked)
+        self.list_view.doubleClicked.connect(self._on_item_double_clicked)
+        layout.addWidget(self.list_view)
 
         # Input Area
         self._init_input_area(layout)
 
     def _init_input_area(self, parent_layout):
         container = QWidget()
-        container.setStyleSheet("background-color: #2d2d30; border-top: 1px solid #3e3e42;")
+        container.setObjectName("InputArea")
         v_layout = QVBoxLayout(container)
         v_layout.setContentsMargins(0, 0, 0, 0)
         v_layout.setSpacing(0)
@@ -72,6 +93,12 @@ class MainWindow(QMainWindow):
         self.tag_bar_layout = QHBoxLayout(self.tag_bar)
         self.tag_bar_layout.setContentsMargins(12, 4, 12, 0)
         self.tag_bar_layout.setSpacing(4)
+        self.tag_buttons_layout = QHBoxLayout()
+        self.tag_buttons_layout.setContentsMargins(0, 0, 0, 0)
+        self.tag_buttons_layout.setSpacing(4)
+        self.tag_bar_layout.addLayout(self.tag_buttons_layout)
+        self.tag_bar_layout.addStretch()
+        self._init_tag_filter_controls()
         v_layout.addWidget(self.tag_bar)
 
         input_row = QWidget()
@@ -82,35 +109,59 @@ class MainWindow(QMainWindow):
 
         self.input_edit = QLineEdit()
         self.input_edit.setPlaceholderText("快速记录... (#标签)")
-        self.input_edit.setStyleSheet(f"QLineEdit {{ background-color: #1e1e1e; color: #ECECF1; border: 1px solid #565869; border-radius: 6px; padding: 4px 8px; }} QLineEdit:focus {{ border: 1px solid {AppTheme.COLORS['accent']}; }}")
+        self.input_edit.setObjectName("QuickInput")
         self.input_edit.returnPressed.connect(self._on_add_memo)
         h_layout.addWidget(self.input_edit)
 
         send_btn = QPushButton("发送")
         send_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         send_btn.setFixedWidth(60)
-        send_btn.setStyleSheet(f"QPushButton {{ background-color: {AppTheme.COLORS['accent']}; color: white; border: none; border-radius: 6px; font-weight: bold; height: 28px; }}")
+        send_btn.setObjectName("SendButton")
+        send_btn.setProperty("variant", "primary")
         send_btn.clicked.connect(self._on_add_memo)
         h_layout.addWidget(send_btn)
 
         v_layout.addWidget(input_row)
         parent_layout.addWidget(container)
 
-    def _init_tray(self):
+    def _init_tag_filter_controls(self):
+        # 筛选模式：点击标签在 未选 -> 包含 -> 排除 之间切换，而不是插入到输入框
+        self.tag_buttons = {}
+        self.tag_filter_states = {}
+        # 标签栏的标签随使用情况变化，收回的按钮清掉筛选状态，最多留几个备用
+        self.tag_button_pool = WidgetPool(self._create_tag_button,
+                                          lambda btn, i: self.tag_buttons_layout.addWidget(btn),
+                                          reset=lambda btn: btn.set_filter_state(TagButton.FILTER_NONE),
+                                          max_idle=8)
+        self.filter_mode_button = QPushButton("全部")
+        self.filter_mode_button.setCheckable(True)
+        self.filter_mode_button.setToolTip("全部：同时包含所选标签；任一：包含任意一个所选标签")
+        self.filter_mode_button.setProperty("variant", "chip")
+        self.filter_mode_button.setVisible(False)
+        self.filter_mode_button.toggled.connect(self._on_filter_mode_toggled)
+        self.tag_bar_layout.addWidget(self.filter_mode_button)
+
+        self.filter_button = QPushButton("筛选")
+        self.filter_button.setCheckable(True)
+        self.filter_button.setToolTip("按标签筛选列表，再次点击标签可切换为排除")
+        self.filter_button.setProperty("variant", "chip")
+        self.filter_button.toggled.connect(self._on_filter_toggled)
+        self.tag_bar_layout.addWidget(self.filter_button)
+
+    def init_tray(self):
         self.tray = QSystemTrayIcon(self)
         pixmap = QPixmap(16, 16)
         pixmap.fill(Qt.GlobalColor.transparent)
         painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setBrush(QBrush(QColor("#10A37F")))
+        painter.setBrush(QBrush(QColor(AppTheme.COLORS['accent'])))
         painter.setPen(Qt.PenStyle.NoPen)
         painter.drawEllipse(2, 2, 12, 12)
         painter.end()
         self.tray.setIcon(QIcon(pixmap))
         self.tray.setToolTip("MemoFlow")
 
-        menu = QMenu()
-        menu.setStyleSheet(f"QMenu {{ background-color: {AppTheme.COLORS['bg_secondary']}; color: {AppTheme.COLORS['text_primary']}; border: 1px solid {AppTheme.COLORS['border']}; }} QMenu::item:selected {{ background-color: {AppTheme.COLORS['accent']}; }}")
+        menu = QMenu(self)
 
         action_show = QAction("显示主窗口", self)
         action_show.triggered.connect(self.show_requested.emit)
@@ -124,6 +175,17 @@ class MainWindow(QMainWindow):
         action_settings.triggered.connect(self.settings_requested.emit)
         menu.addAction(action_settings)
 
+        menu.addSeparator()
+        action_trace = QAction("记录性能跟踪", self)
+        action_trace.setCheckable(True)
+        action_trace.setChecked(tracing.enabled())
+        action_trace.triggered.connect(lambda checked: self.trace_toggled.emit(checked))
+        menu.addAction(action_trace)
+
+        action_export = QAction("导出性能跟踪...", self)
+        action_export.triggered.connect(self._on_export_trace)
+        menu.addAction(action_export)
+
         menu.addSeparator()
         action_quit = QAction("退出", self)
         action_quit.triggered.connect(self.quit_requested.emit)
@@ -133,37 +195,114 @@ class MainWindow(QMainWindow):
         self.tray.activated.connect(self._on_tray_activated)
         self.tray.show()
 
+    def refresh_theme(self):
+        """样式表由 QApplication 统一更新，这里只需让委托换用新颜色并重绘列表"""
+        self.list_view.itemDelegate().refresh_colors()
+        self.list_view.viewport().update()
+
+    @tracing.traced(cat="view")
     def update_memo_list(self, memos):
-        self.list_widget.clear()
-        for m in memos:
-            item = QListWidgetItem(self.list_widget)
-            widget = MemoListItemWidget(m.title, m.content, m.tags, m.time_str)
-            item.setSizeHint(QSize(0, 80))
-            item.setData(Qt.ItemDataRole.UserRole, m.id)
-            self.list_widget.setItemWidget(item, widget)
-
-    def update_tag_bar(self, tags):
-        while self.tag_bar_layout.count():
-            child = self.tag_bar_layout.takeAt(0)
-            if child.widget(): child.widget().deleteLater()
-        
-        for tag in tags:
-            btn = TagButton(tag)
-            btn.clicked_tag.connect(self._insert_tag)
-            self.tag_bar_layout.addWidget(btn)
-        self.tag_bar_layout.addStretch()
+        self.memo_model.set_memos(memos)
+
+    @tracing.traced(cat="view")
+    def append_memos(self, memos):
+        self.memo_model.append_memos(memos)
+
+    def insert_memo(self, row, memo):
+        with self._keep_scroll_anchor():
+            self.memo_model.insert_memo(row, memo)
+
+    def update_memo(self, memo, row=None):
+        with self._keep_scroll_anchor():
+            self.memo_model.update_memo(memo, row)
+
+    def remove_memo(self, memo_id, row=None):
+        with self._keep_scroll_anchor():
+            self.memo_model.remove_memo(memo_id, row)
+
+    def remove_memos(self, memo_ids):
+        with self._keep_scroll_anchor():
+            self.memo_model.remove_memos(memo_ids)
+
+    @contextmanager
+    def _keep_scroll_anchor(self):
+        """行数变化后把原先位于顶部的那一行留在原处，避免可见内容跳动"""
+        view = self.list_view
+        anchor = view.indexAt(QPoint(0, 0))
+        offset = view.visualRect(anchor).top() if anchor.isValid() else 0
+        persistent = QPersistentModelIndex(anchor)
+        yield
+        if anchor.isValid() and persistent.isValid() and view.verticalScrollBar().value() > 0:
+            view.doItemsLayout()
+            bar = view.verticalScrollBar()
+            bar.setValue(bar.value() + view.visualRect(QModelIndex(persistent)).top() - offset)
+
+    def _create_tag_button(self):
+        btn = TagButton("")
+        btn.clicked_tag.connect(self._on_tag_clicked)
+        return btn
+
+    @tracing.traced(cat="view")
+    def update_tag_bar(self, tags, counts=None):
+        # 复用已有按钮，只改文字和筛选状态；多余的隐藏。counts 给出时在提示中显示各标签的备忘数
+        self.tag_buttons = {}
+        for btn, tag in zip(self.tag_button_pool.acquire(len(tags)), tags):
+            btn.set_tag(tag)
+            btn.set_filter_state(self.tag_filter_states.get(tag, TagButton.FILTER_NONE))
+            btn.setToolTip(f"{counts.get(tag, 0)} 条备忘" if counts is not None else "")
+            self.tag_buttons[tag] = btn
+
+        # 不再显示的标签不再参与筛选
+        removed = [tag for tag in self.tag_filter_states if tag not in self.tag_buttons]
+        for tag in removed:
+            del self.tag_filter_states[tag]
+        if removed:
+            self._emit_tag_filter()
 
     def clear_input(self):
         self.input_edit.clear()
 
     def scroll_to_top(self):
-        self.list_widget.scrollToTop()
+        self.list_view.scrollToTop()
 
     def _on_add_memo(self):
         text = self.input_edit.text().strip()
         if text:
             self.memo_added.emit(text)
 
+    def _on_tag_clicked(self, tag_text):
+        if not self.filter_button.isChecked():
+            self._insert_tag(tag_text)
+            return
+        state = self.tag_filter_states.get(tag_text, TagButton.FILTER_NONE)
+        state = {TagButton.FILTER_NONE: TagButton.FILTER_INCLUDE,
+                 TagButton.FILTER_INCLUDE: TagButton.FILTER_EXCLUDE}.get(state, TagButton.FILTER_NONE)
+        if state:
+            self.tag_filter_states[tag_text] = state
+        else:
+            self.tag_filter_states.pop(tag_text, None)
+        self.tag_buttons[tag_text].set_filter_state(state)
+        self._emit_tag_filter()
+
+    def _on_filter_toggled(self, checked):
+        self.filter_mode_button.setVisible(checked)
+        if not checked and self.tag_filter_states:
+            self.tag_filter_states = {}
+            for btn in self.tag_buttons.values():
+                btn.set_filter_state(TagButton.FILTER_NONE)
+            self._emit_tag_filter()
+
+    def _on_filter_mode_toggled(self, checked):
+        self.filter_mode_button.setText("任一" if checked else "全部")
+        if self.tag_filter_states:
+            self._emit_tag_filter()
+
+    def _emit_tag_filter(self):
+        include = [t for t, s in self.tag_filter_states.items() if s == TagButton.FILTER_INCLUDE]
+        exclude = [t for t, s in self.tag_filter_states.items() if s == TagButton.FILTER_EXCLUDE]
+        mode = "or" if self.filter_mode_button.isChecked() else "and"
+        self.tag_filter_changed.emit(include, exclude, mode)
+
     def _insert_tag(self, tag_text):
         current = self.input_edit.text()
         tag_str = f"#{tag_text}"
@@ -172,14 +311,24 @@ class MainWindow(QMainWindow):
         self.input_edit.setText(f"{current}{prefix}{tag_str} ")
         self.input_edit.setFocus()
 
-    def _on_item_clicked(self, item):
-        memo_id = item.data(Qt.ItemDataRole.UserRole)
+    def _on_item_clicked(self, index):
+        memo_id = index.data(MemoListModel.IdRole)
         self.memo_clicked.emit(memo_id)
 
-    def _on_item_double_clicked(self, item):
-        memo_id = item.data(Qt.ItemDataRole.UserRole)
+    def _on_item_double_clicked(self, index):
+        memo_id = index.data(MemoListModel.IdRole)
         self.memo_double_clicked.emit(memo_id)
 
+    def _on_export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "导出性能跟踪", tracing.default_export_path(),
+                                              "Chrome Trace (*.json)")
+        if path:
+            self.trace_export_requested.emit(path)
+
+    def show_tray_message(self, text):
+        if self.tray is not None:
+            self.tray.showMessage("MemoFlow", text)
+
     def _on_tray_activated(self, reason):
         if reason in (QSystemTrayIcon.ActivationReason.Trigger, QSystemTrayIcon.ActivationReason.DoubleClick):
             self.show_requested.emit()
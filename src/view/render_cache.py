@@ -0,0 +1,71 @@
+# src/view/render_cache.py
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+
+class RenderCache:
+    """按估算内存大小限制的 LRU 缓存，超出 max_bytes 时淘汰最久未用的条目。
+
+    每个条目可带一个 version（如缓存所依据的内容），取用时 version 不同视为未命中，
+    同一 key 重新放入时替换旧条目。
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def has(self, key, version=None):
+        """是否有可用的条目，不计入命中统计，也不改变淘汰顺序"""
+        entry = self._entries.get(key)
+        return entry is not None and entry[2] == version
+
+    def get(self, key, version=None):
+        entry = self._entries.get(key)
+        if entry is None or entry[2] != version:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, cost, version=None):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes_used -= old[1]
+        self._entries[key] = (value, cost, version)
+        self.bytes_used += cost
+        self._evict()
+
+    def set_max_bytes(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def _evict(self):
+        # 至少保留刚放入的一条，即使它本身已超出上限
+        while self.bytes_used > self.max_bytes and len(self._entries) > 1:
+            _, (_, cost, _) = self._entries.popitem(last=False)
+            self.bytes_used -= cost
+            self.evictions += 1
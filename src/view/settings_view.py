@@ -2,9 +2,8 @@
 # -*- coding: utf-8 -*-
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QCheckBox, QListWidget, QLineEdit, QPushButton,
-                             QSpinBox, QMessageBox, QGroupBox)
+                             QSpinBox, QMessageBox, QGroupBox, QComboBox)
 from PyQt6.QtCore import Qt, pyqtSignal
-from src.core.theme import AppTheme
 
 class SettingsView(QDialog):
     # Signals
@@ -14,6 +13,9 @@ class SettingsView(QDialog):
     ontop_toggled = pyqtSignal(bool)
     autohide_changed = pyqtSignal(int)
     preset_tags_changed = pyqtSignal(list)
+    theme_changed = pyqtSignal(str)
+
+    THEME_NAMES = [("dark", "深色"), ("light", "浅色")]
 
     def __init__(self, settings_model, autostart_enabled, parent=None):
         super().__init__(parent)
@@ -21,7 +23,6 @@ class SettingsView(QDialog):
         self.autostart_enabled = autostart_enabled
         self.setWindowTitle("设置 - MemoFlow")
         self.resize(400, 650)
-        self.setStyleSheet(f"background-color: {AppTheme.COLORS['bg_primary']}; color: {AppTheme.COLORS['text_primary']};")
         self._init_ui()
 
     def _init_ui(self):
@@ -31,57 +32,52 @@ class SettingsView(QDialog):
 
         # 1. General
         group_general = QGroupBox("常规设置")
-        group_general.setStyleSheet(self._get_group_style())
         gen_layout = QVBoxLayout(group_general)
         gen_layout.setSpacing(15)
 
         self.cb_autostart = QCheckBox("开机自动启动")
-        self.cb_autostart.setStyleSheet(self._get_checkbox_style())
         self.cb_autostart.setChecked(self.autostart_enabled)
         self.cb_autostart.stateChanged.connect(lambda s: self.autostart_toggled.emit(s == 2))
         gen_layout.addWidget(self.cb_autostart)
 
         self.cb_tray = QCheckBox("关闭窗口时最小化到托盘")
-        self.cb_tray.setStyleSheet(self._get_checkbox_style())
         self.cb_tray.setChecked(self.settings.get("close_to_tray", True))
         self.cb_tray.stateChanged.connect(lambda s: self.closetotray_toggled.emit(s == 2))
         gen_layout.addWidget(self.cb_tray)
+
+        theme_layout = QHBoxLayout()
+        theme_layout.addWidget(QLabel("外观主题:"))
+        self.combo_theme = QComboBox()
+        for key, label in self.THEME_NAMES:
+            self.combo_theme.addItem(label, key)
+        current = self.combo_theme.findData(self.settings.get("theme", "dark"))
+        self.combo_theme.setCurrentIndex(max(current, 0))
+        self.combo_theme.currentIndexChanged.connect(lambda i: self.theme_changed.emit(self.combo_theme.itemData(i)))
+        theme_layout.addWidget(self.combo_theme)
+        gen_layout.addLayout(theme_layout)
         layout.addWidget(group_general)
 
         # 2. Floating Window
         group_float = QGroupBox("悬浮窗管理")
-        group_float.setStyleSheet(self._get_group_style())
         float_layout = QVBoxLayout(group_float)
         float_layout.setSpacing(15)
 
         self.cb_show_float = QCheckBox("启用桌面悬浮窗")
-        self.cb_show_float.setStyleSheet(self._get_checkbox_style())
         self.cb_show_float.setChecked(self.settings.get("show_floating_window", True))
         self.cb_show_float.stateChanged.connect(lambda s: self.floating_toggled.emit(s == 2))
         float_layout.addWidget(self.cb_show_float)
 
         self.cb_ontop = QCheckBox("始终保持在顶部")
-        self.cb_ontop.setStyleSheet(self._get_checkbox_style())
         self.cb_ontop.setChecked(self.settings.get("always_on_top", True))
         self.cb_ontop.stateChanged.connect(lambda s: self.ontop_toggled.emit(s == 2))
         float_layout.addWidget(self.cb_ontop)
 
         time_layout = QHBoxLayout()
         float_lbl = QLabel("鼠标离开后自动淡出 (秒):")
-        float_lbl.setStyleSheet(f"color: {AppTheme.COLORS['text_primary']};")
         self.spin_delay = QSpinBox()
         self.spin_delay.setRange(1, 3600)
         self.spin_delay.setValue(self.settings.get("auto_hide_seconds", 3))
         self.spin_delay.setSuffix(" 秒")
-        self.spin_delay.setStyleSheet(f"""
-            QSpinBox {{
-                background-color: {AppTheme.COLORS['bg_secondary']};
-                border: 1px solid {AppTheme.COLORS['border']};
-                border-radius: 4px;
-                padding: 4px;
-                color: {AppTheme.COLORS['text_primary']};
-            }}
-        """)
         self.spin_delay.valueChanged.connect(self.autohide_changed.emit)
         time_layout.addWidget(float_lbl)
         time_layout.addWidget(self.spin_delay)
@@ -90,28 +86,26 @@ class SettingsView(QDialog):
 
         # 3. Tags
         group_tags = QGroupBox("预设标签管理")
-        group_tags.setStyleSheet(self._get_group_style())
         tag_layout = QVBoxLayout(group_tags)
 
         self.tag_list = QListWidget()
-        self.tag_list.setStyleSheet(f"QListWidget {{ background-color: {AppTheme.COLORS['bg_secondary']}; border: 1px solid {AppTheme.COLORS['border']}; border-radius: 4px; color: {AppTheme.COLORS['text_primary']}; }}")
         self.refresh_tag_list()
         tag_layout.addWidget(self.tag_list)
 
         input_layout = QHBoxLayout()
         self.tag_input = QLineEdit()
         self.tag_input.setPlaceholderText("输入新标签...")
-        self.tag_input.setStyleSheet(f"QLineEdit {{ background-color: {AppTheme.COLORS['bg_secondary']}; border: 1px solid {AppTheme.COLORS['border']}; border-radius: 4px; padding: 5px; color: {AppTheme.COLORS['text_primary']}; }}")
+        self.tag_input.setObjectName("TagInput")
         self.tag_input.returnPressed.connect(self.add_tag)
         input_layout.addWidget(self.tag_input)
 
         btn_add = QPushButton("添加")
-        btn_add.setStyleSheet(self._get_btn_style())
+        btn_add.setProperty("variant", "primary")
         btn_add.clicked.connect(self.add_tag)
         input_layout.addWidget(btn_add)
 
         btn_del = QPushButton("删除")
-        btn_del.setStyleSheet(self._get_btn_style(danger=True))
+        btn_del.setProperty("variant", "danger")
         btn_del.clicked.connect(self.del_tag)
         input_layout.addWidget(btn_del)
 
@@ -121,7 +115,7 @@ class SettingsView(QDialog):
 
         btn_close = QPushButton("关闭")
         btn_close.clicked.connect(self.accept)
-        btn_close.setStyleSheet(self._get_btn_style())
+        btn_close.setProperty("variant", "primary")
         layout.addWidget(btn_close)
 
     def refresh_tag_list(self):
@@ -132,7 +126,8 @@ class SettingsView(QDialog):
     def add_tag(self):
         tag = self.tag_input.text().strip()
         if not tag: return
-        tags = self.settings.get("preset_tags", [])
+        # 修改副本再提交，SettingsModel 通过比较新旧值判断是否变化
+        tags = list(self.settings.get("preset_tags", []))
         if tag not in tags:
             tags.append(tag)
             self.tag_input.clear()
@@ -142,7 +137,7 @@ class SettingsView(QDialog):
     def del_tag(self):
         row = self.tag_list.currentRow()
         if row >= 0:
-            tags = self.settings.get("preset_tags", [])
+            tags = list(self.settings.get("preset_tags", []))
             del tags[row]
             self.preset_tags_changed.emit(tags)
             self.refresh_tag_list()
@@ -151,30 +146,3 @@ class SettingsView(QDialog):
         self.cb_autostart.blockSignals(True)
         self.cb_autostart.setChecked(checked)
         self.cb_autostart.blockSignals(False)
-
-    def _get_group_style(self):
-        return f"""
-            QGroupBox {{
-                border: 1px solid {AppTheme.COLORS['border']};
-                border-radius: 6px;
-                margin-top: 12px;
-                padding-top: 10px;
-                color: {AppTheme.COLORS['text_primary']};
-                font-weight: bold;
-            }}
-            QGroupBox::title {{ subcontrol-origin: margin; left: 10px; padding: 0 3px; }}
-        """
-
-    def _get_checkbox_style(self):
-        return f"""
-            QCheckBox {{ color: {AppTheme.COLORS['text_primary']}; spacing: 8px; }}
-            QCheckBox::indicator {{ width: 18px; height: 18px; border: 1px solid {AppTheme.COLORS['border']}; border-radius: 4px; background-color: {AppTheme.COLORS['bg_secondary']}; }}
-            QCheckBox::indicator:checked {{ background-color: {AppTheme.COLORS['accent']}; border: 1px solid {AppTheme.COLORS['accent']}; }}
-        """
-
-    def _get_btn_style(self, danger=False):
-        bg = "#e74c3c" if danger else AppTheme.COLORS['accent']
-        return f"""
-            QPushButton {{ background-color: {bg}; color: white; border-radius: 4px; padding: 6px 12px; border: none; }}
-            QPushButton:hover {{ opacity: 0.8; }}
-        """
@@ -0,0 +1,143 @@
+# src/view/widgets/memo_delegate.py
+# -*- coding: utf-8 -*-
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt6.QtCore import Qt, QRect, QRectF, QSize
+from PyQt6.QtGui import QColor, QFont, QFontMetrics
+from src.core.theme import AppTheme
+from src.view.widgets.memo_list_model import MemoListModel
+
+def _font(pixel_size, weight=QFont.Weight.Normal):
+    font = QFont()
+    font.setPixelSize(pixel_size)
+    font.setWeight(weight)
+    return font
+
+
+def _color(value):
+    """QColor 不认识 CSS 的 rgba(r, g, b, a)，这里转换一下"""
+    if value.startswith("rgba("):
+        r, g, b, a = (part.strip() for part in value[5:-1].split(","))
+        return QColor(int(r), int(g), int(b), round(float(a) * 255))
+    return QColor(value)
+
+
+class MemoItemDelegate(QStyledItemDelegate):
+    """直接绘制备忘行：标题、时间、两行预览和标签，不为每一行创建控件"""
+    ROW_HEIGHT = 80
+    MARGIN = 8
+    SPACING = 4
+    PREVIEW_HEIGHT = 36
+    # 省略号文本和文字宽度缓存的条目上限，超出后整体清空
+    TEXT_CACHE_SIZE = 4096
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = _font(14, QFont.Weight.DemiBold)
+        self.time_font = _font(12)
+        self.preview_font = _font(12)
+        self.tag_font = _font(11)
+        self.title_fm = QFontMetrics(self.title_font)
+        self.time_fm = QFontMetrics(self.time_font)
+        self.preview_fm = QFontMetrics(self.preview_font)
+        self.tag_fm = QFontMetrics(self.tag_font)
+        # 各字体共用一份度量；(文本, 字体, 宽度) -> 省略后的文本，(文本, 字体) -> 宽度
+        self._metrics = {"title": self.title_fm, "time": self.time_fm,
+                         "preview": self.preview_fm, "tag": self.tag_fm}
+        self._text_cache = {}
+        self._row_width = None
+        self.refresh_colors()
+
+    def refresh_colors(self):
+        """从当前主题重新取色，切换主题后调用"""
+        c = AppTheme.COLORS
+        self.title_color = QColor(c['text_primary'])
+        self.time_color = QColor(c['text_time'])
+        self.preview_color = QColor(c['text_secondary'])
+        self.tag_color = QColor(c['accent'])
+        self.tag_bg = _color(c['tag_bg'])
+        self.selected_bg = QColor(c['bg_secondary'])
+        self.hover_bg = QColor(c['bg_primary'])
+
+    def sizeHint(self, option, index):
+        return QSize(0, self.ROW_HEIGHT)
+
+    def _elided(self, font, text, width):
+        key = (text, font, width)
+        result = self._text_cache.get(key)
+        if result is None:
+            if len(self._text_cache) >= self.TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            result = self._text_cache[key] = self._metrics[font].elidedText(text, Qt.TextElideMode.ElideRight, width)
+        return result
+
+    def _advance(self, font, text):
+        key = (text, font)
+        result = self._text_cache.get(key)
+        if result is None:
+            if len(self._text_cache) >= self.TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            result = self._text_cache[key] = self._metrics[font].horizontalAdvance(text)
+        return result
+
+    def paint(self, painter, option, index):
+        memo = index.data(MemoListModel.MemoRole)
+        if memo is None:
+            return
+        # 所有行同宽：宽度真正变化时旧宽度下的省略结果不会再用到，一次性丢弃
+        if option.rect.width() != self._row_width:
+            self._row_width = option.rect.width()
+            self._text_cache.clear()
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, self.selected_bg)
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            painter.fillRect(option.rect, self.hover_bg)
+
+        rect = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+        # 头部：标题在左，时间靠右
+        time_w = self._advance("time", memo.time_str)
+        header_h = self.title_fm.height()
+        painter.setFont(self.time_font)
+        painter.setPen(self.time_color)
+        painter.drawText(QRect(rect.right() - time_w, rect.top(), time_w, header_h),
+                         Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, memo.time_str)
+
+        title_w = max(0, rect.width() - time_w - self.SPACING)
+        title = self._elided("title", memo.title or "无标题", title_w)
+        painter.setFont(self.title_font)
+        painter.setPen(self.title_color)
+        painter.drawText(QRect(rect.left(), rect.top(), title_w, header_h),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+
+        # 预览：最多两行，有标签时只留一行
+        top = rect.top() + header_h + self.SPACING
+        lines = 1 if memo.tags else 2
+        preview_h = min(self.PREVIEW_HEIGHT, self.preview_fm.lineSpacing() * lines)
+        preview = self._elided("preview", memo.preview or "无内容", rect.width() * lines)
+        painter.setFont(self.preview_font)
+        painter.setPen(self.preview_color)
+        painter.drawText(QRect(rect.left(), top, rect.width(), preview_h),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap, preview)
+
+        # 标签：放不下的不画
+        if memo.tags:
+            chip_h = self.tag_fm.height() + 4
+            x = rect.left()
+            y = option.rect.bottom() - self.MARGIN // 2 - chip_h
+            painter.setFont(self.tag_font)
+            for tag in memo.tags:
+                text = f"#{tag}"
+                chip_w = self._advance("tag", text) + 16
+                if x + chip_w > rect.right():
+                    break
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(self.tag_bg)
+                painter.drawRoundedRect(QRectF(x, y, chip_w, chip_h), chip_h / 2, chip_h / 2)
+                painter.setPen(self.tag_color)
+                painter.drawText(QRect(x, y, chip_w, chip_h), Qt.AlignmentFlag.AlignCenter, text)
+                x += chip_w + self.SPACING
+
+        painter.restore()
@@ -0,0 +1,115 @@
+# src/view/widgets/memo_list_model.py
+# -*- coding: utf-8 -*-
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class MemoListModel(QAbstractListModel):
+    """主列表的数据模型：只保存 Memo 引用，视图按需取可见行的数据"""
+    IdRole = Qt.ItemDataRole.UserRole
+    MemoRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._memos = []
+        # id -> 行号，行号变化（插入、删除、移动）后作废，下次查找时整表重建一次
+        self._rows = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._memos)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._memos):
+            return None
+        memo = self._memos[index.row()]
+        if role == self.MemoRole:
+            return memo
+        if role == self.IdRole:
+            return memo.id
+        if role == Qt.ItemDataRole.DisplayRole:
+            return memo.title
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return memo.preview
+        return None
+
+    def set_memos(self, memos):
+        self.beginResetModel()
+        self._memos = list(memos)
+        self._rows = None
+        self.endResetModel()
+
+    def memo_at(self, row):
+        return self._memos[row] if 0 <= row < len(self._memos) else None
+
+    def row_of(self, memo_id, hint=None):
+        """备忘所在的行，不存在时返回 -1；hint 是调用方估计的行号（如 DataStore.index_of），核对相符时直接采用"""
+        if hint is not None and 0 <= hint < len(self._memos) and self._memos[hint].id == memo_id:
+            return hint
+        if self._rows is None:
+            self._rows = {memo.id: row for row, memo in enumerate(self._memos)}
+        return self._rows.get(memo_id, -1)
+
+    # --- 增量修改：只通知变化的行，视图保留滚动位置和选中项 ---
+    def insert_memo(self, row, memo):
+        row = max(0, min(row, len(self._memos)))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._memos.insert(row, memo)
+        self._rows = None
+        self.endInsertRows()
+        return row
+
+    def update_memo(self, memo, row=None):
+        """刷新一行；给出 row 且与当前位置不同时先移动过去"""
+        old_row = self.row_of(memo.id, row)
+        if old_row < 0:
+            return -1
+        if row is not None:
+            row = max(0, min(row, len(self._memos) - 1))
+            self.move_row(old_row, row)
+        else:
+            row = old_row
+        self._memos[row] = memo
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        return row
+
+    def remove_memo(self, memo_id, hint=None):
+        row = self.row_of(memo_id, hint)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._memos[row]
+            self._rows = None
+            self.endRemoveRows()
+        return row
+
+    def remove_memos(self, memo_ids):
+        """一次删除多行：先用同一张索引查出全部行号，再从后往前删，前面的行号不受影响"""
+        if self._rows is None:
+            self._rows = {memo.id: row for row, memo in enumerate(self._memos)}
+        rows = sorted({self._rows[memo_id] for memo_id in memo_ids if memo_id in self._rows}, reverse=True)
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._memos[row]
+            self.endRemoveRows()
+        if rows:
+            self._rows = None
+        return len(rows)
+
+    def move_row(self, src, dst):
+        if src == dst:
+            return
+        # beginMoveRows 的目标位置按移动前的行号计算
+        self.beginMoveRows(QModelIndex(), src, src, QModelIndex(), dst + 1 if dst > src else dst)
+        self._memos.insert(dst, self._memos.pop(src))
+        self._rows = None
+        self.endMoveRows()
+
+    def append_memos(self, memos):
+        if not memos:
+            return
+        start = len(self._memos)
+        self.beginInsertRows(QModelIndex(), start, start + len(memos) - 1)
+        self._memos.extend(memos)
+        if self._rows is not None:
+            self._rows.update((memo.id, row) for row, memo in enumerate(memos, start))
+        self.endInsertRows()
@@ -2,29 +2,35 @@
 # -*- coding: utf-8 -*-
 from PyQt6.QtWidgets import QPushButton
 from PyQt6.QtCore import pyqtSignal, Qt
-from src.core.theme import AppTheme
 
 class TagButton(QPushButton):
     """可点击的标签按钮"""
     clicked_tag = pyqtSignal(str) # 发射标签文本
 
+    # 筛选模式下的状态：未选 / 包含 / 排除
+    FILTER_NONE = ""
+    FILTER_INCLUDE = "include"
+    FILTER_EXCLUDE = "exclude"
+
     def __init__(self, text, parent=None):
         super().__init__(f"#{text}", parent)
         self.tag_text = text
+        self.filter_state = self.FILTER_NONE
         self.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {AppTheme.COLORS['tag_bg']};
-                color: {AppTheme.COLORS['accent']};
-                border: 1px solid {AppTheme.COLORS['accent']};
-                border-radius: 12px;
-                padding: 2px 8px;
-                font-size: 11px;
-                margin-right: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {AppTheme.COLORS['accent']};
-                color: white;
-            }}
-        """)
+        self.setProperty("filterState", self.filter_state)
+        # 外观由应用样式表中 variant="tag" 和 filterState 的规则决定
+        self.setProperty("variant", "tag")
         self.clicked.connect(lambda: self.clicked_tag.emit(self.tag_text))
+
+    def set_tag(self, text):
+        """复用按钮显示另一个标签"""
+        self.tag_text = text
+        self.setText(f"#{text}")
+
+    def set_filter_state(self, state):
+        if state == self.filter_state: return
+        self.filter_state = state
+        self.setProperty("filterState", state)
+        # 动态属性变化后需要重新应用样式
+        self.style().unpolish(self)
+        self.style().polish(self)
@@ -0,0 +1,48 @@
+# src/view/widgets/widget_pool.py
+# -*- coding: utf-8 -*-
+
+class WidgetPool:
+    """可复用的一组同类控件：第 i 个控件创建时放到固定位置，之后只重新绑定内容。
+
+    数量变少时多余的控件隐藏而不是删除，再次变多时先用隐藏的，
+    反复刷新不会再创建新的 Qt 对象，也不会往延迟删除队列里塞东西。
+    """
+
+    def __init__(self, factory, place, reset=None, max_idle=None):
+        # factory() 创建控件并连接好信号；place(widget, index) 把它加入布局；
+        # reset(widget) 在控件被收回时清掉它绑定的状态；max_idle 为保留的隐藏控件上限，None 表示不限
+        self._factory = factory
+        self._place = place
+        self._reset = reset
+        self.max_idle = max_idle
+        self._widgets = []
+        self._active = 0
+
+    def __len__(self):
+        return self._active
+
+    def __iter__(self):
+        return iter(self._widgets[:self._active])
+
+    def idle_count(self):
+        return len(self._widgets) - self._active
+
+    def acquire(self, count):
+        """返回前 count 个控件（不足时创建），并隐藏其余的"""
+        while len(self._widgets) < count:
+            widget = self._factory()
+            self._place(widget, len(self._widgets))
+            self._widgets.append(widget)
+        for widget in self._widgets[count:self._active]:
+            widget.hide()
+            if self._reset is not None:
+                self._reset(widget)
+        for widget in self._widgets[self._active:count]:
+            widget.show()
+        self._active = count
+        # 只从末尾删除，留下的控件位置不变
+        if self.max_idle is not None and len(self._widgets) > count + self.max_idle:
+            for widget in self._widgets[count + self.max_idle:]:
+                widget.deleteLater()
+            del self._widgets[count + self.max_idle:]
+        return self._widgets[:count]
@@ -0,0 +1,19 @@
+# tests/conftest.py
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+
+# 在导入 src 之前设置：无显示器运行 Qt，默认数据目录指向临时目录，不碰仓库里的数据文件
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("MEMOFLOW_DATA_DIR", tempfile.mkdtemp(prefix="memoflow-test-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    # 整个测试进程只能有一个 QApplication，需要 Qt 的测试都通过这里取得
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
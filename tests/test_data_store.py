@@ -0,0 +1,43 @@
+# tests/test_data_store.py
+# -*- coding: utf-8 -*-
+import time
+from src.model.data_store import DataStore
+
+
+def test_add_to_empty_store_then_search(tmp_path):
+    store = DataStore(str(tmp_path / "memos.json"), save_window_ms=0)
+    # 第一次搜索建立了空的索引；NgramIndex 为空时 len() == 0，之后的新增仍要进索引
+    assert list(store.search("报告")) == []
+    memo = store.add_memo("周五提交季度报告 #工作")
+    assert [m.id for m in store.search("报告")] == [memo.id]
+    store.update_memo(memo.id, "改名", "改成月度总结", ["工作"])
+    assert list(store.search("报告")) == []
+    assert [m.id for m in store.search("月度")] == [memo.id]
+    store.delete_memo(memo.id)
+    assert list(store.search("月度")) == []
+    store.close()
+
+
+def test_two_instances_do_not_overwrite_each_other(tmp_path):
+    path = str(tmp_path / "memos.json")
+    a = DataStore(path, save_window_ms=0)
+    b = DataStore(path, save_window_ms=0)
+    memo_a = a.add_memo("实例 A 的备忘")
+    a.flush()
+    # id 取毫秒时间戳，两个实例在同一毫秒新增会得到相同的 id
+    time.sleep(0.002)
+    # B 还没有读入 A 的修改就写文件：写入前应先在文件锁内合并 A 写出的内容
+    memo_b = b.add_memo("实例 B 的备忘")
+    b.flush()
+    assert b.has_external_change()
+    assert [m.id for m in b.reload_external()[0]] == [memo_a.id]
+    assert not b.has_external_change()
+    assert {m.id for m in DataStore(path).get_memos()} == {memo_a.id, memo_b.id}
+
+    # A 读入 B 的文件时只多出 B 的备忘，自己的不会被当成已删除
+    added, updated, removed = a.reload_external()
+    assert [m.id for m in added] == [memo_b.id]
+    assert updated == [] and removed == []
+    assert {m.id for m in a.get_memos()} == {memo_a.id, memo_b.id}
+    a.close()
+    b.close()
@@ -0,0 +1,32 @@
+# tests/test_journal_store.py
+# -*- coding: utf-8 -*-
+from src.model import journal_store
+from src.model.journal_store import JournalDataStore
+
+
+def test_failed_compaction_backs_off(tmp_path, monkeypatch):
+    attempts = []
+
+    def failing_write(path, data):
+        attempts.append(path)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(journal_store, "atomic_write", failing_write)
+    store = JournalDataStore(str(tmp_path / "memos.json"), max_records=2)
+    for i in range(20):
+        store.add_memo(f"memo {i}")
+        if store._compact_thread:
+            store._compact_thread.join()
+    assert len(attempts) == 1
+    assert (tmp_path / "memos.journal.compacting").exists()
+    store.close()
+
+
+def test_compaction_keeps_all_memos(tmp_path):
+    path = str(tmp_path / "memos.json")
+    store = JournalDataStore(path, max_records=3)
+    ids = [store.add_memo(f"memo {i}").id for i in range(10)]
+    store.close()
+    reopened = JournalDataStore(path)
+    assert sorted(m.id for m in reopened.get_memos()) == sorted(ids)
+    reopened.close()
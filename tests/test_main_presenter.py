@@ -0,0 +1,35 @@
+# tests/test_main_presenter.py
+# -*- coding: utf-8 -*-
+import pytest
+
+
+@pytest.fixture
+def presenter(qapp, tmp_path, monkeypatch):
+    from src.model import data_store
+    from src.presenter import main_presenter
+    path = str(tmp_path / "memos.json")
+    monkeypatch.setattr(main_presenter, "create_data_store",
+                        lambda settings: data_store.DataStore(path, save_window_ms=0))
+    presenter = main_presenter.MainPresenter()
+    yield presenter
+    presenter.data_store.close()
+    presenter.main_window.deleteLater()
+
+
+def test_tag_bar_follows_tags_in_use(presenter):
+    window = presenter.main_window
+    presets = list(presenter.settings_model.get("preset_tags", []))
+    presenter._refresh_tag_bar()
+    assert list(window.tag_buttons) == presets
+
+    presenter.on_memo_added("第一条 #读书")
+    presenter.on_memo_added("第二条 #读书 #旅行")
+    assert list(window.tag_buttons) == presets + ["读书", "旅行"]
+    assert window.tag_buttons["读书"].toolTip() == "2 条备忘"
+
+    memo = presenter.data_store.get_memos()[0]
+    presenter.current_edit_id = memo.id
+    presenter._ensure_editor()
+    presenter.on_editor_delete()
+    assert list(window.tag_buttons) == presets + ["读书"]
+    assert window.tag_buttons["读书"].toolTip() == "1 条备忘"
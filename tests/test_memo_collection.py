@@ -0,0 +1,42 @@
+# tests/test_memo_collection.py
+# -*- coding: utf-8 -*-
+from benchmarks.corpus import generate_memos
+from src.model.memo_collection import MemoCollection, sort_key
+from src.model.memo_model import Memo
+
+
+def test_extend_merges_shards_in_order():
+    memos = [Memo.from_dict(item) for item in generate_memos(3000)]
+    shards = [memos[i:i + 500] for i in range(0, len(memos), 500)]
+    collection = MemoCollection(shards[0])
+    for shard in shards[1:]:
+        collection.extend(shard)
+    assert [m.id for m in collection] == [m.id for m in memos]
+    assert all(collection.index_of(m.id) == i for i, m in enumerate(memos))
+    assert collection[1234] is memos[1234]
+
+
+def test_extend_replaces_existing_ids_and_keeps_order():
+    memos = [Memo.from_dict(item) for item in generate_memos(100)]
+    collection = MemoCollection(memos[:60])
+    collection.remove(memos[10].id)
+    replacement = Memo.from_dict(dict(memos[5].to_dict(), content="替换后的正文"))
+    collection.extend(memos[60:] + [replacement])
+    expected = [m.id for m in memos if m.id != memos[10].id]
+    assert [m.id for m in collection] == expected
+    assert collection.get(memos[5].id).content == "替换后的正文"
+    assert len(collection) == 99
+
+
+def test_page_after_survives_cursor_removal_and_ties():
+    memos = [Memo.from_dict(item) for item in generate_memos(300)]
+    # 同一时刻创建的多条按 id 排序，游标仍能唯一定位
+    twins = [Memo(10 ** 15 + i, "同时", "同时", [], memos[150].created_at, "00:00") for i in range(3)]
+    collection = MemoCollection(memos + twins)
+    order = list(collection)
+    first = collection.page_after(None, 152)
+    assert first == order[:152]
+    collection.remove(first[-1].id)
+    collection.remove(order[200].id)
+    rest = collection.page_after(sort_key(first[-1]), 1000)
+    assert rest == [m for m in order[152:] if m is not order[200]]
@@ -0,0 +1,49 @@
+# tests/test_memo_list_model.py
+# -*- coding: utf-8 -*-
+import pytest
+from src.model.memo_model import Memo
+from src.view.widgets.memo_list_model import MemoListModel
+
+
+def make(memo_id):
+    return Memo(memo_id, f"t{memo_id}", f"c{memo_id}", [], "2026-01-01T00:00:00", "00:00")
+
+
+@pytest.fixture
+def model(qapp):
+    model = MemoListModel()
+    model.set_memos([make(i) for i in range(10)])
+    return model
+
+
+def ids(model):
+    return [model.memo_at(row).id for row in range(model.rowCount())]
+
+
+def test_row_of_tracks_structural_changes(model):
+    assert model.row_of(7) == 7
+    model.insert_memo(0, make(100))
+    assert model.row_of(7) == 8
+    assert model.row_of(100) == 0
+    model.remove_memo(3)
+    assert model.row_of(7) == 7
+    model.append_memos([make(200), make(201)])
+    assert model.row_of(201) == ids(model).index(201)
+    model.update_memo(make(0), 5)
+    assert ids(model)[5] == 0
+    assert all(model.row_of(memo_id) == row for row, memo_id in enumerate(ids(model)))
+    assert model.row_of(12345) == -1
+
+
+def test_wrong_hint_falls_back_to_lookup(model):
+    assert model.row_of(4, hint=4) == 4
+    assert model.row_of(4, hint=9) == 4
+    assert model.row_of(4, hint=99) == 4
+    assert model.remove_memo(6, hint=0) == 6
+    assert 6 not in ids(model)
+
+
+def test_remove_memos_in_one_pass(model):
+    assert model.remove_memos([1, 8, 5, 42]) == 3
+    assert ids(model) == [0, 2, 3, 4, 6, 7, 9]
+    assert model.row_of(9) == 6
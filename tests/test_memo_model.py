@@ -0,0 +1,20 @@
+# tests/test_memo_model.py
+# -*- coding: utf-8 -*-
+from src.model import memo_model
+from src.model.memo_model import Memo, intern_tags
+
+
+def test_same_tags_share_one_tuple():
+    a = Memo(1, "a", "a", ["工作", "重要"], "2026-01-01T00:00:00", "00:00")
+    b = Memo(2, "b", "b", ("工作", "重要"), "2026-01-01T00:00:00", "00:00")
+    assert a.tags is b.tags
+    assert a.to_dict()["tags"] == ["工作", "重要"]
+
+
+def test_tag_tuple_table_is_bounded(monkeypatch):
+    monkeypatch.setattr(memo_model, "_TAG_TUPLES", {})
+    monkeypatch.setattr(memo_model, "MAX_TAG_TUPLES", 10)
+    for i in range(100):
+        assert intern_tags([f"tag{i}"]) == (f"tag{i}",)
+    assert len(memo_model._TAG_TUPLES) == 10
+    assert intern_tags(["tag3"]) is intern_tags(["tag3"])
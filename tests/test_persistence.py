@@ -0,0 +1,43 @@
+# tests/test_persistence.py
+# -*- coding: utf-8 -*-
+import threading
+from src.model.persistence import WriteBehindWriter
+
+
+class FlakyWrite:
+    """前 failures 次写入抛出 OSError，之后成功"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+        self.succeeded = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError("transient")
+        self.succeeded.set()
+        return 10
+
+
+def test_failed_write_is_retried():
+    write = FlakyWrite(failures=2)
+    writer = WriteBehindWriter(write, window_ms=10)
+    writer.mark_dirty()
+    assert write.succeeded.wait(5)
+    writer.flush()
+    stats = writer.stats()
+    assert stats["writes_failed"] == 2
+    assert stats["writes_issued"] == 1
+    assert stats["bytes_written"] == 10
+    writer.close()
+
+
+def test_flush_and_close_return_when_writes_keep_failing():
+    write = FlakyWrite(failures=10 ** 6)
+    writer = WriteBehindWriter(write, window_ms=10)
+    writer.mark_dirty()
+    writer.flush()
+    writer.close()
+    assert writer.stats()["writes_issued"] == 0
+    assert writer.stats()["writes_failed"] >= 1
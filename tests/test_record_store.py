@@ -0,0 +1,80 @@
+# tests/test_record_store.py
+# -*- coding: utf-8 -*-
+import json
+from benchmarks.corpus import generate_memos
+from src.model.memo_model import LazyMemo
+from src.model.record_store import RecordDataStore
+
+
+def _open(tmp_path, count=200):
+    json_path = tmp_path / "memos.json"
+    json_path.write_text(json.dumps(generate_memos(count), ensure_ascii=False), encoding="utf-8")
+    return RecordDataStore(str(json_path), save_window_ms=0)
+
+
+def test_search_does_not_keep_content_in_memory(tmp_path):
+    store = _open(tmp_path)
+    assert list(store.search("评审"))
+    memos = list(store.get_memos())
+    assert all(isinstance(m, LazyMemo) for m in memos)
+    assert not any(m.is_loaded for m in memos)
+    store.close()
+
+
+def test_update_releases_content_and_survives_reopen(tmp_path):
+    store = _open(tmp_path)
+    memo = store.get_memos()[3]
+    store.update_memo(memo.id, "新标题", "新的正文 **内容**", ["工作"])
+    assert not memo.is_loaded
+    assert memo.content == "新的正文 **内容**"
+    assert [m.id for m in store.search("新的正文")] == [memo.id]
+    store.close()
+    reopened = RecordDataStore(str(tmp_path / "memos.json"))
+    assert reopened.get_memo_by_id(memo.id).content == "新的正文 **内容**"
+    reopened.close()
+
+
+def test_content_is_read_lazily_and_cached_within_budget(tmp_path, monkeypatch):
+    originals = {item["id"]: item["content"] for item in generate_memos(200)}
+    store = _open(tmp_path)
+    assert store._mmap is None and not store._content_cache
+    memo = store.get_memos()[0]
+    assert memo.preview == originals[memo.id][:len(memo.preview)]
+    assert store._mmap is None
+
+    assert memo.content == originals[memo.id]
+    assert not memo.is_loaded and memo.id in store._content_cache
+    # 再次访问命中缓存，不再读映射
+    remaps = []
+    monkeypatch.setattr(store, "_remap", lambda: remaps.append(1))
+    with store._lock:
+        mapped, store._mmap = store._mmap, None
+    assert memo.content == originals[memo.id]
+    assert remaps == []
+    with store._lock:
+        store._mmap = mapped
+    monkeypatch.undo()
+
+    monkeypatch.setattr(RecordDataStore, "CONTENT_CACHE_BYTES", 2000)
+    assert all(m.content == originals[m.id] for m in store.get_memos())
+    assert 0 < store._content_cache_bytes <= 2000
+    assert store._content_cache_bytes == sum(size for _, size in store._content_cache.values())
+    store.close()
+
+
+def test_cached_content_is_invalidated_on_update_and_delete(tmp_path):
+    store = _open(tmp_path)
+    first, second = store.get_memos()[0], store.get_memos()[1]
+    assert first.content and second.content
+    store.update_memo(first.id, first.title, "改过的正文", list(first.tags))
+    assert first.content == "改过的正文"
+    store.delete_memo(second.id)
+    assert second.id not in store._content_cache
+    store.close()
+
+    reopened = RecordDataStore(str(tmp_path / "memos.json"))
+    assert reopened.get_memo_by_id(first.id).content == "改过的正文"
+    assert reopened.get_memo_by_id(second.id) is None
+    originals = {item["id"]: item["content"] for item in generate_memos(200)}
+    assert all(m.content == originals[m.id] for m in reopened.get_memos() if m.id != first.id)
+    reopened.close()
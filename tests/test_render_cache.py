@@ -0,0 +1,64 @@
+# tests/test_render_cache.py
+# -*- coding: utf-8 -*-
+import pytest
+from src.view.render_cache import RenderCache
+
+
+def test_evicts_least_recently_used_within_byte_budget():
+    cache = RenderCache(300)
+    for key in "abc":
+        cache.put(key, key.upper(), 100)
+    assert cache.get("a") == "A"
+    cache.put("d", "D", 100)
+    # b 最久未用，先被淘汰；读取过的 a 保留
+    assert "b" not in cache and list(cache._entries) == ["c", "a", "d"]
+    cache.put("e", "E", 150)
+    assert list(cache._entries) == ["d", "e"]
+    assert cache.bytes_used == 250
+    assert cache.evictions == 3
+
+
+def test_oversized_entry_is_kept_alone_and_budget_shrinks():
+    cache = RenderCache(100)
+    cache.put("a", 1, 50)
+    cache.put("big", 2, 500)
+    assert list(cache._entries) == ["big"] and cache.bytes_used == 500
+    cache.put("a", 1, 50)
+    cache.put("b", 2, 40)
+    cache.set_max_bytes(60)
+    assert list(cache._entries) == ["b"] and cache.bytes_used == 40
+
+
+def test_changed_version_misses_and_replaces_entry():
+    cache = RenderCache(1000)
+    cache.put(1, "旧文档", 100, "旧内容")
+    assert cache.get(1, "旧内容") == "旧文档"
+    assert cache.get(1, "新内容") is None
+    assert not cache.has(1, "新内容")
+    cache.put(1, "新文档", 300, "新内容")
+    assert len(cache) == 1 and cache.bytes_used == 300
+    assert cache.get(1, "新内容") == "新文档"
+    assert cache.get(2) is None
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.fixture
+def floating(qapp):
+    from src.model.settings_model import SettingsModel
+    from src.view.floating_view import FloatingView
+    view = FloatingView(SettingsModel())
+    yield view
+    view.deleteLater()
+
+
+def test_floating_view_caches_documents_per_memo(floating):
+    cache = floating.render_cache
+    document, height = floating.render_document(1, "# 标题\n\n正文")
+    assert floating.render_document(1, "# 标题\n\n正文") == (document, height)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    edited, _ = floating.render_document(1, "# 标题\n\n改过的正文")
+    assert edited is not document
+    assert len(cache) == 1 and cache.misses == 2
+    assert edited.toPlainText().endswith("改过的正文")
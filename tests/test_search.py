@@ -0,0 +1,114 @@
+# tests/test_search.py
+# -*- coding: utf-8 -*-
+import json
+import threading
+from benchmarks.corpus import generate_memos
+from src.model import data_store
+from src.model.data_store import DataStore
+from src.model.memo_model import Memo
+from src.model.search_index import NgramIndex
+from src.model.tag_index import TagFilter
+from src.presenter.search_worker import SearchSignals, SearchTask
+
+
+def _brute_similar(index, term, min_ratio=0.4):
+    grams = {term[i:i + 2] for i in range(len(term) - 1)}
+    result = {}
+    for memo_id, text in index._texts.items():
+        ratio = sum(1 for g in grams if g in text) / len(grams)
+        if ratio >= min_ratio:
+            result[memo_id] = ratio
+    return result
+
+
+def test_similar_matches_full_scan():
+    index = NgramIndex()
+    for item in generate_memos(2000):
+        index.add(Memo.from_dict(item))
+    for term in ("reveiw", "desgin", "会议记彔", "relaese notes"):
+        assert index.similar(term) == _brute_similar(index, term)
+
+
+def test_similar_limit_keeps_best_ratios():
+    index = NgramIndex()
+    for item in generate_memos(2000):
+        index.add(Memo.from_dict(item))
+    full = index.similar("desgin")
+    top = index.similar("desgin", limit=10)
+    assert len(top) == 10
+    assert min(top.values()) >= sorted(full.values(), reverse=True)[9]
+
+
+def test_ranked_tag_filter_without_text_is_not_truncated(tmp_path):
+    store = DataStore(str(tmp_path / "memos.json"), save_window_ms=0)
+    for i in range(30):
+        store.add_memo(f"备忘 {i} #工作")
+    result = store.search_ranked("", limit=5, tag_filter=TagFilter(["工作"], [], "and"))
+    assert len(result) == 30
+    store.close()
+
+
+def _store_with_corpus(tmp_path, count):
+    path = tmp_path / "memos.json"
+    path.write_text(json.dumps(generate_memos(count), ensure_ascii=False), encoding="utf-8")
+    return DataStore(str(path), save_window_ms=0)
+
+
+def test_iter_search_pages_stay_stable_across_mutations(tmp_path):
+    store = _store_with_corpus(tmp_path, 3000)
+    memos = list(store.get_memos())
+    blocks = store.iter_search("", TagFilter([], ["不存在的标签"], "and"), block_size=500)
+    seen = [m.id for m in next(blocks)]
+    # 在两段之间删掉已经返回的行、删掉上一段的最后一条（游标）、删掉一条还没返回的行，再新增一条
+    store.delete_memo(memos[10].id)
+    store.delete_memo(memos[499].id)
+    store.delete_memo(memos[1200].id)
+    store.add_memo("新增的备忘")
+    for hits in blocks:
+        seen.extend(m.id for m in hits)
+    expected = [m.id for m in memos if m.id != memos[1200].id]
+    assert seen == expected
+    store.close()
+
+
+def test_search_index_is_built_outside_the_store_lock(tmp_path, monkeypatch):
+    store = _store_with_corpus(tmp_path, 500)
+    memos = list(store.get_memos())
+    done = []
+
+    def mutate():
+        store.update_memo(memos[0].id, "改过的标题", "唯一的词 zzqx", [])
+        store.delete_memo(memos[1].id)
+        store.add_memo("建索引期间新增 zzqy")
+        done.append(True)
+
+    class BlockingIndex(NgramIndex):
+        def add(self, memo):
+            if not done:
+                # 建立索引时另一个线程（代表 GUI 线程）修改数据，不应等到索引建完
+                worker = threading.Thread(target=mutate)
+                worker.start()
+                worker.join(5)
+                assert done
+            super().add(memo)
+
+    monkeypatch.setattr(data_store, "NgramIndex", BlockingIndex)
+    assert [m.title for m in store.search("zzqx")] == ["改过的标题"]
+    assert len(store.search("zzqy")) == 1
+    assert store._search_index.text_of(memos[1].id) is None
+    assert store._index_changes is None
+    store.close()
+
+
+def test_search_task_reports_errors():
+    def blocks():
+        yield []
+        raise RuntimeError("索引损坏")
+
+    signals = SearchSignals()
+    failures, pages = [], []
+    signals.search_failed.connect(lambda generation, message: failures.append((generation, message)))
+    signals.page_ready.connect(lambda *args: pages.append(args))
+    SearchTask(7, blocks, lambda generation: True, signals).run()
+    assert failures == [(7, "RuntimeError: 索引损坏")]
+    assert pages == []
@@ -0,0 +1,30 @@
+# tests/test_settings_model.py
+# -*- coding: utf-8 -*-
+import json
+from src.model.settings_model import SettingsModel
+
+
+def test_batch_saves_once_and_notifies_once_per_changed_key(tmp_path):
+    settings = SettingsModel(save_window_ms=0)
+    settings.file_path = str(tmp_path / "settings.json")
+    settings.config["theme"] = "light"
+    saves, writes, changes = [], [], []
+    original_save, original_write = settings._save, settings._write
+    settings._save = lambda: (saves.append(1), original_save())
+    settings._write = lambda: (writes.append(1), original_write())[1]
+    settings.setting_changed.connect(lambda key, value: changes.append((key, value)))
+
+    with settings.batch():
+        for seconds in range(1, 11):
+            settings.set("auto_hide_seconds", seconds)
+        settings.set("always_on_top", False)
+        # 值没有变化的 key 不通知
+        settings.set("theme", "light")
+        assert changes == [] and saves == []
+    settings.flush()
+
+    assert saves == [1]
+    assert writes == [1]
+    assert changes == [("auto_hide_seconds", 10), ("always_on_top", False)]
+    with open(settings.file_path, encoding="utf-8") as f:
+        assert json.load(f)["auto_hide_seconds"] == 10
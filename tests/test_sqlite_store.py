@@ -0,0 +1,34 @@
+# tests/test_sqlite_store.py
+# -*- coding: utf-8 -*-
+import json
+from src.model.sqlite_store import SqliteDataStore
+
+
+def _item(memo_id, content):
+    return {"id": memo_id, "title": content, "content": content, "tags": [],
+            "created_at": "2026-01-01T00:00:00", "time_str": "00:00"}
+
+
+def test_migration_tolerates_duplicate_ids(tmp_path):
+    json_path = tmp_path / "memos.json"
+    json_path.write_text(json.dumps([_item(1, "first"), _item(2, "other"), _item(1, "second copy")]),
+                         encoding="utf-8")
+    store = SqliteDataStore(str(tmp_path / "memos.db"), str(json_path))
+    assert sorted(m.id for m in store.get_memos()) == [1, 2]
+    assert store.get_memo_by_id(1).content == "second copy"
+    assert [m.id for m in store.search("second")] == [1]
+    store.close()
+
+
+def test_fts_queries_do_not_build_the_ngram_index(tmp_path):
+    json_path = tmp_path / "memos.json"
+    json_path.write_text(json.dumps([_item(i, f"design review {i}") for i in range(50)] + [_item(99, "other")]),
+                         encoding="utf-8")
+    store = SqliteDataStore(str(tmp_path / "memos.db"), str(json_path))
+    assert len(store.search("design")) == 50
+    assert sum(len(hits) for hits in store.iter_search("review 42")) == 1
+    assert store._search_index is None
+    # 短查询 FTS 无法回答，仍然使用 n-gram 索引
+    assert [m.id for m in store.search("ot")] == [99]
+    assert store._search_index is not None
+    store.close()
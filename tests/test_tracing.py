@@ -0,0 +1,59 @@
+# tests/test_tracing.py
+# -*- coding: utf-8 -*-
+import json
+import time
+from collections import deque
+import pytest
+from src.core import tracing
+
+
+@pytest.fixture
+def small_ring(monkeypatch):
+    monkeypatch.setattr(tracing, "_events", deque(maxlen=10))
+    was_enabled = tracing.enabled()
+    tracing.set_enabled(True)
+    yield
+    tracing.set_enabled(was_enabled)
+
+
+def test_ring_buffer_keeps_newest_events_in_chrome_format(small_ring, tmp_path):
+    for i in range(25):
+        with tracing.span(f"s{i}", "test", index=i):
+            pass
+    path = tmp_path / "trace.json"
+    assert tracing.export_chrome_trace(str(path)) == 10
+
+    with open(path, encoding="utf-8") as f:
+        trace = json.load(f)
+    assert trace["displayTimeUnit"] == "ms"
+    events = [e for e in trace["traceEvents"] if e["ph"] != "M"]
+    assert [e["name"] for e in events] == [f"s{i}" for i in range(15, 25)]
+    assert [e["args"]["index"] for e in events] == list(range(15, 25))
+    assert all(e["ph"] == "X" and e["cat"] == "test" and e["dur"] >= 0 for e in events)
+    assert [e["ts"] for e in events] == sorted(e["ts"] for e in events)
+    names = {e["args"]["name"] for e in trace["traceEvents"] if e["name"] == "thread_name"}
+    assert "MainThread" in names
+
+
+def test_durations_are_in_microseconds(small_ring, tmp_path):
+    with tracing.span("sleep"):
+        time.sleep(0.02)
+    token = tracing.begin("anim")
+    tracing.end(token, done=True)
+    path = tmp_path / "trace.json"
+    tracing.export_chrome_trace(str(path))
+    with open(path, encoding="utf-8") as f:
+        events = [e for e in json.load(f)["traceEvents"] if e["ph"] != "M"]
+    sleep, begin, end = events
+    assert 20000 <= sleep["dur"] < 2000000
+    assert (begin["ph"], end["ph"]) == ("b", "e")
+    assert begin["id"] == end["id"] and end["args"] == {"done": True}
+    assert end["ts"] >= begin["ts"] >= sleep["ts"] + sleep["dur"]
+
+
+def test_disabled_tracing_records_nothing(small_ring):
+    tracing.set_enabled(False)
+    with tracing.span("off"):
+        pass
+    assert tracing.begin("off") is None
+    assert len(tracing._events) == 0
@@ -0,0 +1,46 @@
+# tests/test_watchdog.py
+# -*- coding: utf-8 -*-
+import sys
+import time
+from src.core.watchdog import StallWatchdog
+
+
+def _pump(qapp, seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+def test_stall_holding_the_gil_is_logged(qapp, tmp_path):
+    watchdog = StallWatchdog(200, str(tmp_path / "stall.log"))
+    watchdog.start()
+    try:
+        _pump(qapp, 0.3)
+        # 纯 Python 循环在切换间隔内不会让出 GIL，效果与一次长时间的 C 调用相同：检测线程也无法运行
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(5.0)
+        try:
+            deadline = time.monotonic() + 0.8
+            while time.monotonic() < deadline:
+                pass
+        finally:
+            sys.setswitchinterval(interval)
+        _pump(qapp, 0.4)
+    finally:
+        watchdog.stop()
+    assert watchdog.stall_count == 1
+
+
+def test_each_watchdog_logs_to_its_own_file(qapp, tmp_path):
+    first = StallWatchdog(200, str(tmp_path / "first.log"))
+    second = StallWatchdog(200, str(tmp_path / "second.log"))
+    first._log_stall(300)
+    second._log_stall(400)
+    second._log_stall(500)
+    first._close_logger()
+    second._close_logger()
+    first_log = (tmp_path / "first.log").read_text(encoding="utf-8")
+    second_log = (tmp_path / "second.log").read_text(encoding="utf-8")
+    assert "300 ms" in first_log and "400 ms" not in first_log
+    assert "400 ms" in second_log and "500 ms" in second_log and "300 ms" not in second_log
@@ -0,0 +1,68 @@
+# tests/test_widget_pool.py
+# -*- coding: utf-8 -*-
+import pytest
+from src.view.widgets.widget_pool import WidgetPool
+
+
+@pytest.fixture
+def container(qapp):
+    from PyQt6.QtWidgets import QHBoxLayout, QWidget
+    widget = QWidget()
+    QHBoxLayout(widget)
+    widget.show()
+    yield widget
+    widget.deleteLater()
+
+
+def make_pool(container, created, **kwargs):
+    from PyQt6.QtWidgets import QPushButton
+
+    def factory():
+        btn = QPushButton()
+        btn.setCheckable(True)
+        created.append(btn)
+        return btn
+    return WidgetPool(factory, lambda btn, i: container.layout().addWidget(btn), **kwargs)
+
+
+def test_acquire_reuses_released_widgets(container):
+    created = []
+    pool = make_pool(container, created)
+    first = pool.acquire(3)
+    assert len(created) == 3 and len(pool) == 3
+    assert pool.acquire(1) == first[:1]
+    assert [w.isVisibleTo(container) for w in first] == [True, False, False]
+    assert pool.idle_count() == 2
+    again = pool.acquire(4)
+    assert again[:3] == first and len(created) == 4
+    assert all(w.isVisibleTo(container) for w in again)
+    assert [container.layout().indexOf(w) for w in again] == [0, 1, 2, 3]
+
+
+def test_released_widgets_are_reset(container):
+    pool = make_pool(container, [], reset=lambda btn: btn.setChecked(False))
+    widgets = pool.acquire(3)
+    for btn in widgets:
+        btn.setChecked(True)
+    pool.acquire(1)
+    assert [btn.isChecked() for btn in widgets] == [True, False, False]
+
+
+def test_idle_widgets_are_capped(container):
+    created = []
+    pool = make_pool(container, created, max_idle=2)
+    widgets = pool.acquire(6)
+    assert pool.acquire(1) == widgets[:1]
+    assert pool.idle_count() == 2
+    assert container.layout().count() == 6
+    qapp_events()
+    assert container.layout().count() == 3
+    # 被删掉的不再复用，重新需要时新建，位置接在保留的控件之后
+    more = pool.acquire(4)
+    assert more[:3] == widgets[:3] and len(created) == 7
+    assert [container.layout().indexOf(w) for w in more] == [0, 1, 2, 3]
+
+
+def qapp_events():
+    from PyQt6.QtCore import QCoreApplication, QEvent
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)